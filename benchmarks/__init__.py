@@ -0,0 +1,7 @@
+"""Envanter uygulamasının sorgu yollarını büyüyen veri setlerinde ölçen başsız (headless) benchmark paketi.
+
+Kullanım (projenin ana dizininden):
+    python -m benchmarks.run --sizes 1000 10000 100000 --out bench.json
+    python -m benchmarks.startup --out startup.json
+    python -m benchmarks.compare eski.json yeni.json
+"""
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from src.models.backup import BACKUP_PAGES, backup_database, list_backups, verify_snapshot, restore_backup
+from src.models.database import JOURNAL_MODE, connect
+from .generate import generate_database
+from .run import _git_revision
+
+DEFAULT_ROWS = 1000000
+WRITE_INTERVAL = 0.01 # Eşzamanlı yazarın iki güncelleme arası beklemesi (saniye)
+
+class Writer(threading.Thread):
+    """Yedekleme sırasında başka bir istemciyi taklit eder: sürekli küçük güncellemeler yapıp her birinin süresini ölçer."""
+    def __init__(self, db_path):
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.stop = threading.Event()
+        self.latencies = []
+
+    def run(self):
+        conn = connect(self.db_path)
+        while not self.stop.is_set():
+            started = time.perf_counter()
+            conn.execute("UPDATE inventory_items SET notes = notes WHERE id = 1")
+            conn.commit()
+            self.latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(WRITE_INTERVAL)
+        conn.close()
+
+def _percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Çevrimiçi yedekleme ve geri yükleme sürelerini, eşzamanlı yazarın bekleme süresiyle ölçer.")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--pages', type=int, default=BACKUP_PAGES, help="Yedekleme adımı başına sayfa")
+    parser.add_argument('--data-dir', help="Veritabanı ve yedeklerin dizini (varsa veritabanı yeniden kullanılır)")
+    parser.add_argument('--out', default='backup_output.json')
+    args = parser.parse_args(argv)
+
+    work_dir = args.data_dir or tempfile.mkdtemp(prefix='envanter_backup_')
+    os.makedirs(work_dir, exist_ok=True)
+    db_path = os.path.join(work_dir, f'backup_{args.rows}.db')
+    backup_dir = os.path.join(work_dir, 'backups')
+    if not os.path.exists(db_path):
+        started = time.perf_counter()
+        generate_database(db_path, args.rows).close()
+        print(f"[{args.rows} satır] veri üretildi ({time.perf_counter() - started:.0f} sn)")
+
+    # Boşta yazar gecikmesi: yedeklemenin etkisini ayırt etmek için
+    idle = Writer(db_path); idle.start(); time.sleep(1); idle.stop.set(); idle.join()
+
+    writer = Writer(db_path); writer.start()
+    result = backup_database(db_path, backup_dir, pages=args.pages)
+    writer.stop.set(); writer.join()
+    print(result.summary())
+
+    snapshot = list_backups(db_path, backup_dir)[0][0]
+    started = time.perf_counter()
+    problems = verify_snapshot(snapshot)
+    verify_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    restore_backup(snapshot, db_path)
+    restore_ms = (time.perf_counter() - started) * 1000
+
+    measurements = {
+        'backup.copy': result.copy_ms, 'backup.max_step': result.max_step_ms, 'backup.compress': result.compress_ms,
+        'writer.idle.median': statistics.median(idle.latencies), 'writer.idle.max': max(idle.latencies),
+        'writer.during_backup.median': statistics.median(writer.latencies), 'writer.during_backup.p99': _percentile(writer.latencies, 0.99),
+        'writer.during_backup.max': max(writer.latencies), 'verify': verify_ms, 'restore': restore_ms,
+    }
+    results = [{'rows': args.rows, 'benchmark': name, 'median_ms': ms, 'repeat': 1} for name, ms in measurements.items()]
+    for r in results: print(f"{r['benchmark']:<30} {r['median_ms']:10.1f} ms")
+    print(f"Kopya {result.steps} adım, {result.restarts} yeniden başlama; {len(writer.latencies)} eşzamanlı yazma; "
+          f"anlık görüntü {result.size / 1024 / 1024:.1f} MB; doğrulama: {'ok' if not problems else problems[:3]}")
+    report = {'meta': {'git_revision': _git_revision(), 'journal_mode': JOURNAL_MODE, 'pages_per_step': args.pages,
+                       'steps': result.steps, 'restarts': result.restarts, 'snapshot_bytes': result.size,
+                       'database_bytes': os.path.getsize(db_path)},
+              'results': results}
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == '__main__':
+    main()
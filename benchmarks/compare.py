@@ -0,0 +1,31 @@
+import argparse
+import json
+import sys
+
+def load(path):
+    """Benchmark JSON dosyasını {(satır, ad): medyan_ms} sözlüğüne çevirir."""
+    with open(path, encoding='utf-8') as f:
+        return {(r['rows'], r['benchmark']): r['median_ms'] for r in json.load(f)['results']}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İki benchmark sonucunu karşılaştırır; gerilemelerde 1 ile çıkar.")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.25, help="Gerileme sayılacak oran (varsayılan 1.25)")
+    parser.add_argument('--min-ms', type=float, default=1.0, help="Bu süreden kısa ölçümler gürültü sayılır")
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    regressions = 0
+    for key in sorted(set(baseline) & set(current)):
+        old, new = baseline[key], current[key]
+        ratio = new / old if old else float('inf')
+        flag = ''
+        if ratio > args.threshold and new >= args.min_ms:
+            flag = '  <-- GERİLEME'; regressions += 1
+        print(f"{key[0]:>9} {key[1]:<40} {old:10.2f} ms -> {new:10.2f} ms  x{ratio:5.2f}{flag}")
+    print(f"{regressions} gerileme bulundu.")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
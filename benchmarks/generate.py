@@ -0,0 +1,58 @@
+import datetime
+import random
+
+from src.models.database import init_db, insert_inventory_items
+from src.models.vocabulary import CATEGORIES, STATUSES, LOCATIONS, BRANDS_BY_CATEGORY
+
+GENERATE_BATCH_SIZE = 10000
+# Gerçekçi dağılım için ağırlıklar (listede olmayan değerlerin ağırlığı 1)
+CATEGORY_WEIGHTS = {"Bilgisayar": 45, "Monitör": 30, "Yazıcı": 8, "Switch": 5, "Güvenlik": 2, "Sunucu": 4, "UPS": 6}
+STATUS_WEIGHTS = {"Aktif Kullanımda": 70, "Depoda": 12, "Serviste": 5, "Arızalı": 5, "Hurda": 8}
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Zeynep", "Emre", "Elif", "Can", "Şule", "Burak", "Ece",
+               "Hakan", "Merve", "Oğuz", "Gizem", "Kerem", "Selin", "Tolga", "İrem"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Aydın", "Öztürk", "Arslan", "Doğan", "Koç", "Kurt"]
+MODEL_PREFIXES = {"Bilgisayar": ["Latitude", "EliteBook", "ThinkPad", "ProBook", "VivoBook"], "Monitör": ["P24", "U27", "E22", "S24"],
+                  "Yazıcı": ["LaserJet", "ImageRunner", "EcoTank", "MFC"], "Switch": ["Catalyst", "SG350", "EX2300"],
+                  "Güvenlik": ["FortiGate", "PA-220", "ASA"], "Sunucu": ["PowerEdge", "ProLiant", "System x"], "UPS": ["Smart-UPS", "5PX", "VFI"]}
+
+def _choice(rng, values, weights):
+    """Sözlükteki değerler arasından ağırlıklı rastgele seçim yapar."""
+    return rng.choices(values, weights=[weights.get(v, 1) for v in values])[0]
+
+def generate_items(count, seed=42, start=0):
+    """Formdaki kategori, marka, durum ve konum sözlüklerini kullanarak gerçekçi öğe sözlükleri üretir."""
+    rng = random.Random(seed + start)
+    today = datetime.date.today()
+    for n in range(start, start + count):
+        category = _choice(rng, CATEGORIES, CATEGORY_WEIGHTS)
+        brand = rng.choice(BRANDS_BY_CATEGORY[category])
+        model = f"{rng.choice(MODEL_PREFIXES.get(category, [category]))} {rng.randint(100, 9999)}"
+        status = _choice(rng, STATUSES, STATUS_WEIGHTS)
+        assigned = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" if status == "Aktif Kullanımda" else ''
+        yield {
+            'name': f"{brand} {model}",
+            'category': category,
+            'model': model,
+            'brand': brand,
+            'serial_number': f"{rng.choice('5CDHJKMNPRS')}{rng.choice('CDFGLX')}{n:08d}",
+            'purchase_date': (today - datetime.timedelta(days=rng.randint(0, 365 * 9))).strftime('%Y-%m-%d'),
+            'status': status,
+            'location': rng.choice(LOCATIONS),
+            'notes': rng.choice(['', '', '', 'Garanti uzatıldı', 'Batarya değişti', 'Ekranda çizik']),
+            'assigned_to': assigned,
+        }
+
+def generate_database(db_path, rows, seed=42):
+    """Verilen yolda şeması kurulmuş bir veritabanı oluşturup 'rows' adet sentetik öğe ekler; bağlantıyı döndürür."""
+    conn = init_db(db_path)
+    for start in range(0, rows, GENERATE_BATCH_SIZE):
+        insert_inventory_items(conn, generate_items(min(GENERATE_BATCH_SIZE, rows - start), seed, start))
+        conn.commit()
+    return conn
+
+if __name__ == '__main__':
+    # python -m benchmarks.generate <veritabanı> <satır_sayısı>
+    import sys
+    if len(sys.argv) != 3:
+        sys.exit("Kullanım: python -m benchmarks.generate <veritabanı.db> <satır_sayısı>")
+    generate_database(sys.argv[1], int(sys.argv[2])).close()
@@ -0,0 +1,154 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+
+from src.models.database import SORTABLE_COLUMNS, connect, get_status_counts, verify_statistics, delete_inventory_items, count_inventory
+from src.models.cache import inventory_cache, get_cached_page as get_inventory_page, get_cached_item
+from src.models.exporter import export_inventory
+from .generate import generate_database
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+EXPORT_HEADERS = ['Zimmet Sahibi', 'Ad', 'Kategori', 'Model', 'Marka', 'Seri No', 'Alım Tarihi', 'Durum', 'Konum']
+SEARCH_TERMS = ['dell', 'latitude 12', '5c', 'yılmaz', 'garanti']
+
+def measure(func, repeat=5):
+    """func'ı repeat kez çalıştırır; milisaniye cinsinden min/medyan/maks ve son sonucu döndürür."""
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {'min_ms': min(samples), 'median_ms': statistics.median(samples), 'max_ms': max(samples), 'repeat': repeat}, result
+
+def _walk_pages(conn, pages, **kwargs):
+    """Kaydırmayı taklit eder: ardışık 'pages' sayfayı keyset ile çeker, toplam satır sayısını döndürür."""
+    key, total = None, 0
+    for _ in range(pages):
+        rows, key = get_inventory_page(conn, after=key, **kwargs)
+        total += len(rows)
+        if key is None: break
+    return total
+
+def run_queries(conn, rows, work_dir, xlsx=False):
+    """MainWindow'un sorgu yollarını ölçer; (benchmark adı, ölçüm) çiftlerini üretir."""
+    rng = random.Random(rows)
+    max_id = conn.execute('SELECT MAX(id) FROM inventory_items').fetchone()[0] or 1
+
+    # refresh_table: ilk sayfa + istatistikler
+    yield 'refresh_table', measure(lambda: (get_inventory_page(conn), get_status_counts(conn)))[0]
+    yield 'scroll_10_pages', measure(lambda: _walk_pages(conn, 10))[0]
+    # sort_table: her sütun için iki yönde ilk sayfa
+    for col in SORTABLE_COLUMNS:
+        for descending in (False, True):
+            name = f"sort_table.{col}.{'desc' if descending else 'asc'}"
+            yield name, measure(lambda: get_inventory_page(conn, col, descending))[0]
+    yield 'update_statistics', measure(lambda: get_status_counts(conn), repeat=20)[0]
+    yield 'verify_statistics', measure(lambda: verify_statistics(conn), repeat=1)[0]
+    ids = [rng.randint(1, max_id) for _ in range(200)]
+    yield 'on_item_select', measure(lambda: get_cached_item(conn, ids.pop()), repeat=200)[0]
+    for term in SEARCH_TERMS:
+        yield f'search.{term}', measure(lambda: get_inventory_page(conn, search=term))[0]
+        yield f'search_count.{term}', measure(lambda: count_inventory(conn, term), repeat=1)[0]
+
+    # export_data: görünümün tamamı (akışlı)
+    formats = ['csv', 'xlsx'] if xlsx else ['csv']
+    for fmt in formats:
+        path = os.path.join(work_dir, f'export_{rows}.{fmt}')
+        stats, written = measure(lambda: export_inventory(db_path(conn), path, EXPORT_HEADERS), repeat=1)
+        stats['rows_per_second'] = written / (stats['median_ms'] / 1000) if stats['median_ms'] else None
+        yield f'export_data.{fmt}', stats
+        os.remove(path)
+
+    # Toplu silme en sonda: veri setini değiştirir
+    delete_ids = rng.sample(range(1, max_id + 1), min(1000, max_id))
+    yield 'bulk_delete_1000', measure(lambda: delete_inventory_items(conn, delete_ids), repeat=1)[0]
+
+def run_treeview(conn, pages=10):
+    """Treeview'e sayfa ekleme süresini ölçer; ekran (veya Xvfb) yoksa atlanır."""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception as e: # tkinter yok veya DISPLAY tanımsız
+        return {'skipped': f"Treeview ölçümleri atlandı: {e}"}
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=EXPORT_HEADERS, show='headings')
+    page_rows = []
+    key = None
+    for _ in range(pages):
+        rows, key = get_inventory_page(conn, after=key)
+        page_rows.append(rows)
+        if key is None: break
+
+    def insert_pages():
+        tree.delete(*tree.get_children())
+        for rows in page_rows:
+            for row in rows: tree.insert('', 'end', iid=row[0], values=row[1:])
+        root.update_idletasks()
+    results = {'treeview_insert_pages': measure(insert_pages)[0]}
+    root.destroy()
+    return results
+
+def db_path(conn):
+    """Bağlantının dosya yolunu döndürür (dışa aktarım kendi bağlantısını açar)."""
+    return conn.execute('PRAGMA database_list').fetchone()[2]
+
+def _git_revision():
+    try: return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception: return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Envanter sorgu yollarını sentetik veri setlerinde ölçer.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Veri seti boyutları (satır)")
+    parser.add_argument('--out', default='bench_output.json', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--data-dir', help="Üretilen veritabanlarının saklanacağı dizin (varsayılan: geçici dizin)")
+    parser.add_argument('--xlsx', action='store_true', help="XLSX dışa aktarımını da ölç (büyük setlerde yavaş)")
+    parser.add_argument('--no-treeview', action='store_true', help="Treeview ölçümlerini atla")
+    args = parser.parse_args(argv)
+
+    work_dir = args.data_dir or tempfile.mkdtemp(prefix='envanter_bench_')
+    os.makedirs(work_dir, exist_ok=True)
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'results': [],
+    }
+    for rows in args.sizes:
+        path = os.path.join(work_dir, f'bench_{rows}.db')
+        for suffix in ('', '-wal', '-shm'): # Toplu silme veriyi değiştirdiği için her çalıştırmada yeniden üret
+            if os.path.exists(path + suffix): os.remove(path + suffix)
+        started = time.perf_counter()
+        generate_database(path, rows).close()
+        report['results'].append({'rows': rows, 'benchmark': 'generate', 'median_ms': (time.perf_counter() - started) * 1000, 'repeat': 1})
+        print(f"[{rows} satır] veri üretildi")
+
+        conn = connect(path)
+        inventory_cache.clear() # Önbellek veritabanı dosyasına değil sürüm sayacına bağlı
+        if not args.no_treeview:
+            for name, stats in run_treeview(conn).items():
+                if name == 'skipped': print(stats); continue
+                report['results'].append({'rows': rows, 'benchmark': name, **stats})
+        for name, stats in run_queries(conn, rows, work_dir, args.xlsx):
+            report['results'].append({'rows': rows, 'benchmark': name, **stats})
+            print(f"[{rows} satır] {name}: {stats['median_ms']:.2f} ms")
+        conn.close()
+
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar '{args.out}' dosyasına yazıldı.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.startup import LAUNCHED_AT_ENV
+from .run import _git_revision
+
+# Her ölçüm temiz bir yorumlayıcıda çalışır (soğuk başlangıç); src/main.py ile aynı aşama sırası izlenir.
+_PROBE = r'''
+import json, sys
+from src import startup
+from src.views.login import LoginWindow
+from src.models.database import init_db, get_user
+startup.mark('imports')
+conn = init_db(sys.argv[1])
+startup.mark('db_open')
+try:
+    root = LoginWindow(conn)
+except Exception as e: # Ekran yok: yalnızca içe aktarım ve veritabanı aşamaları ölçülür
+    print(json.dumps({**startup.report(), 'skipped': str(e)})); sys.exit()
+root.update()
+startup.mark('login_first_paint')
+from src.views.main_window import MainWindow
+root.withdraw()
+main = MainWindow(root, conn, get_user(conn, 'admin', 'admin'))
+main.update()
+startup.mark('main_first_paint')
+print(json.dumps(startup.report()))
+root.destroy() # Alt pencereler (ve veritabanı iş parçacığı) da kapanır
+'''
+
+def probe(db_path):
+    """Başlangıcı ayrı bir süreçte bir kez ölçer ve startup.report() çıktısını döndürür.
+
+    Başlatma anı ortam değişkeniyle aktarılır; yorumlayıcı aşaması diğerleriyle aynı duvar saatinden ölçülür.
+    """
+    env = {**os.environ, LAUNCHED_AT_ENV: repr(time.time())}
+    out = subprocess.run([sys.executable, '-c', _PROBE, db_path], capture_output=True, text=True, check=True, env=env,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soğuk başlangıç aşamalarını ölçer.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', default='startup_output.json')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='envanter_startup_') as work_dir:
+        runs = [probe(os.path.join(work_dir, f'startup_{i}.db')) for i in range(args.repeat)]
+    results = []
+    for phase in runs[0]['phases_ms']:
+        samples = [r['phases_ms'][phase] for r in runs]
+        results.append({'rows': 0, 'benchmark': f'startup.{phase}', 'min_ms': min(samples),
+                        'median_ms': statistics.median(samples), 'max_ms': max(samples), 'repeat': len(samples)})
+        print(f"{phase:<20} {results[-1]['median_ms']:8.1f} ms")
+    if 'skipped' in runs[0]: print(f"Pencere aşamaları atlandı: {runs[0]['skipped']}")
+    print(f"En yüksek RSS: {runs[-1]['max_rss_kb']} KB, yüklü ağır modüller: {runs[-1]['heavy_modules'] or 'yok'}")
+    report = {'meta': {'git_revision': _git_revision(), 'max_rss_kb': runs[-1]['max_rss_kb'],
+                       'heavy_modules': runs[-1]['heavy_modules']}, 'results': results}
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Envanter veritabanı için komut satırı aracı (arayüzsüz; gece işleri ve betikler için).
+
+Kullanım:
+    python -m src.cli [--db inventory.db] [--user admin] <komut> [seçenekler]
+
+Komutlar:
+    list   [--sort name] [--desc] [--limit N] [--format csv|jsonl] [--archive] [--status ... --category ...]
+    search <metin> [list seçenekleri]                 Tam metin arama (önek eşleşmeli)
+    stats  [--archive] [--format csv|jsonl]           Durum/kategori/konum/marka/zimmet sayıları
+    export <dosya.csv|dosya.xlsx> [--search metin] [list seçenekleri]  Uygulamadaki Dışa Aktar ile aynı dosya
+    import <dosya.csv|dosya.xlsx> [--policy skip|update|report] [--errors hatalar.csv]
+
+Kimlik doğrulaması `users` tablosuna karşı yapılır: kullanıcı --user veya ENVANTER_USER, parola
+ENVANTER_PASSWORD ortam değişkeninden okunur, yoksa sorulur. list/search/stats satırları okundukça
+stdout'a yazar (CSV başlıklı, JSON-lines satır başına bir nesne); tüm tablo belleğe alınmaz.
+Yalnızca veri katmanı içe aktarılır (tkinter, ttkbootstrap ve pandas yüklenmez), openpyxl yalnızca
+XLSX dosyalarında yüklenir.
+"""
+import argparse
+import csv
+import getpass
+import json
+import os
+import sqlite3
+import sys
+
+from .models.database import (DB_PATH, TABLE_COLUMNS, SORTABLE_COLUMNS, STAT_DIMENSIONS, FACET_COLUMNS, init_db, get_user,
+                              get_statistics, get_inventory_page)
+from .models.exporter import export_inventory
+from .models.importer import CONFLICT_POLICIES, import_inventory
+
+CHUNK_SIZE = 2000 # Tek sorguda okunup yazılan satır sayısı
+USER_ENV = 'ENVANTER_USER'
+PASSWORD_ENV = 'ENVANTER_PASSWORD'
+# Dışa aktarım başlıkları: ana tablonun sütun başlıklarıyla aynı (içe aktarım bunları tanır)
+EXPORT_HEADERS = ['Zimmet Sahibi', 'Ad', 'Kategori', 'Model', 'Marka', 'Seri No', 'Alım Tarihi', 'Durum', 'Konum']
+
+class CommandError(Exception):
+    """Kullanıcıya mesajı yazılıp sıfırdan farklı kodla çıkılacak hata."""
+
+def _authenticate(conn, username):
+    """Kullanıcıyı doğrular, kullanıcı adını (değişiklik günlüğündeki yazar) döndürür."""
+    username = username or os.environ.get(USER_ENV)
+    if not username:
+        raise CommandError(f"Kullanıcı adı gerekli (--user veya {USER_ENV})")
+    password = os.environ.get(PASSWORD_ENV)
+    if password is None:
+        password = getpass.getpass(f"{username} parolası: ")
+    user = get_user(conn, username, password)
+    if user is None:
+        raise CommandError("Kullanıcı adı veya parola hatalı")
+    return user[1]
+
+def _filters(args):
+    """--status, --category ... seçeneklerinden {sütun: değer} filtreleri ('' boş değerleri seçer)."""
+    return {col: getattr(args, col) for col in FACET_COLUMNS if getattr(args, col) is not None}
+
+def _iter_rows(conn, args, search=None):
+    """Görünümün satırlarını parça parça üretir; --limit verilmişse o kadar satırda durur."""
+    key, remaining = None, args.limit
+    while remaining is None or remaining > 0:
+        size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+        rows, key = get_inventory_page(conn, args.sort, args.desc, key, size, search, _filters(args), args.archive)
+        if rows:
+            yield rows
+        if remaining is not None: remaining -= len(rows)
+        if key is None:
+            break
+
+def _write(records, columns, output_format, out):
+    """Satır parçalarını CSV (başlıklı) veya JSON-lines olarak yazar, her parçadan sonra boşaltır."""
+    writer = csv.writer(out, lineterminator='\n') if output_format == 'csv' else None
+    if writer: writer.writerow(columns)
+    for rows in records:
+        if writer: writer.writerows(rows)
+        else: out.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows)
+        out.flush()
+
+def _list(conn, args, author):
+    _write(_iter_rows(conn, args), TABLE_COLUMNS, args.format, sys.stdout)
+
+def _search(conn, args, author):
+    _write(_iter_rows(conn, args, ' '.join(args.text)), TABLE_COLUMNS, args.format, sys.stdout)
+
+def _stats(conn, args, author):
+    rows = [(dim, value, count) for dim in STAT_DIMENSIONS
+            for value, count in sorted(get_statistics(conn, dim, args.archive).items(), key=lambda vc: (-vc[1], vc[0]))]
+    _write([rows], ['dimension', 'value', 'count'], args.format, sys.stdout)
+
+def _export(conn, args, author):
+    written = export_inventory(args.db, args.file, EXPORT_HEADERS, args.sort, args.desc, args.search, filters=_filters(args), archive=args.archive)
+    print(f"{written} satır '{args.file}' dosyasına yazıldı", file=sys.stderr)
+
+def _import(conn, args, author):
+    progress = lambda done: print(f"{done} satır okundu", file=sys.stderr)
+    result = import_inventory(conn, args.file, args.policy, progress=progress, author=author)
+    print(result.summary(), file=sys.stderr)
+    if result.errors and args.errors:
+        result.write_error_report(args.errors)
+    if result.errors:
+        raise CommandError(f"{len(result.errors)} satır içe aktarılamadı")
+
+def _view_options(parser):
+    """list/search/export'un ortak sıralama, filtre ve çıktı seçenekleri."""
+    parser.add_argument('--sort', default='name', choices=SORTABLE_COLUMNS)
+    parser.add_argument('--desc', action='store_true', help="Azalan sıra")
+    parser.add_argument('--archive', action='store_true', help="Arşivdeki öğeleri de dahil et")
+    for col in FACET_COLUMNS:
+        parser.add_argument(f"--{col.replace('_', '-')}", dest=col, metavar='DEĞER', help=f"{col} alanına göre süz ('' boş olanlar)")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description="Envanter veritabanı için arayüzsüz komut satırı aracı.")
+    parser.add_argument('--db', default=DB_PATH, help="Veritabanı dosyası")
+    parser.add_argument('--user', help=f"Kullanıcı adı (varsayılan: {USER_ENV}); parola {PASSWORD_ENV} veya istemden")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, func, text in (('list', _list, "Envanteri listeler"), ('search', _search, "Tam metin arama")):
+        sub = commands.add_parser(name, help=text)
+        if name == 'search': sub.add_argument('text', nargs='+')
+        _view_options(sub)
+        sub.add_argument('--limit', type=int, help="En fazla satır")
+        sub.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+        sub.set_defaults(func=func)
+    sub = commands.add_parser('stats', help="Özet sayılar")
+    sub.add_argument('--archive', action='store_true', help="Arşivdeki öğeleri de say")
+    sub.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+    sub.set_defaults(func=_stats)
+    sub = commands.add_parser('export', help="CSV/XLSX dosyasına aktarır")
+    sub.add_argument('file')
+    sub.add_argument('--search', help="Yalnızca aramayla eşleşenler")
+    _view_options(sub)
+    sub.set_defaults(func=_export)
+    sub = commands.add_parser('import', help="CSV/XLSX dosyasından içe aktarır")
+    sub.add_argument('file')
+    sub.add_argument('--policy', choices=list(CONFLICT_POLICIES), default='skip', help="Mevcut seri numaralarında yapılacak işlem")
+    sub.add_argument('--errors', help="Hatalı satırların yazılacağı CSV raporu")
+    sub.set_defaults(func=_import)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        conn = init_db(args.db) # Şema geçişleri uygulanır
+    except sqlite3.Error as e:
+        print(f"Hata: {args.db}: {e}", file=sys.stderr)
+        return 1
+    try:
+        author = _authenticate(conn, args.user)
+        args.func(conn, args, author)
+    except BrokenPipeError: # Çıktı erken kapandı (ör. | head): kalan satırlar yazılmaz (OSError'dan önce yakalanır)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno()) # Çıkışta yeniden hata vermesin
+    except (CommandError, OSError, ValueError, sqlite3.Error) as e: # Eksik dosya, hatalı başlık, yazılamayan yol...
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,55 +1,13 @@
-import tkinter as tk
-import sqlite3
+from . import startup # Başlangıç süre ölçümü; diğer içe aktarımlardan önce gelmeli
 from .views.login import LoginWindow
-
-def setup_database():
-    """Veritabanı bağlantısını oluşturur ve gerekli tabloları (inventory_items, users) kurar."""
-    conn = sqlite3.connect('inventory.db')
-    cursor = conn.cursor()
-    
-    # Envanter tablosunu oluştur
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS inventory_items (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        category TEXT NOT NULL,
-        model TEXT,
-        brand TEXT,
-        serial_number TEXT UNIQUE,
-        purchase_date TEXT,
-        status TEXT,
-        location TEXT,
-        notes TEXT,
-        assigned_to TEXT,
-        last_updated_by TEXT
-    )
-    ''')
-    
-    # Kullanıcılar (users) tablosunu oluştur
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT NOT NULL UNIQUE,
-        password TEXT NOT NULL,
-        role TEXT NOT NULL DEFAULT 'user' 
-    )
-    ''')
-    
-    # Başlangıçta bir admin kullanıcısı ekle (varsa hata vermez)
-    try:
-        cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)", 
-                       ('admin', 'admin', 'admin'))
-    except sqlite3.IntegrityError:
-        # Kullanıcı zaten varsa devam et
-        pass
-
-    conn.commit() # Değişiklikleri veritabanına kaydet
-    return conn # Veritabanı bağlantı nesnesini döndür
+from .models.database import init_db
+startup.mark('imports')
 
 def main():
     """Uygulamanın ana giriş noktası."""
-    # Veritabanı bağlantısını başlat
-    db_conn = setup_database()
+    # Veritabanı bağlantısını başlat (şema geçişleri burada uygulanır)
+    db_conn = init_db()
+    startup.mark('db_open')
     
     # Giriş penceresini oluştur ve başlat
     root = LoginWindow(db_conn)
@@ -0,0 +1,219 @@
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from . import diagnostics
+from .database import connect, get_change_version, get_data_version, migrate
+
+BACKUP_DIR = os.environ.get('ENVANTER_BACKUP_DIR') # Boşsa veritabanının yanındaki 'backups' dizini
+BACKUP_INTERVAL_HOURS = float(os.environ.get('ENVANTER_BACKUP_HOURS', '24')) # 0: zamanlanmış yedek kapalı
+BACKUP_KEEP = 14 # Saklanacak en fazla anlık görüntü (eskiler silinir)
+BACKUP_PAGES = 1024 # Yedekleme adımı başına kopyalanan sayfa (4 KB sayfa ile 4 MB)
+BACKUP_SLEEP = 0.005 # Adımlar arasında beklenen süre (saniye); yazanlar bu aralıkta kilidi alır
+MAX_RESTARTS = 3 # DELETE kipinde kopya bu kadar kez baştan alınırsa tek adımda tamamlanır
+GZIP_LEVEL = 1 # Hızlı sıkıştırma: veritabanı sayfaları en düşük seviyede de ~4 kat küçülür
+SNAPSHOT_SUFFIX = '.db.gz'
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S_%f' # Mikrosaniye: aynı saniyedeki zamanlanmış ve elle alınan yedekler çakışmaz
+LEGACY_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S' # Eski sürümlerin saniye çözünürlüklü adları (listede okunur)
+
+class BackupResult:
+    """Bir yedeklemenin dosyası ve ölçümleri."""
+    def __init__(self, path):
+        self.path = path
+        self.pages = 0
+        self.steps = 0
+        self.restarts = 0 # Kaynak başka bir bağlantıdan değiştiği için baştan alınan kopyalar
+        self.max_step_ms = 0.0 # Bir adımda kaynağın okuma kilidinin tutulduğu en uzun süre
+        self.copy_ms = 0.0
+        self.compress_ms = 0.0
+        self.size = 0 # Sıkıştırılmış dosya boyutu (bayt)
+
+    def summary(self):
+        return (f"{Path(self.path).name}: {self.pages} sayfa, {self.steps} adım, kopyalama {self.copy_ms:.0f} ms "
+                f"(en uzun adım {self.max_step_ms:.1f} ms), sıkıştırma {self.compress_ms:.0f} ms, {self.size / 1024 / 1024:.1f} MB")
+
+class _Restarting(Exception):
+    """Adımlı kopya çok kez baştan başladığında ilerleme geri çağrısından fırlatılır (kopyayı keser)."""
+
+def backup_dir_for(db_path):
+    """Veritabanının anlık görüntülerinin yazıldığı dizin."""
+    return Path(BACKUP_DIR) if BACKUP_DIR else Path(db_path).resolve().parent / 'backups'
+
+def list_backups(db_path, backup_dir=None):
+    """Anlık görüntüleri (yol, zaman, boyut) olarak yeniden eskiye döndürür."""
+    backup_dir = Path(backup_dir or backup_dir_for(db_path))
+    snapshots = []
+    for path in backup_dir.glob(f'{Path(db_path).stem}_*{SNAPSHOT_SUFFIX}'):
+        stamp = path.name[len(Path(db_path).stem) + 1:-len(SNAPSHOT_SUFFIX)]
+        for fmt in (TIMESTAMP_FORMAT, LEGACY_TIMESTAMP_FORMAT):
+            try: taken = datetime.datetime.strptime(stamp, fmt); break
+            except ValueError: pass
+        else: continue # Başka bir dosya
+        snapshots.append((path, taken, path.stat().st_size))
+    return sorted(snapshots, key=lambda s: s[1], reverse=True)
+
+def prune_backups(db_path, backup_dir=None, keep=BACKUP_KEEP):
+    """En yeni keep anlık görüntü dışındakileri siler; silinen dosya sayısını döndürür."""
+    backup_dir = Path(backup_dir or backup_dir_for(db_path))
+    old = list_backups(db_path, backup_dir)[keep:]
+    for path, _, _ in old:
+        path.unlink()
+    # Yarıda kalmış (ör. uygulama kapanırken kesilen) yedeklerin geçici dosyaları; çalışmakta olanlara dokunmamak için bir günden eskiler
+    cutoff = time.time() - 24 * 60 * 60
+    for leftover in backup_dir.glob(f'.{Path(db_path).stem}_*'):
+        if leftover.stat().st_mtime < cutoff: leftover.unlink()
+    return len(old)
+
+def backup_due(db_path, backup_dir=None, interval_hours=BACKUP_INTERVAL_HOURS):
+    """Zamanlanmış yedek gerekiyorsa True: son anlık görüntü interval_hours'tan eskiyse veya hiç yoksa."""
+    if interval_hours <= 0:
+        return False
+    snapshots = list_backups(db_path, backup_dir)
+    return not snapshots or datetime.datetime.now() - snapshots[0][1] >= datetime.timedelta(hours=interval_hours)
+
+@diagnostics.timed('db')
+def backup_database(db_path, backup_dir=None, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP, keep=BACKUP_KEEP, progress=None):
+    """Çalışan veritabanının tutarlı bir kopyasını SQLite yedekleme API'siyle alır ve gzip'li anlık görüntü yazar.
+
+    Kopya adım adım (pages sayfa) alınır. WAL kipinde kaynak bağlantı kopya boyunca tek bir okuma
+    işlemi açık tutar: okuyucular yazanları engellemediğinden diğer istemciler beklemeden yazar ve
+    kopya o anın tutarlı görüntüsü olur. DELETE kipinde kilit adımlar arasında bırakılır (yazanlar
+    en fazla bir adım bekler); araya giren her yazma kopyayı baştan başlattığından MAX_RESTARTS
+    aşılırsa kalan kopya tek adımda alınır. Önce geçici bir dosyaya kopyalanır, sıkıştırılıp tamamlandıktan
+    sonra yeniden adlandırılır; böylece yarım anlık görüntü listede görünmez. Ad mikrosaniyeli zaman
+    damgası taşır, var olan bir anlık görüntünün üzerine yazılmaz (FileExistsError). Sonra keep'ten eski
+    görüntüler silinir. progress(kopyalanan, toplam) her adımdan sonra çağrılır. BackupResult döndürür.
+    """
+    backup_dir = Path(backup_dir or backup_dir_for(db_path))
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+    target = backup_dir / f'{Path(db_path).stem}_{stamp}{SNAPSHOT_SUFFIX}'
+    if target.exists(): # Saat geri alınmış olabilir; var olan anlık görüntünün üzerine yazılmaz
+        raise FileExistsError(f"Anlık görüntü zaten var: {target}")
+    copy_path = backup_dir / f'.{target.name}.db.tmp'
+    result = BackupResult(str(target))
+
+    state = {'last': None, 'remaining': None}
+    def on_step(status, remaining, total):
+        now = time.perf_counter()
+        step_ms = (now - state['last']) * 1000 - (sleep * 1000 if result.steps else 0)
+        result.max_step_ms = max(result.max_step_ms, step_ms)
+        if state['remaining'] is not None and remaining > state['remaining']:
+            result.restarts += 1
+            if result.restarts > MAX_RESTARTS and not wal: raise _Restarting()
+        result.steps += 1; result.pages = total
+        state['last'], state['remaining'] = now, remaining
+        if progress: progress(total - remaining, total)
+
+    source = diagnostics.track(connect(db_path)) # SQL'i Tanılama kaydına girer
+    try:
+        wal = source.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal'
+        dest = sqlite3.connect(copy_path)
+        try:
+            started = state['last'] = time.perf_counter()
+            if wal: # Okuma işlemini aç: adımlar aynı anlık görüntüden okur, başka bağlantının yazması kopyayı baştan başlatmaz
+                source.execute('BEGIN')
+                source.execute('SELECT 1 FROM sqlite_master LIMIT 1').fetchall()
+            try:
+                source.backup(dest, pages=pages, progress=on_step, sleep=sleep)
+            except _Restarting:
+                state['last'] = time.perf_counter()
+                source.backup(dest, progress=on_step)
+            if wal: source.rollback()
+            result.copy_ms = (time.perf_counter() - started) * 1000
+            dest.execute('PRAGMA journal_mode = DELETE') # Anlık görüntü tek dosya olarak saklanır
+        finally:
+            dest.close()
+    finally:
+        source.close()
+
+    started = time.perf_counter()
+    partial = target.with_name(f'.{target.name}.partial')
+    try:
+        with open(copy_path, 'rb') as src, gzip.open(partial, 'wb', compresslevel=GZIP_LEVEL) as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+        os.replace(partial, target)
+    finally:
+        for leftover in (copy_path, partial):
+            if leftover.exists(): leftover.unlink()
+    result.compress_ms = (time.perf_counter() - started) * 1000
+    result.size = target.stat().st_size
+    prune_backups(db_path, backup_dir, keep)
+    return result
+
+def verify_snapshot(path):
+    """Sıkıştırılmış anlık görüntüyü açıp PRAGMA integrity_check çalıştırır; sorunların listesini döndürür (boşsa sağlam)."""
+    with _extracted(path) as db_file:
+        check = sqlite3.connect(db_file)
+        try: messages = [row[0] for row in check.execute('PRAGMA integrity_check').fetchall()]
+        except sqlite3.DatabaseError as e: messages = [str(e)]
+        finally: check.close()
+    return [] if messages == ['ok'] else messages
+
+class _extracted:
+    """Anlık görüntüyü geçici bir dosyaya açan bağlam yöneticisi; çıkışta dosyayı siler."""
+    def __init__(self, snapshot):
+        self.snapshot = Path(snapshot)
+        self.path = self.snapshot.with_name(f'.{self.snapshot.name}.restore')
+
+    def __enter__(self):
+        with gzip.open(self.snapshot, 'rb') as src, open(self.path, 'wb') as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+        return str(self.path)
+
+    def __exit__(self, *exc):
+        if self.path.exists(): self.path.unlink()
+
+@diagnostics.timed('db')
+def restore_backup(snapshot, db_path):
+    """Seçilen anlık görüntüyü integrity_check ile doğrulayıp çalışan veritabanının üzerine geri yükler.
+
+    Doğrulama başarısızsa ValueError fırlatılır ve veritabanına dokunulmaz. Geri yükleme yedekleme
+    API'siyle yapılır; açık bağlantılar (diğer istemciler dahil) yeni içeriği görür. Eski sürümden
+    alınmış görüntülere bekleyen şema geçişleri uygulanır. Veri sürümü ve değişiklik günlüğü geri
+    yüklemeden önceki değerlerin ötesine taşınır: önbellekler boşalır ve tüm istemciler tam yenileme yapar.
+    """
+    with _extracted(snapshot) as db_file:
+        source = diagnostics.track(sqlite3.connect(db_file))
+        try:
+            try: messages = [row[0] for row in source.execute('PRAGMA integrity_check').fetchall()]
+            except sqlite3.DatabaseError as e: messages = [str(e)] # Başlığı bile okunamayan dosya
+            if messages != ['ok']:
+                raise ValueError(f"Anlık görüntü bozuk: {'; '.join(messages[:5])}")
+            dest = diagnostics.track(connect(db_path))
+            try:
+                data_version, change_version = get_data_version(dest), get_change_version(dest)
+                source.backup(dest)
+                migrate(dest)
+                cursor = dest.cursor()
+                cursor.execute("UPDATE inventory_meta SET value = MAX(value, ?) + 1 WHERE key = 'data_version'", (data_version,))
+                cursor.execute("UPDATE inventory_meta SET value = MAX(value, ?) WHERE key = 'changes_compacted_to'", (change_version + 1,))
+                cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'inventory_changes'", (change_version + 1,))
+                dest.commit()
+            finally:
+                dest.close()
+        finally:
+            source.close()
+
+if __name__ == '__main__':
+    # Komut satırından: python -m src.models.backup backup|list [veritabanı] | verify|restore <veritabanı> <anlık görüntü>
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else 'backup'
+    db = sys.argv[2] if len(sys.argv) > 2 else 'inventory.db'
+    if command == 'backup':
+        print(backup_database(db).summary())
+    elif command == 'list':
+        for path, taken, size in list_backups(db): print(f"{taken:%Y-%m-%d %H:%M:%S}  {size / 1024 / 1024:8.1f} MB  {path}")
+    elif command == 'verify' and len(sys.argv) > 3:
+        problems = verify_snapshot(sys.argv[3])
+        sys.exit("Anlık görüntü bozuk:\n" + '\n'.join(problems[:20])) if problems else print("Anlık görüntü sağlam.")
+    elif command == 'restore' and len(sys.argv) > 3:
+        try: restore_backup(sys.argv[3], db)
+        except ValueError as e: sys.exit(str(e))
+        print("Geri yüklendi.")
+    else:
+        sys.exit("Kullanım: python -m src.models.backup backup|list [inventory.db] | verify|restore <inventory.db> <görüntü.db.gz>")
@@ -0,0 +1,150 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from .database import TABLE_COLUMNS, PAGE_SIZE, get_data_version, get_db_path, get_inventory_items, get_inventory_page_ids, get_vocabulary
+
+CACHE_LIMIT = 50000 # Bellekte tutulacak en fazla kayıt (aşılınca en az kullanılan atılır)
+INTERNED_FIELDS = ('category', 'status', 'location') # Az sayıda farklı değeri olan, paylaşılan dizgeler
+
+class CachedItem:
+    """Önbellekteki tek envanter kaydı; __slots__ ile nesne başına sözlük tutulmaz."""
+    __slots__ = ('id', 'name', 'category', 'model', 'brand', 'serial_number', 'purchase_date', 'status', 'location', 'notes', 'assigned_to')
+
+    def __init__(self, values):
+        # values: get_inventory_item ile aynı sırada alanlar
+        for field, value in zip(self.__slots__, values):
+            if field in INTERNED_FIELDS and value is not None:
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+    def detail(self):
+        """Detay paneli ve düzenleme penceresinin beklediği tuple (get_inventory_item biçimi)."""
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def row(self):
+        """Tablo satırı (get_inventory_page biçimi: id dışındaki boş değerler '')."""
+        return (self.id,) + tuple(getattr(self, col) or '' for col in TABLE_COLUMNS[1:])
+
+# Tablo sütunlarının get_inventory_item tuple'ındaki konumları
+_ROW_FIELDS = [CachedItem.__slots__.index(col) for col in TABLE_COLUMNS[1:]]
+
+class InventoryCache:
+    """id ile anahtarlanan, LRU tahliyeli ve veri sürümüyle geçersizleşen süreç içi kayıt önbelleği.
+
+    Her erişimde veritabanının veri sürümü (get_data_version) okunur; herhangi bir bağlantıdan
+    yapılan bir yazma sürümü değiştirdiğinden önbellek tümüyle boşaltılır. UI, veritabanı ve
+    dışa aktarım iş parçacıkları aynı örneği paylaşır; sözlük işlemleri kilitle korunur.
+    """
+    def __init__(self, limit=CACHE_LIMIT):
+        self.limit = limit
+        self.items = OrderedDict() # id -> CachedItem, en son kullanılan sonda
+        self.version = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def sync(self, conn):
+        """Veri sürümü değiştiyse önbelleği boşaltır."""
+        version = get_data_version(conn)
+        with self.lock:
+            if version != self.version:
+                self.items.clear()
+                self.version = version
+
+    def clear(self):
+        """Önbelleği boşaltır (ör. farklı bir veritabanına geçildiğinde)."""
+        with self.lock:
+            self.items.clear()
+            self.version = None
+
+    def peek(self, item_id):
+        """Veritabanına gitmeden önbellekteki kaydı döndürür; yoksa None (sürüm kontrol edilmez)."""
+        with self.lock:
+            return self.items.get(int(item_id))
+
+    def get_many(self, conn, item_ids):
+        """Kayıtları verilen sırayla döndürür; eksikleri tek sorguda çekip önbelleğe ekler. Silinmiş id'ler atlanır."""
+        self.sync(conn)
+        item_ids = [int(i) for i in item_ids]
+        found = {}
+        with self.lock:
+            for item_id in item_ids:
+                item = self.items.get(item_id)
+                if item is not None:
+                    self.items.move_to_end(item_id)
+                    found[item_id] = item
+            self.hits += len(found)
+            self.misses += len(item_ids) - len(found)
+        missing = [i for i in item_ids if i not in found]
+        if missing:
+            fetched = {row[0]: CachedItem(row) for row in get_inventory_items(conn, missing)}
+            found.update(fetched)
+            with self.lock:
+                self.items.update(fetched)
+                while len(self.items) > self.limit:
+                    self.items.popitem(last=False)
+        return [found[i] for i in item_ids if i in found]
+
+    def get_rows(self, conn, item_ids):
+        """Tablo satırlarını verilen sırayla döndürür; eksikler önbelleğe eklenmeden tek sorguda çekilir.
+
+        Tüm tabloyu dolaşan dışa aktarım için: tablonun sıcak kayıtlarını tahliye etmez ve
+        ıskalar için kayıt nesnesi oluşturmaz.
+        """
+        self.sync(conn)
+        rows = {}
+        with self.lock:
+            for item_id in item_ids:
+                item = self.items.get(item_id)
+                if item is not None:
+                    rows[item_id] = item.row()
+        missing = [i for i in item_ids if i not in rows]
+        for values in get_inventory_items(conn, missing):
+            rows[values[0]] = (values[0],) + tuple(values[i] or '' for i in _ROW_FIELDS)
+        return [rows[i] for i in item_ids if i in rows]
+
+    def get(self, conn, item_id):
+        """Tek kaydı döndürür; yoksa None."""
+        items = self.get_many(conn, [item_id])
+        return items[0] if items else None
+
+    def stats(self):
+        """Tanılama için (kayıt sayısı, isabet, ıska) döndürür."""
+        with self.lock:
+            return len(self.items), self.hits, self.misses
+
+inventory_cache = InventoryCache()
+_vocabularies = {} # veritabanı yolu -> get_vocabulary sonucu (oturum boyunca)
+
+def get_cached_vocabulary(conn):
+    """Form seçeneklerini (get_vocabulary) veritabanı başına bir kez okur; sonuçlar paylaşıldığından değiştirilmemelidir."""
+    path = get_db_path(conn)
+    if path not in _vocabularies:
+        _vocabularies[path] = get_vocabulary(conn)
+    return _vocabularies[path]
+
+def clear_vocabulary_cache():
+    """Seçenekleri bir sonraki istekte yeniden okutur (ör. içe aktarım yeni değerler eklediğinde)."""
+    _vocabularies.clear()
+
+def get_cached_item(conn, item_id):
+    """Detay panelinin beklediği öğe tuple'ını önbellekten (gerekirse veritabanından) döndürür."""
+    item = inventory_cache.get(conn, item_id)
+    return item.detail() if item else None
+
+def get_cached_page(conn, sort_column='name', descending=False, after=None, limit=PAGE_SIZE, search=None, filters=None, archive=False):
+    """get_inventory_page ile aynı sonucu verir: sıra indeksten id olarak, satırlar önbellekten gelir."""
+    ids, next_key = get_inventory_page_ids(conn, sort_column, descending, after, limit, search, filters, archive)
+    return [item.row() for item in inventory_cache.get_many(conn, ids)], next_key
+
+def iter_cached_inventory(conn, sort_column='name', descending=False, search=None, chunk_size=2000, filters=None, archive=False):
+    """iter_inventory ile aynı parçaları üretir; önbellekteki satırlar yeniden sorgulanmaz."""
+    key = None
+    while True:
+        ids, key = get_inventory_page_ids(conn, sort_column, descending, key, chunk_size, search, filters, archive)
+        rows = inventory_cache.get_rows(conn, ids)
+        if rows:
+            yield rows
+        if key is None:
+            break
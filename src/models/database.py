@@ -1,14 +1,121 @@
+import os
+import re
 import sqlite3
 import datetime
+import functools
 from pathlib import Path
 
-def init_db():
-    """Veritabanı bağlantısını oluşturur ve diğer modüllerle uyumlu tabloları kurar."""
-    db_path = Path('inventory.db')
-    conn = sqlite3.connect(db_path)
+from .vocabulary import CATEGORIES, STATUSES, LOCATIONS, BRANDS_BY_CATEGORY
+
+DB_PATH = 'inventory.db'
+# Bağlantı ayarları: büyük envanterler için WAL, NORMAL senkronizasyon, mmap ve geniş sayfa önbelleği.
+# Ağ paylaşımındaki veritabanlarında WAL desteklenmez; ENVANTER_JOURNAL_MODE=DELETE ile kapatılabilir.
+JOURNAL_MODE = os.environ.get('ENVANTER_JOURNAL_MODE', 'WAL')
+CACHE_SIZE_KB = 64 * 1024 # 64 MB sayfa önbelleği
+MMAP_SIZE = 256 * 1024 * 1024 # 256 MB bellek eşlemeli okuma
+BUSY_TIMEOUT = 10 # Başka bir istemci yazarken beklenecek süre (saniye)
+
+# Ana tabloda (Treeview) gösterilen sütunlar, başta id olacak şekilde
+TABLE_COLUMNS = ['id', 'assigned_to', 'name', 'category', 'model', 'brand',
+                 'serial_number', 'purchase_date', 'status', 'location']
+SORTABLE_COLUMNS = TABLE_COLUMNS[1:]
+# Bir envanter öğesinin kullanıcı tarafından girilen alanları
+ITEM_FIELDS = ['name', 'category', 'model', 'brand', 'serial_number', 'purchase_date', 'status', 'location', 'notes', 'assigned_to']
+DEFAULT_STATUS = 'Aktif Kullanımda'
+EMPTY_CHOICE = "Seçiniz..." # Combobox'larda seçim yapılmadığını gösteren değer
+CHANGE_BATCH_LIMIT = 1000 # Bundan fazla değişiklikte istemci tabloyu baştan yükler
+CHANGE_LOG_KEEP_DAYS = 30 # Değişiklik günlüğünde saklanacak süre
+MAX_SQL_VARIABLES = 900 # Eski SQLite sürümlerindeki 999 bağlı değişken sınırının altında kalmak için
+_TABLE_SELECT = ', '.join(c if c == 'id' else f"COALESCE({c}, '')" for c in TABLE_COLUMNS)
+PAGE_SIZE = 200 # Sanal kaydırmada tek seferde çekilecek satır sayısı
+# Tam metin aramaya (FTS5) dahil edilen sütunlar
+SEARCH_COLUMNS = ['name', 'model', 'brand', 'serial_number', 'assigned_to', 'location', 'notes']
+# Özet istatistik tablosunda sayılan boyutlar
+STAT_DIMENSIONS = ['status', 'category', 'location', 'brand', 'assigned_to']
+# Eski sürümlerden kalan durum değerlerinin güncel karşılıkları
+LEGACY_STATUSES = {'Aktif': 'Aktif Kullanımda'}
+# Sol paneldeki filtrelenebilir alanlar (hepsi özet tabloda sayılır)
+FACET_COLUMNS = ['status', 'category', 'location', 'brand', 'assigned_to']
+NUMBER_WIDTH = 20 # Doğal sıralama anahtarında sayıların sıfırla doldurulduğu genişlik
+# Benzer kayıt kontrolünde seri numarasından atılan ayırıcılar ve sık karıştırılan harflerin rakam karşılıkları
+SERIAL_FOLDS = [(' ', ''), ('-', ''), ('.', ''), ('/', ''), ('_', ''), ('O', '0'), ('I', '1'), ('L', '1'), ('Z', '2'), ('S', '5'), ('B', '8')]
+_ASCII_UPPER = str.maketrans('abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ') # SQLite UPPER/LOWER yalnızca ASCII'ye dokunur
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+# Arşiv: bu durumda ARCHIVE_AFTER_DAYS günden uzun kalan öğeler inventory_archive tablosuna taşınır
+ARCHIVE_STATUS = 'Hurda'
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ENVANTER_ARCHIVE_DAYS', '365'))
+ARCHIVE_BATCH_SIZE = 200 # Arşivleme işinin tek işlemde taşıdığı en fazla öğe
+ARCHIVE_STATS_PREFIX = 'archive:' # Arşivdeki öğelerin özet tablodaki boyut öneki ('archive:status' vb.)
+# Her tablonun tam metin arama indeksi
+SEARCH_INDEXES = {'inventory_items': 'inventory_fts', 'inventory_archive': 'inventory_archive_fts'}
+# Sözlük tablolarına taşınan alanlar: satırlar değeri değil <alan>_id tamsayısını saklar
+LOOKUP_TABLES = {'category': 'categories', 'brand': 'brands', 'status': 'statuses', 'location': 'locations'}
+# Okuma görünümleri: tablonun sütunları ve sözlük alanlarının metin değerleri (sorgular bunlardan okur)
+READ_VIEWS = {'inventory_items': 'inventory_view', 'inventory_archive': 'inventory_archive_view'}
+
+def natural_sort_key(value):
+    """Doğal sıralama anahtarı üretir ('PC 9' < 'PC 10'); boş değer için '' döndürür."""
+    if value is None: return ''
+    text = str(value).strip().lower()
+    return re.sub(r'[0-9]+', lambda m: m.group().lstrip('0').rjust(NUMBER_WIDTH, '0'), text)
+
+@functools.total_ordering
+class _Descending:
+    """Karşılaştırmayı tersine çeviren sarmalayıcı (azalan sıralı listelerde bisect için)."""
+    __slots__ = ('value',)
+    def __init__(self, value): self.value = value
+    def __eq__(self, other): return self.value == other.value
+    def __lt__(self, other): return self.value > other.value
+
+def inventory_sort_key(value, item_id, descending=False):
+    """Bir satırın tablodaki yerini belirleyen anahtarı döndürür (get_inventory_page ile aynı sıra)."""
+    key = natural_sort_key(value)
+    if not key: # Boş değerler her iki yönde de sonda, id sırasıyla
+        return (1, -item_id if descending else item_id)
+    return (0, _Descending((key, item_id)) if descending else (key, item_id))
+
+def _sort_key_values(item_data):
+    """Sıralanabilir her sütun için saklanacak doğal sıralama anahtarlarını döndürür.
+
+    Durum _item_values'daki gibi normalize edilir; anahtar her zaman saklanan değerindir.
+    """
+    return [natural_sort_key(normalize_status(item_data.get(col)) if col == 'status' else item_data.get(col)) for col in SORTABLE_COLUMNS]
+
+def connect(db_path=DB_PATH):
+    """Veritabanına ayarlı (journal modu, senkronizasyon, mmap, önbellek) bir bağlantı açar.
+
+    Uygulamanın tüm bağlantıları (UI, arka plan iş parçacıkları, komut satırı araçları) buradan açılır.
+    """
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT)
+    conn.execute(f'PRAGMA journal_mode = {JOURNAL_MODE}')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute(f'PRAGMA cache_size = -{CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    return conn
+
+def init_db(db_path=DB_PATH):
+    """Veritabanı bağlantısını açar, bekleyen şema geçişlerini uygular ve varsayılan admin kullanıcısını ekler."""
+    conn = connect(db_path)
+    migrate(conn)
+    _compact_change_log_daily(conn)
+    
+    # Varsayılan admin kullanıcısı (admin/admin)
     cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            INSERT INTO users (username, password, role)
+            VALUES (?, ?, ?)
+        ''', ('admin', 'admin', 'admin'))
+    except sqlite3.IntegrityError:
+        pass  # Kullanıcı zaten varsa geç
     
-    # Kullanıcılar tablosu (main_window.py ile UYUMLU)
+    conn.commit()
+    return conn
+
+def _create_base_schema(conn):
+    """Geçiş 1: Kullanıcılar ve envanter tabloları."""
+    cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -17,8 +124,6 @@ def init_db():
             role TEXT NOT NULL DEFAULT 'user'
         )
     ''')
-    
-    # Envanter tablosu (main_window.py ile UYUMLU)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS inventory_items (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -35,27 +140,765 @@ def init_db():
             last_updated_by TEXT
         )
     ''')
-    
-    # Varsayılan admin kullanıcısı (admin/admin)
+
+def _create_filter_indexes(conn):
+    """Geçiş 5: Filtrelemede kullanılan sütunların indeksleri."""
+    cursor = conn.cursor()
+    for col in ['status', 'category', 'location', 'brand']:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_inventory_{col} ON inventory_items ({col})')
+
+def init_search(conn):
+    """Arama için FTS5 sanal tablosunu ve onu inventory_items ile senkron tutan tetikleyicileri kurar.
+
+    SQLite FTS5 olmadan derlenmişse False döndürür; arama bu durumda LIKE ile yapılır.
+    """
+    result = _create_search_index(conn.cursor(), 'inventory_items')
+    conn.commit()
+    return result
+
+def _create_search_index(cursor, table):
+    """table için harici içerikli FTS5 indeksini (SEARCH_INDEXES) ve tetikleyicilerini kurar; FTS5 yoksa False."""
+    fts = SEARCH_INDEXES[table]
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,))
+    exists = cursor.fetchone() is not None
+    encoded = _encoded(cursor, table)
+    content = READ_VIEWS[table] if encoded else table # Sözlük alanlarının metni görünümden okunur
+    cols = ', '.join(SEARCH_COLUMNS)
+    new_cols = ', '.join(_column_sql(c, 'new', encoded) for c in SEARCH_COLUMNS)
+    old_cols = ', '.join(_column_sql(c, 'old', encoded) for c in SEARCH_COLUMNS)
+    updated = ', '.join(_stored_column(c) if encoded else c for c in SEARCH_COLUMNS)
     try:
+        # Harici içerikli tablo: metin yalnızca ana tabloda saklanır, FTS sadece indeksi tutar
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {cols}, content='{content}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Uyarı: FTS5 kullanılamıyor, arama LIKE ile yapılacak ({e})")
+        return False
+    
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {updated} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    ''')
+    if not exists: # Mevcut kayıtları ilk kurulumda indeksle
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    return True
+
+def normalize_status(status):
+    """Durum değerini istatistiklerde kullanılan biçime getirir (eski 'Aktif' -> 'Aktif Kullanımda')."""
+    status = status or ''
+    return LEGACY_STATUSES.get(status, status)
+
+def _encoded(cursor, table):
+    """table sözlük alanlarını id olarak saklıyorsa (geçiş 12 sonrası) True; önceki geçişler eski şemada çalışır."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == 'category_id' for row in cursor.fetchall())
+
+def _stored_column(col):
+    """Alanın tabloda saklandığı sütun: sözlük alanları için <alan>_id."""
+    return f'{col}_id' if col in LOOKUP_TABLES else col
+
+def _column_sql(col, ref, encoded=False):
+    """Tetikleyicilerde alanın metin değerini veren SQL ifadesi (ref: 'new' / 'old' / tablo adı)."""
+    if encoded and col in LOOKUP_TABLES:
+        return f"(SELECT name FROM {LOOKUP_TABLES[col]} WHERE id = {ref}.{col}_id)"
+    return f'{ref}.{col}'
+
+def _lookup_id_sql(col):
+    """Yazmalarda sözlük değerinin id'sini veren SQL ifadesi (parametre: değer); boş değer NULL olur."""
+    return f"(SELECT id FROM {LOOKUP_TABLES[col]} WHERE name = ?)"
+
+def _stat_value_sql(dimension, ref, encoded=False):
+    """Tetikleyicilerde boyut değerini normalize eden SQL ifadesini döndürür (ref: 'new' / 'old')."""
+    expr = f"COALESCE({_column_sql(dimension, ref, encoded)}, '')"
+    if dimension == 'status' and not encoded: # Sözlükte eski değer yoktur
+        cases = ' '.join(f"WHEN '{old}' THEN '{new}'" for old, new in LEGACY_STATUSES.items())
+        expr = f"CASE {expr} {cases} ELSE {expr} END"
+    return expr
+
+def init_statistics(conn):
+    """Sol paneldeki sayaçlar için tetikleyicilerle güncel tutulan özet tabloyu kurar."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'inventory_stats'")
+    exists = cursor.fetchone() is not None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_stats (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    ''')
+    _create_stats_triggers(cursor, 'inventory_items', 'inventory_stats')
+    if not exists: # Mevcut kayıtlar için ilk sayım
+        rebuild_statistics(conn)
+    conn.commit()
+
+def _create_stats_triggers(cursor, table, name, prefix=''):
+    """table'daki her ekleme/silme/güncellemede özet tablodaki prefix+boyut sayaçlarını güncelleyen tetikleyicileri kurar."""
+    encoded = _encoded(cursor, table)
+    increment = ''.join(f'''
+            INSERT INTO inventory_stats (dimension, value, count) VALUES ('{prefix}{dim}', {_stat_value_sql(dim, 'new', encoded)}, 1)
+                ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;''' for dim in STAT_DIMENSIONS)
+    decrement = ''.join(f'''
+            UPDATE inventory_stats SET count = count - 1
+                WHERE dimension = '{prefix}{dim}' AND value = {_stat_value_sql(dim, 'old', encoded)};''' for dim in STAT_DIMENSIONS)
+    updated = ', '.join(_stored_column(dim) if encoded else dim for dim in STAT_DIMENSIONS)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {table} BEGIN{increment}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {table} BEGIN{decrement}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {updated} ON {table} BEGIN{decrement}{increment}
+        END
+    ''')
+
+def _stat_sources(conn):
+    """Özet tabloda sayılan (tablo, boyut öneki) çiftleri: ana tablo ve kurulmuşsa arşiv."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'inventory_archive'")
+    return [('inventory_items', '')] + ([('inventory_archive', ARCHIVE_STATS_PREFIX)] if cursor.fetchone() else [])
+
+def _text_source(cursor, table):
+    """Alan değerlerinin metin olarak okunduğu kaynak: sözlük kodlu tablolar için okuma görünümü."""
+    return READ_VIEWS[table] if _encoded(cursor, table) else table
+
+def rebuild_statistics(conn):
+    """Özet istatistik tablosunu ana tablodan (ve arşivden) baştan hesaplar (toplu işlemlerden sonra tek seferlik)."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM inventory_stats")
+    for table, prefix in _stat_sources(conn):
+        source = _text_source(cursor, table)
+        for dim in STAT_DIMENSIONS:
+            expr = _stat_value_sql(dim, source)
+            cursor.execute(f'''
+                INSERT INTO inventory_stats (dimension, value, count)
+                SELECT '{prefix}{dim}', {expr}, COUNT(*) FROM {source} GROUP BY 2
+            ''')
+    conn.commit()
+
+def verify_statistics(conn):
+    """Özet tabloyu ana tablodaki (ve arşivdeki) gerçek sayılarla karşılaştırır.
+
+    Uyuşmayan değerleri [(boyut, değer, özet_sayı, gerçek_sayı)] listesi olarak döndürür; boş liste tutarlı demektir.
+    """
+    cursor = conn.cursor()
+    mismatches = []
+    for table, prefix in _stat_sources(conn):
+        source = _text_source(cursor, table)
+        for dim in STAT_DIMENSIONS:
+            expr = _stat_value_sql(dim, source)
+            cursor.execute(f"SELECT {expr}, COUNT(*) FROM {source} GROUP BY 1")
+            actual = dict(cursor.fetchall())
+            stored = get_statistics(conn, prefix + dim)
+            for value in sorted(set(actual) | set(stored)):
+                if actual.get(value, 0) != stored.get(value, 0):
+                    mismatches.append((prefix + dim, value, stored.get(value, 0), actual.get(value, 0)))
+    return mismatches
+
+def get_statistics(conn, dimension='status', archive=False):
+    """Özet tablodan bir boyutun {değer: adet} sayılarını okur (boyuttaki değer sayısı kadar satır).
+
+    archive True ise arşivdeki öğelerin sayıları da eklenir.
+    """
+    dims = [dimension] + ([ARCHIVE_STATS_PREFIX + dimension] if archive else [])
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT value, SUM(count) FROM inventory_stats
+        WHERE dimension IN ({', '.join('?' * len(dims))}) AND count > 0 GROUP BY value
+    ''', dims)
+    return dict(cursor.fetchall())
+
+def build_match_query(text):
+    """Arama metnini önek eşleşmeli FTS5 sorgusuna çevirir: 'dell 5cd' -> '"dell"* "5cd"*'."""
+    return ' '.join(f'"{token}"*' for token in re.findall(r'\w+', text.lower()))
+
+def _search_filter(conn, search, table='inventory_items'):
+    """Arama metni için (WHERE parçası, parametreler) döndürür; tablonun FTS5 indeksi yoksa LIKE'a düşer."""
+    match = build_match_query(search or '')
+    if not match:
+        return '', []
+    fts = SEARCH_INDEXES[table]
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,))
+    if cursor.fetchone():
+        return f' AND id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)', [match]
+    like = ' OR '.join(f"{c} LIKE ?" for c in SEARCH_COLUMNS) # Sözlük alanlarının metni görünümdedir
+    return f' AND id IN (SELECT id FROM {READ_VIEWS[table]} WHERE {like})', [f'%{search.strip()}%'] * len(SEARCH_COLUMNS)
+
+def _facet_filter(filters, skip=None):
+    """{sütun: değer} filtreleri için (WHERE parçası, parametreler) döndürür; skip sütunu hariç tutulur.
+
+    Boş değer NULL ve '' satırlarını kapsar (özet tabloyla aynı). Sözlük alanları tamsayı id
+    üzerinden süzülür: değerin id'si bir kez bulunur, filtre indeksi eşitlikle kullanılır.
+    """
+    where, params = '', []
+    for col, value in (filters or {}).items():
+        if col == skip or col not in FACET_COLUMNS:
+            continue
+        if col in LOOKUP_TABLES:
+            where += f" AND {col}_id = {_lookup_id_sql(col)}" if value else f" AND {col}_id IS NULL"
+            params += [value] if value else []
+        elif value:
+            where += f" AND {col} = ?"
+            params.append(value)
+        else:
+            where += f" AND ({col} IS NULL OR {col} = '')"
+    return where, params
+
+def _view_filter(conn, search, filters, table='inventory_items'):
+    """Arama ve alan filtrelerinin birleşik (WHERE parçası, parametreler) çiftini döndürür."""
+    where, params = _search_filter(conn, search, table)
+    facet_where, facet_params = _facet_filter(filters)
+    return where + facet_where, params + facet_params
+
+def _view_tables(archive):
+    """Görünümün sorgulandığı tablolar: yalnızca sıcak tablo veya arşivle birlikte."""
+    return ('inventory_items', 'inventory_archive') if archive else ('inventory_items',)
+
+def _view_select(conn, select, where, params, search, filters, archive=False, names=False):
+    """Görünümün her tablosu için aynı SELECT'i kurar, arşiv dahilse UNION ALL ile birleştirir.
+
+    Filtreler yalnızca tablonun kendi sütunlarını kullanır; select sözlük alanlarının metnini
+    içeriyorsa names=True ile okuma görünümünden okunur (SQLite kullanılmayan LEFT JOIN'leri
+    her zaman atlamadığından sayım ve id sorguları doğrudan tablodan yapılır).
+
+    Her kol kendi arama indeksini ve filtrelerini kullanır; where/params (ör. keyset koşulu)
+    filtrelerden sonra eklenir. (sql, parametreler) döndürür.
+    """
+    arms, arm_params = [], []
+    for table in _view_tables(archive):
+        view_where, view_params = _view_filter(conn, search, filters, table)
+        arms.append(f"SELECT {select} FROM {READ_VIEWS[table] if names else table} WHERE 1{view_where}{where}")
+        arm_params += view_params + list(params)
+    return ' UNION ALL '.join(arms), arm_params
+
+def get_facet_counts(conn, filters=None, search=None, archive=False):
+    """Her filtre alanı için {değer: adet} sayılarını, diğer alanlardaki seçimlere göre döndürür.
+
+    Bir alanın sayıları kendi seçimini değil, öteki seçimleri ve aramayı yansıtır (seçim
+    değiştirilebilsin diye). Hiç kısıt yoksa özet tablodan okunur; aksi halde her alanın
+    kapsayan indeksi (idx_inventory_facet_*) tabloya dokunmadan yalnızca eşleşen aralığı tarar.
+    Sözlük alanları id'ye göre sayılıp adlarına çevrilir. archive True ise arşivdeki öğeler de sayılır.
+    """
+    cursor = conn.cursor()
+    counts = {}
+    for col in FACET_COLUMNS:
+        others = {c: v for c, v in (filters or {}).items() if c != col}
+        if not _facet_filter(others)[0] and not build_match_query(search or ''):
+            counts[col] = get_statistics(conn, col, archive)
+            continue
+        stored = _stored_column(col)
+        sql, params = _view_select(conn, stored, '', [], search, others, archive)
+        cursor.execute(f"SELECT {stored}, COUNT(*) FROM ({sql}) GROUP BY {stored}", params)
+        rows = cursor.fetchall()
+        names = _lookup_names(conn, col) if col in LOOKUP_TABLES else {}
+        merged = {}
+        for value, count in rows:
+            value = names.get(value, '') if col in LOOKUP_TABLES else (value or '')
+            merged[value] = merged.get(value, 0) + count
+        counts[col] = merged
+    return counts
+
+def ensure_sort_keys(conn):
+    """Her sıralanabilir sütun için <sütun>_sort anahtar sütununu ve indeksini kurar, eksikleri doldurur."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(inventory_items)")
+    existing = {row[1] for row in cursor.fetchall()}
+    
+    stale = []
+    for col in SORTABLE_COLUMNS:
+        if f'{col}_sort' not in existing:
+            cursor.execute(f"ALTER TABLE inventory_items ADD COLUMN {col}_sort TEXT NOT NULL DEFAULT ''")
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_inventory_{col}_sort ON inventory_items ({col}_sort)')
+        stale.append(f"({col}_sort = '' AND TRIM(COALESCE({col}, '')) <> '')")
+    
+    # Anahtarı olmayan (yeni eklenen sütun veya eski sürümle yazılmış) satırları doldur
+    source = _text_source(cursor, 'inventory_items')
+    cursor.execute(f"SELECT id, {', '.join(SORTABLE_COLUMNS)} FROM {source} WHERE {' OR '.join(stale)}")
+    updates = [_sort_key_values(dict(zip(SORTABLE_COLUMNS, row[1:]))) + [row[0]] for row in cursor.fetchall()]
+    if updates:
+        assignments = ', '.join(f'{col}_sort = ?' for col in SORTABLE_COLUMNS)
+        cursor.executemany(f'UPDATE inventory_items SET {assignments} WHERE id = ?', updates)
+    conn.commit()
+
+def _create_facet_indexes(conn):
+    """Filtre paneli için her alanla başlayıp tüm filtre alanlarını içeren kapsayan indeksleri kurar.
+
+    Bir alana göre süzülmüş sorgu diğer alanların sayılarını indeksten okur (tabloya gitmez).
+    Eski tek sütunlu filtre indeksleri bu indekslerin önekidir; kaldırılır. Özet tabloya yeni
+    boyutlar (marka, zimmet sahibi) eklendiğinden tetikleyiciler de yeniden kurulur.
+    """
+    cursor = conn.cursor()
+    for col in ['status', 'category', 'location', 'brand']:
+        cursor.execute(f'DROP INDEX IF EXISTS idx_inventory_{col}')
+    columns = [_stored_column(c) for c in FACET_COLUMNS] if _encoded(cursor, 'inventory_items') else FACET_COLUMNS
+    for col, stored in zip(FACET_COLUMNS, columns):
+        others = ', '.join(c for c in columns if c != stored)
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_inventory_facet_{col} ON inventory_items ({stored}, {others})')
+    for suffix in ('ai', 'ad', 'au'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS inventory_stats_{suffix}')
+    init_statistics(conn)
+    rebuild_statistics(conn)
+
+def init_data_version(conn):
+    """Her yazmada artan kalıcı veri sürümü sayacını kurar (önbellek geçersizleştirme için).
+
+    PRAGMA data_version yalnızca başka bağlantıların yazmalarını gösterdiğinden sayaç,
+    ana tablodaki her ekleme/güncelleme/silmede tetikleyiciyle artırılan bir satırda tutulur.
+    """
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO inventory_meta (key, value) VALUES ('data_version', 0)")
+    for suffix, event in (('ai', 'INSERT'), ('ad', 'DELETE'), ('au', 'UPDATE')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS inventory_version_{suffix} AFTER {event} ON inventory_items BEGIN
+                UPDATE inventory_meta SET value = value + 1 WHERE key = 'data_version';
+            END
+        ''')
+    conn.commit()
+
+def get_data_version(conn):
+    """Envanterin veri sürümünü döndürür; herhangi bir yazmadan sonra değişir."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT value FROM inventory_meta WHERE key = 'data_version'")
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def init_change_log(conn):
+    """Birden çok istemcinin birbirinin değişikliklerini görmesi için ekleme-yalnız değişiklik günlüğünü kurar.
+
+    Her ekleme/güncelleme/silme tetikleyicilerle bir satır olarak yazılır; version (AUTOINCREMENT)
+    hiç geri gitmez. Yazan kullanıcı last_updated_by sütunundan alınır; silmelerde bu sütun
+    olmadığından yazarı delete_inventory_items doldurur.
+    """
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_changes (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            author TEXT,
+            changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for suffix, event, ref in (('ai', 'INSERT', 'new'), ('au', 'UPDATE', 'new'), ('ad', 'DELETE', 'old')):
+        author = 'NULL' if event == 'DELETE' else f'{ref}.last_updated_by'
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS inventory_changes_{suffix} AFTER {event} ON inventory_items BEGIN
+                INSERT INTO inventory_changes (item_id, operation, author) VALUES ({ref}.id, '{event[0]}', {author});
+            END
+        ''')
+    cursor.execute("INSERT OR IGNORE INTO inventory_meta (key, value) VALUES ('changes_compacted_to', 0)")
+    conn.commit()
+
+def get_change_version(conn):
+    """Değişiklik günlüğündeki en son sürümü döndürür (istemcinin başlangıç noktası)."""
+    cursor = conn.cursor()
+    cursor.execute('SELECT MAX(version) FROM inventory_changes')
+    return cursor.fetchone()[0] or 0
+
+def get_changes(conn, since, limit=CHANGE_BATCH_LIMIT):
+    """since'ten sonraki değişiklikleri (sürüm, öğe id, işlem 'I'/'U'/'D', yazar) listesi olarak döndürür.
+
+    Günlük since'in ötesine kadar sıkıştırılmışsa veya limit'ten fazla değişiklik varsa None döner;
+    bu durumda istemci tabloyu baştan yüklemelidir.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT value FROM inventory_meta WHERE key = 'changes_compacted_to'")
+    row = cursor.fetchone()
+    if row and since < row[0]:
+        return None
+    cursor.execute('''
+        SELECT version, item_id, operation, author FROM inventory_changes
+        WHERE version > ? ORDER BY version LIMIT ?
+    ''', (since, limit + 1))
+    changes = cursor.fetchall()
+    return None if len(changes) > limit else changes
+
+def compact_change_log(conn, keep_days=CHANGE_LOG_KEEP_DAYS):
+    """keep_days günden eski günlük kayıtlarını siler, silinen satır sayısını döndürür.
+
+    Silinen son sürüm saklanır; daha eski bir sürümden değişiklik isteyen istemci tam yenileme yapar.
+    """
+    cursor = conn.cursor()
+    cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=keep_days)).strftime('%Y-%m-%d %H:%M:%S')
+    # Sürüm sırası zaman sırasıdır: ilk saklanacak kaydı bulmak için yalnızca eski kayıtlar taranır
+    cursor.execute('SELECT version FROM inventory_changes WHERE changed_at >= ? ORDER BY version LIMIT 1', (cutoff,))
+    row = cursor.fetchone()
+    keep_from = row[0] if row else get_change_version(conn) + 1
+    cursor.execute('DELETE FROM inventory_changes WHERE version < ?', (keep_from,))
+    deleted = cursor.rowcount
+    if deleted:
         cursor.execute('''
-            INSERT INTO users (username, password, role)
-            VALUES (?, ?, ?)
-        ''', ('admin', 'admin', 'admin'))
-    except sqlite3.IntegrityError:
-        pass  # Kullanıcı zaten varsa geç
-        
-    # Varsayılan normal kullanıcı (user/user)
+            UPDATE inventory_meta SET value = MAX(value, ?) WHERE key = 'changes_compacted_to'
+        ''', (keep_from - 1,))
+    conn.commit()
+    return deleted
+
+def _compact_change_log_daily(conn):
+    """compact_change_log'u günde en çok bir kez çalıştırır (init_db her açılışta, ör. her CLI komutunda çağırır).
+
+    Son sıkıştırma günü inventory_meta'da gün sırası (date.toordinal) olarak tutulur.
+    """
+    today = datetime.date.today().toordinal()
+    cursor = conn.cursor()
+    cursor.execute("SELECT value FROM inventory_meta WHERE key = 'changes_compacted_on'")
+    row = cursor.fetchone()
+    if row and row[0] >= today:
+        return 0
+    cursor.execute("INSERT OR REPLACE INTO inventory_meta (key, value) VALUES ('changes_compacted_on', ?)", (today,))
+    return compact_change_log(conn) # Aynı işlemde işlenir
+
+def serial_key(serial):
+    """Seri numarasının benzerlik anahtarı: büyük harf, ayırıcısız, O/I/L/Z/S/B rakama katlanmış ('5cd-12o4' -> '5CD1204').
+
+    _serial_key_sql ile birebir aynı dönüşümdür; boş seri no için None döner.
+    """
+    if not serial:
+        return None
+    key = str(serial).translate(_ASCII_UPPER)
+    for old, new in SERIAL_FOLDS:
+        key = key.replace(old, new)
+    return key
+
+def name_key(name, model):
+    """Ad+modelin benzerlik anahtarı: küçük harf, kırpılmış, çift boşluklar teke indirilmiş (_name_key_sql ile aynı)."""
+    key = f"{name or ''} {model or ''}".translate(_ASCII_LOWER)
+    return key.replace('  ', ' ').replace('  ', ' ').strip(' ')
+
+def _serial_key_sql(ref):
+    """serial_key'in tetikleyicilerde kullanılan SQL karşılığı."""
+    expr = f"UPPER(NULLIF({ref}.serial_number, ''))"
+    for old, new in SERIAL_FOLDS:
+        expr = f"REPLACE({expr}, '{old}', '{new}')"
+    return expr
+
+def _name_key_sql(ref):
+    """name_key'in tetikleyicilerde kullanılan SQL karşılığı."""
+    expr = f"LOWER(COALESCE({ref}.name, '') || ' ' || COALESCE({ref}.model, ''))"
+    return f"TRIM(REPLACE(REPLACE({expr}, '  ', ' '), '  ', ' '))"
+
+def init_duplicate_index(conn):
+    """Geçiş 9: Benzer kayıt kontrolü için seri no ve ad+model anahtarlarının trigram indeksini kurar.
+
+    inventory_dup tablosu (rowid = öğe id) anahtarları tutar ve tetikleyicilerle güncel kalır;
+    trigram belirteçleyicisi alt dizgi aramasını indeksten yapar. SQLite 3.34'ten eskiyse
+    (trigram yok) False döndürür; bu durumda yalnızca UNIQUE seri no kısıtı geçerlidir.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'inventory_dup'")
+    exists = cursor.fetchone() is not None
     try:
-        cursor.execute('''
-            INSERT INTO users (username, password, role)
-            VALUES (?, ?, ?)
-        ''', ('user', 'user', 'user'))
-    except sqlite3.IntegrityError:
-        pass  # Kullanıcı zaten varsa geç
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS inventory_dup USING fts5(serial_key, name_key, tokenize='trigram')")
+    except sqlite3.OperationalError as e:
+        print(f"Uyarı: trigram indeksi kullanılamıyor, benzer kayıt kontrolü yapılmayacak ({e})")
+        return False
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS inventory_dup_ai AFTER INSERT ON inventory_items BEGIN
+            INSERT INTO inventory_dup (rowid, serial_key, name_key) VALUES (new.id, {_serial_key_sql('new')}, {_name_key_sql('new')});
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS inventory_dup_ad AFTER DELETE ON inventory_items BEGIN
+            DELETE FROM inventory_dup WHERE rowid = old.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS inventory_dup_au AFTER UPDATE OF serial_number, name, model ON inventory_items BEGIN
+            UPDATE inventory_dup SET serial_key = {_serial_key_sql('new')}, name_key = {_name_key_sql('new')} WHERE rowid = new.id;
+        END
+    ''')
+    if not exists: # Mevcut kayıtları ilk kurulumda indeksle
+        cursor.execute(f"INSERT INTO inventory_dup (rowid, serial_key, name_key) SELECT id, {_serial_key_sql('inventory_items')}, {_name_key_sql('inventory_items')} FROM inventory_items")
+    conn.commit()
+    return True
+
+def _create_date_index(conn):
+    """Geçiş 10: Alım tarihi aralık sorguları (yaş raporları) için indeks."""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_inventory_purchase_date ON inventory_items (purchase_date)')
+
+def init_archive(conn):
+    """Geçiş 11: Hurdaya ayrılmış öğeler için arşiv tablosunu ve durum değişikliği zamanını kurar.
+
+    inventory_archive ana tablonun sütunlarını (archived_at ile) taşır ve öğelerin id'lerini korur;
+    kendi arama indeksi, özet tablo sayaçları ('archive:' önekli boyutlar), veri sürümü ve silme
+    günlüğü tetikleyicileri vardır. Arşiv soğuk olduğundan filtre indeksleri yalnızca sıcak tablodadır.
+    status_changed_at mevcut kayıtlar için geçiş anıyla doldurulur (önceki geçmiş bilinmez).
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(inventory_items)")
+    columns = [(row[1], row[2]) for row in cursor.fetchall()]
+    if 'status_changed_at' not in dict(columns):
+        cursor.execute("ALTER TABLE inventory_items ADD COLUMN status_changed_at TEXT")
+        cursor.execute("UPDATE inventory_items SET status_changed_at = CURRENT_TIMESTAMP")
+        columns.append(('status_changed_at', 'TEXT'))
+    # Arşivlenecekleri bulan kısmi indeks: yalnızca ARCHIVE_STATUS durumundaki satırları içerir
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_inventory_archivable ON inventory_items (status_changed_at) WHERE status = '{ARCHIVE_STATUS}'")
     
+    definitions = ', '.join('id INTEGER PRIMARY KEY' if name == 'id' else f'{name} {type_}' for name, type_ in columns)
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS inventory_archive ({definitions}, archived_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)")
+    _create_archive_objects(cursor)
     conn.commit()
-    return conn
+
+def _create_archive_objects(cursor):
+    """Arşiv tablosunun indekslerini, arama indeksini ve tetikleyicilerini kurar (idempotent)."""
+    for col in [f'{c}_sort' for c in SORTABLE_COLUMNS] + ['serial_number', 'purchase_date']:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_inventory_archive_{col} ON inventory_archive ({col})')
+    _create_search_index(cursor, 'inventory_archive')
+    _create_stats_triggers(cursor, 'inventory_archive', 'inventory_archive_stats', ARCHIVE_STATS_PREFIX)
+    for suffix, event in (('ai', 'INSERT'), ('ad', 'DELETE'), ('au', 'UPDATE')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS inventory_archive_version_{suffix} AFTER {event} ON inventory_archive BEGIN
+                UPDATE inventory_meta SET value = value + 1 WHERE key = 'data_version';
+            END
+        ''')
+    # Arşive taşıma ana tablodan silme olarak, geri alma ana tabloya ekleme olarak zaten günlüğe yazılır;
+    # arşivdeki bir öğenin silinmesi ise diğer istemcilerin arşiv görünümü için ayrıca yazılır
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS inventory_archive_changes_ad AFTER DELETE ON inventory_archive BEGIN
+            INSERT INTO inventory_changes (item_id, operation, author) VALUES (old.id, 'D', NULL);
+        END
+    ''')
+
+def init_lookups(conn):
+    """Geçiş 12: Kategori, marka, durum ve konum değerlerini sözlük tablolarına taşır.
+
+    Her değer categories/brands/statuses/locations tablolarında bir kez tutulur; ana tablo ve arşiv
+    yalnızca tamsayı id'sini (<alan>_id) saklar. SQLite sütun türünü değiştiremediğinden iki tablo
+    yeni şemayla yeniden kurulur (id'ler ve AUTOINCREMENT sayacı korunur, eski 'Aktif' değeri
+    'Aktif Kullanımda' olur). Sorgular metin değerlerini okuma görünümlerinden (READ_VIEWS) alır;
+    arama indeksleri de içeriklerini bu görünümlerden okuyacak şekilde yeniden kurulur.
+    Sözlükler vocabulary.py'deki seçenekler ve mevcut değerlerle doldurulur; category_brands
+    formdaki kategoriye göre marka listelerini tutar.
+    """
+    cursor = conn.cursor()
+    for table in LOOKUP_TABLES.values():
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, position INTEGER)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS category_brands (
+            category_id INTEGER NOT NULL REFERENCES categories (id),
+            brand_id INTEGER NOT NULL REFERENCES brands (id),
+            PRIMARY KEY (category_id, brand_id)
+        ) WITHOUT ROWID
+    ''')
+    brands = list(dict.fromkeys(brand for names in BRANDS_BY_CATEGORY.values() for brand in names))
+    for col, names in (('category', CATEGORIES), ('brand', brands), ('status', STATUSES), ('location', LOCATIONS)):
+        cursor.executemany(f'INSERT OR IGNORE INTO {LOOKUP_TABLES[col]} (name, position) VALUES (?, ?)', [(name, position) for position, name in enumerate(names)])
+    _add_category_brands(cursor, [(category, brand) for category, names in BRANDS_BY_CATEGORY.items() for brand in names])
+    conn.commit()
+    
+    for table in READ_VIEWS:
+        if not _encoded(cursor, table): # Her tablo kendi işleminde: yarıda kalırsa geçiş baştan güvenle yeniden çalışır
+            cursor.execute('BEGIN IMMEDIATE')
+            _encode_table(cursor, table)
+            conn.commit()
+    for table, view in READ_VIEWS.items():
+        names = ', '.join(f"COALESCE({col[0]}.name, '') AS {col}" for col in LOOKUP_TABLES) # Boş değerler önceki gibi ''
+        joins = ' '.join(f'LEFT JOIN {lookup} {col[0]} ON {col[0]}.id = t.{col}_id' for col, lookup in LOOKUP_TABLES.items())
+        cursor.execute(f'CREATE VIEW IF NOT EXISTS {view} AS SELECT t.*, {names} FROM {table} t {joins}')
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = ?", (SEARCH_INDEXES[table],))
+        row = cursor.fetchone()
+        if row and f"content='{view}'" not in row[0]: # Tabloyu okuyan eski indeks yeniden kurulur
+            cursor.execute(f'DROP TABLE {SEARCH_INDEXES[table]}')
+    _create_search_index(cursor, 'inventory_items')
+    _create_archive_objects(cursor)
+    archive_status = _lookup_id(cursor, 'status', ARCHIVE_STATUS) # archive_items aynı sabiti kullanır
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_inventory_archivable ON inventory_items (status_changed_at) WHERE status_id = {archive_status}")
+    conn.commit()
+    # Yeniden kurulan ana tablonun indeksleri ve tetikleyicileri (hepsi idempotent)
+    ensure_sort_keys(conn)
+    _create_date_index(conn)
+    init_data_version(conn)
+    init_change_log(conn)
+    init_duplicate_index(conn)
+    _create_facet_indexes(conn)
+
+def _encode_table(cursor, table):
+    """table'ı sözlük alanları <alan>_id olacak şekilde yeniden kurar; işlem çağırana bırakılır.
+
+    Satırların değerleri önce sözlüklere eklenir; id'ler ve sqlite_sequence sayacı korunur
+    (arşivdeki bir öğenin id'si yeniden verilmesin diye).
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    columns = cursor.fetchall()
+    for col, lookup in LOOKUP_TABLES.items():
+        value = _stat_value_sql(col, table)
+        cursor.execute(f"INSERT OR IGNORE INTO {lookup} (name) SELECT DISTINCT {value} FROM {table} WHERE {value} <> ''")
+    cursor.execute(f'''
+        INSERT OR IGNORE INTO category_brands (category_id, brand_id)
+        SELECT DISTINCT c.id, b.id FROM {table} t JOIN categories c ON c.name = t.category JOIN brands b ON b.name = t.brand
+    ''')
+    
+    definitions, targets, values = [], [], []
+    for _, name, type_, notnull, default, pk in columns:
+        if name in LOOKUP_TABLES:
+            definitions.append(f'{name}_id INTEGER REFERENCES {LOOKUP_TABLES[name]} (id)')
+            targets.append(f'{name}_id')
+            values.append(f"(SELECT id FROM {LOOKUP_TABLES[name]} WHERE name = {_stat_value_sql(name, table)})")
+            continue
+        if pk:
+            definition = 'id INTEGER PRIMARY KEY' + (' AUTOINCREMENT' if table == 'inventory_items' else '')
+        else:
+            definition = f'{name} {type_}' + (' NOT NULL' if notnull else '') + (f' DEFAULT {default}' if default is not None else '')
+            if name == 'serial_number' and table == 'inventory_items': definition += ' UNIQUE'
+        definitions.append(definition)
+        targets.append(name)
+        values.append(name)
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    row = cursor.fetchone()
+    cursor.execute(f"CREATE TABLE {table}_new ({', '.join(definitions)})")
+    cursor.execute(f"INSERT INTO {table}_new ({', '.join(targets)}) SELECT {', '.join(values)} FROM {table}")
+    for old, new in LEGACY_STATUSES.items(): # Yeni adı alan eski durumların sıralama anahtarı da yenilenir
+        cursor.execute(f"UPDATE {table}_new SET status_sort = ? WHERE status_sort = ?", (natural_sort_key(new), natural_sort_key(old)))
+    cursor.execute(f'DROP TABLE {table}')
+    cursor.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+    if row:
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (row[0], table))
+        if cursor.rowcount == 0:
+            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, row[0]))
+
+def _add_category_brands(cursor, pairs):
+    """(kategori, marka) ad çiftlerini formlardaki marka listelerine ekler (ikisi de sözlükte olmalı)."""
+    cursor.executemany('''
+        INSERT OR IGNORE INTO category_brands (category_id, brand_id)
+        SELECT c.id, b.id FROM categories c, brands b WHERE c.name = ? AND b.name = ?
+    ''', pairs)
+
+def _ensure_lookup_values(cursor, items):
+    """Öğelerin sözlüklerde olmayan (boş olmayan) değerlerini ve kategori-marka çiftlerini ekler; commit çağırana bırakılır."""
+    items = list(items)
+    for col, lookup in LOOKUP_TABLES.items():
+        names = {normalize_status(item.get(col)) if col == 'status' else item.get(col) for item in items} - {None, ''}
+        cursor.executemany(f'INSERT OR IGNORE INTO {lookup} (name) VALUES (?)', [(name,) for name in names])
+    _add_category_brands(cursor, {(item.get('category'), item.get('brand')) for item in items if item.get('category') and item.get('brand')})
+
+def _lookup_id(cursor, col, name):
+    """Sözlükteki değerin id'si; yoksa None."""
+    cursor.execute(f'SELECT id FROM {LOOKUP_TABLES[col]} WHERE name = ?', (name,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _lookup_names(conn, col):
+    """Bir sözlüğün {id: ad} eşlemesi (sözlükler küçüktür)."""
+    cursor = conn.cursor()
+    cursor.execute(f'SELECT id, name FROM {LOOKUP_TABLES[col]}')
+    return dict(cursor.fetchall())
+
+def get_vocabulary(conn):
+    """Form seçeneklerini sözlük tablolarından döndürür.
+
+    {'category': [...], 'status': [...], 'location': [...], 'brand': {kategori: [marka, ...]}};
+    listeler sıra (position) ve ada göredir, sonradan eklenen değerler sondadır.
+    """
+    cursor = conn.cursor()
+    vocabulary = {}
+    for col in ('category', 'status', 'location'):
+        cursor.execute(f'SELECT name FROM {LOOKUP_TABLES[col]} ORDER BY position IS NULL, position, name')
+        vocabulary[col] = [row[0] for row in cursor.fetchall()]
+    cursor.execute('''
+        SELECT c.name, b.name FROM category_brands cb
+        JOIN categories c ON c.id = cb.category_id JOIN brands b ON b.id = cb.brand_id
+        ORDER BY c.name, b.position IS NULL, b.position, b.name
+    ''')
+    vocabulary['brand'] = {}
+    for category, brand in cursor.fetchall():
+        vocabulary['brand'].setdefault(category, []).append(brand)
+    return vocabulary
+
+def init_stocktake(conn):
+    """Geçiş 13: Sayım (stok sayımı) oturumları ve okutulan seri numaraları için tabloları kurar.
+
+    Bir sayım birkaç gün sürebildiğinden oturum ve okutmalar veritabanında tutulur. Bir seri numarası
+    oturumda bir kez saklanır (birincil anahtar); tekrar okutmalar scan_count'u artırır. Oturumun
+    location_id'si sayımın kapsamıdır (NULL: tüm konumlar), okutmanınki öğenin bulunduğu konumdur.
+    """
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stocktake_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            location_id INTEGER REFERENCES locations (id),
+            started_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started_by TEXT,
+            closed_at TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stocktake_scans (
+            session_id INTEGER NOT NULL REFERENCES stocktake_sessions (id),
+            serial_number TEXT NOT NULL,
+            location_id INTEGER REFERENCES locations (id),
+            scan_count INTEGER NOT NULL DEFAULT 1,
+            scanned_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            scanned_by TEXT,
+            PRIMARY KEY (session_id, serial_number)
+        ) WITHOUT ROWID
+    ''')
+    conn.commit()
+
+# Şema geçişleri: sıra numarası PRAGMA user_version'da saklanır. Yeni geçişler yalnızca sona eklenir.
+# Geçişler idempotent yazılır (IF NOT EXISTS vb.), böylece eski sürümün kurduğu tablolar da sorunsuz yükseltilir.
+MIGRATIONS = [
+    _create_base_schema,
+    ensure_sort_keys,
+    init_search,
+    init_statistics,
+    _create_filter_indexes,
+    init_data_version,
+    init_change_log,
+    _create_facet_indexes,
+    init_duplicate_index,
+    _create_date_index,
+    init_archive,
+    init_lookups,
+    init_stocktake,
+]
+
+def migrate(conn):
+    """PRAGMA user_version'a göre bekleyen şema geçişlerini sırayla uygular, yeni sürümü döndürür."""
+    cursor = conn.cursor()
+    cursor.execute('PRAGMA user_version')
+    version = cursor.fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(conn)
+        cursor.execute(f'PRAGMA user_version = {number}')
+        conn.commit()
+        version = number
+    return version
+
+def get_db_path(conn):
+    """Bağlantının açtığı ana veritabanı dosyasının yolunu döndürür (arka plan bağlantıları için)."""
+    cursor = conn.cursor()
+    cursor.execute('PRAGMA database_list')
+    for _, name, path in cursor.fetchall():
+        if name == 'main':
+            return path
+    return None
 
 def get_user(conn, username, password):
     """Kullanıcıyı doğrular ve bilgilerini döndürür."""
@@ -66,26 +909,264 @@ def get_user(conn, username, password):
     ''', (username, password))
     return cursor.fetchone() # (id, username, password, role) tuple'ı döndürür
 
-def add_inventory_item(conn, item_data):
-    """Veritabanına yeni bir envanter öğesi ekler (main_window.py ile UYUMLU)."""
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO inventory_items 
-        (name, category, model, brand, serial_number, purchase_date, status, location, notes, assigned_to)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+def normalize_item(item_data, new=True):
+    """Form veya dosyadan gelen öğe verisini kayıt kurallarına göre doğrular ve normalize eder.
+
+    Değerler kırpılır, "Seçiniz..." boşa çevrilir, durum boşsa 'Aktif Kullanımda' olur,
+    alım tarihi hiç verilmemişse yeni öğeye (new) bugün atanır, güncellemede NULL kalır;
+    boş seri no NULL olarak saklanır (UNIQUE kısıtına takılmaması için).
+    Ad veya kategori eksikse ValueError fırlatır.
+    """
+    item = {}
+    for field in ITEM_FIELDS:
+        value = item_data.get(field)
+        if isinstance(value, datetime.date): value = value.strftime('%Y-%m-%d') # XLSX tarih hücreleri
+        elif isinstance(value, float) and value.is_integer(): value = int(value) # XLSX sayı hücreleri (seri no)
+        value = '' if value is None else str(value).strip()
+        item[field] = '' if value == EMPTY_CHOICE else value
+    if not item['name'] or not item['category']:
+        raise ValueError("Ad ve Kategori zorunludur!")
+    if not item['status']: item['status'] = DEFAULT_STATUS
+    if item_data.get('purchase_date') is None: item['purchase_date'] = datetime.date.today().strftime('%Y-%m-%d') if new else None
+    if not item['serial_number']: item['serial_number'] = None
+    return item
+
+def _field_sql(col):
+    """Alanın yazmalardaki parametre ifadesi: sözlük alanları için değerin id'si."""
+    return _lookup_id_sql(col) if col in LOOKUP_TABLES else '?'
+
+def _assignments(fields):
+    """fields için UPDATE SET parçası (sözlük alanları <alan>_id sütununa yazılır)."""
+    return ', '.join(f'{_stored_column(col)} = {_field_sql(col)}' for col in fields)
+
+def _item_values(item, fields=ITEM_FIELDS):
+    """Öğenin fields değerleri parametre sırasıyla; durum normalize edilir (sözlükte eski değer yoktur)."""
+    return [normalize_status(item.get(col)) if col == 'status' else item.get(col) for col in fields]
+
+def _insert_sql():
+    """Öğe alanları, sıralama anahtarları ve yazarla (last_updated_by) INSERT sorgusunu döndürür."""
+    cols = ITEM_FIELDS + [f'{col}_sort' for col in SORTABLE_COLUMNS] + ['last_updated_by']
+    return f"""INSERT INTO inventory_items ({', '.join(_stored_column(c) for c in cols)}, status_changed_at)
+        VALUES ({', '.join(_field_sql(c) for c in cols)}, CURRENT_TIMESTAMP)"""
+
+# Durum değiştiğinde status_changed_at'i yenileyen SET parçası (parametre: yeni durum); arşivleme bu zamana bakar
+_STATUS_CHANGED = f"status_changed_at = CASE WHEN status_id IS {_lookup_id_sql('status')} THEN status_changed_at ELSE CURRENT_TIMESTAMP END"
+
+def add_inventory_item(conn, item_data, author=None):
+    """Veritabanına yeni bir envanter öğesi ekler ve yeni kaydın id'sini döndürür; author değişiklik günlüğüne yazılır."""
+    values = [
         item_data.get('name'), # .get() kullanmak daha güvenlidir
         item_data.get('category'),
         item_data.get('model', ''),
         item_data.get('brand', ''),
         item_data.get('serial_number', ''),
         item_data.get('purchase_date'),
-        item_data.get('status', 'Aktif Kullanımda'),
+        normalize_status(item_data.get('status', 'Aktif Kullanımda')),
         item_data.get('location', ''),
         item_data.get('notes', ''),
         item_data.get('assigned_to', '') # assigned_to eklendi
-    ))
+    ]
+    cursor = conn.cursor()
+    _ensure_lookup_values(cursor, [item_data])
+    cursor.execute(_insert_sql(), values + _sort_key_values(item_data) + [author])
     conn.commit()
+    return cursor.lastrowid
+
+def update_inventory_item(conn, item_id, item_data, author=None):
+    """Mevcut bir envanter öğesini günceller; sıralama anahtarlarını ve yazarı da yeniler.
+
+    Öğe arşivdeyse önce ana tabloya geri alınır (düzenlenen öğe yeniden sıcak kümeye girer).
+    """
+    assignments = _assignments(ITEM_FIELDS + [f'{c}_sort' for c in SORTABLE_COLUMNS] + ['last_updated_by'])
+    params = _item_values(item_data, ['status'] + ITEM_FIELDS) + _sort_key_values(item_data) + [author, item_id]
+    cursor = conn.cursor()
+    try:
+        _ensure_lookup_values(cursor, [item_data])
+        cursor.execute(f'UPDATE inventory_items SET {_STATUS_CHANGED}, {assignments} WHERE id = ?', params)
+        if cursor.rowcount == 0 and _restore_archived(cursor, 'id', [item_id]):
+            cursor.execute(f'UPDATE inventory_items SET {_STATUS_CHANGED}, {assignments} WHERE id = ?', params)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return cursor.rowcount
+
+def find_existing_serials(conn, serials):
+    """Verilen seri numaralarından veritabanında (arşiv dahil) bulunanları küme olarak döndürür (parça parça IN sorgusu)."""
+    serials = list(serials)
+    found = set()
+    cursor = conn.cursor()
+    for table in _view_tables(archive=True):
+        for start in range(0, len(serials), MAX_SQL_VARIABLES):
+            chunk = serials[start:start + MAX_SQL_VARIABLES]
+            cursor.execute(f"SELECT serial_number FROM {table} WHERE serial_number IN ({', '.join('?' * len(chunk))})", chunk)
+            found.update(row[0] for row in cursor.fetchall())
+    return found
+
+def insert_inventory_items(conn, items, author=None):
+    """Normalize edilmiş öğeleri tek executemany ile ekler; commit çağırana bırakılır (toplu işlem için)."""
+    items = list(items)
+    cursor = conn.cursor()
+    _ensure_lookup_values(cursor, items)
+    cursor.executemany(_insert_sql(), (_item_values(item) + _sort_key_values(item) + [author] for item in items))
+    return cursor.rowcount
+
+def update_inventory_items_by_serial(conn, items, author=None):
+    """Seri numarası eşleşen öğeleri tek executemany ile günceller; commit çağırana bırakılır.
+
+    Arşivdeki eşleşmeler önce ana tabloya geri alınır.
+    """
+    items = list(items)
+    fields = [f for f in ITEM_FIELDS if f != 'serial_number']
+    assignments = _assignments(fields + [f'{c}_sort' for c in SORTABLE_COLUMNS] + ['last_updated_by'])
+    cursor = conn.cursor()
+    _ensure_lookup_values(cursor, items)
+    _restore_archived(cursor, 'serial_number', [item['serial_number'] for item in items])
+    cursor.executemany(f'UPDATE inventory_items SET {_STATUS_CHANGED}, {assignments} WHERE serial_number = ?',
+                       (_item_values(item, ['status'] + fields) + _sort_key_values(item) + [author, item['serial_number']] for item in items))
+    return cursor.rowcount
+
+def _id_chunks(item_ids, reserved=0):
+    """id listesini bağlı değişken sınırının altında kalan parçalara böler (reserved: sorgudaki diğer parametreler)."""
+    item_ids = list(item_ids)
+    size = MAX_SQL_VARIABLES - reserved
+    for start in range(0, len(item_ids), size):
+        yield item_ids[start:start + size]
+
+def _set_deletion_author(cursor, author, deleted):
+    """Son deleted silme kaydının yazarını doldurur.
+
+    Silinen satırın last_updated_by'ı tetikleyicide okunamaz; işlem yazma kilidini tuttuğundan
+    günlüğün son 'deleted' kaydı bu silmeye aittir.
+    """
+    if author and deleted > 0:
+        cursor.execute('''
+            UPDATE inventory_changes SET author = ?
+            WHERE version > (SELECT MAX(version) FROM inventory_changes) - ?
+        ''', (author, deleted))
+
+def delete_inventory_items(conn, item_ids, author=None):
+    """Verilen id'lere sahip öğeleri (arşivdekiler dahil) tek işlemde, parça başına tek DELETE ... IN ile siler; silinen satır sayısını döndürür."""
+    cursor = conn.cursor()
+    try:
+        deleted = 0
+        for chunk in _id_chunks(item_ids):
+            for table in _view_tables(archive=True):
+                cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+                deleted += cursor.rowcount
+        _set_deletion_author(cursor, author, deleted)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return deleted
+
+# Toplu işlemlerle değiştirilebilen alanlar
+BULK_FIELDS = ['status', 'location', 'assigned_to']
+
+def bulk_update_items(conn, item_ids, field, value, author=None):
+    """Seçili öğelerin tek bir alanını (durum, konum veya zimmet) tek işlemde küme tabanlı günceller.
+
+    Değer normalize_item kurallarıyla kırpılır; sıralama anahtarı da aynı ifadede yenilenir.
+    Arşivdeki öğeler önce ana tabloya geri alınır. Güncellenen satır sayısını döndürür;
+    hata olursa tüm işlem geri alınır.
+    """
+    if field not in BULK_FIELDS:
+        raise ValueError(f"Toplu güncellenemeyen alan: {field}")
+    value = '' if value in (None, EMPTY_CHOICE) else str(value).strip()
+    if field == 'status': value = normalize_status(value) or DEFAULT_STATUS
+    params = [value, natural_sort_key(value), author]
+    item_ids = list(item_ids)
+    status_changed = ''
+    if field == 'status':
+        status_changed = f'{_STATUS_CHANGED}, '
+        params.insert(0, value)
+    cursor = conn.cursor()
+    try:
+        _ensure_lookup_values(cursor, [{field: value}])
+        _restore_archived(cursor, 'id', item_ids)
+        updated = 0
+        for chunk in _id_chunks(item_ids, reserved=len(params)):
+            cursor.execute(f'''
+                UPDATE inventory_items SET {status_changed}{_assignments([field])}, {field}_sort = ?, last_updated_by = ?
+                WHERE id IN ({', '.join('?' * len(chunk))})
+            ''', params + chunk)
+            updated += cursor.rowcount
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return updated
+
+def _archive_columns(conn):
+    """Ana tablo ile arşivin ortak sütunlarının virgüllü listesi (archived_at hariç)."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(inventory_items)")
+    return ', '.join(row[1] for row in cursor.fetchall())
+
+def _restore_archived(cursor, column, values):
+    """column değeri values içinde olan arşivlenmiş öğeleri id'leriyle ana tabloya geri alır; commit çağırana bırakılır.
+
+    Geri alınan öğe sayısını döndürür. Aynı seri no ana tabloda yeniden kullanılmışsa IntegrityError fırlatır.
+    """
+    cols = _archive_columns(cursor.connection)
+    restored = 0
+    for chunk in _id_chunks(values):
+        marks = ', '.join('?' * len(chunk))
+        cursor.execute(f"INSERT INTO inventory_items ({cols}) SELECT {cols} FROM inventory_archive WHERE {column} IN ({marks})", chunk)
+        restored += cursor.rowcount
+        if cursor.rowcount > 0:
+            cursor.execute(f"DELETE FROM inventory_archive WHERE {column} IN ({marks})", chunk)
+    return restored
+
+def archive_items(conn, older_than_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, author=None):
+    """ARCHIVE_STATUS durumunda older_than_days günden uzun kalmış öğeleri arşiv tablosuna taşır.
+
+    Her parti (en fazla batch_size öğe) ayrı bir işlemdir: kısa süreli yazma kilidi diğer
+    istemcileri bekletmez. Seçim ve taşıma aynı IMMEDIATE işlemde yapıldığından aynı anda
+    çalışan iki iş aynı öğeyi taşımaz. Ana tablodan çıkan öğeler diğer istemcilere silme
+    olarak yansır. Taşınan öğe sayısını döndürür.
+    """
+    cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+    batch_size = max(1, min(batch_size, MAX_SQL_VARIABLES))
+    cols = _archive_columns(conn)
+    cursor = conn.cursor()
+    status_id = _lookup_id(cursor, 'status', ARCHIVE_STATUS)
+    if status_id is None:
+        return 0
+    moved = 0
+    while True:
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute(f'''
+                SELECT id FROM inventory_items
+                WHERE status_id = {status_id} AND status_changed_at < ?
+                ORDER BY status_changed_at LIMIT ?
+            ''', (cutoff, batch_size))
+            ids = [row[0] for row in cursor.fetchall()]
+            if ids:
+                marks = ', '.join('?' * len(ids))
+                cursor.execute(f"INSERT INTO inventory_archive ({cols}) SELECT {cols} FROM inventory_items WHERE id IN ({marks})", ids)
+                cursor.execute(f"DELETE FROM inventory_items WHERE id IN ({marks})", ids)
+                _set_deletion_author(cursor, author, len(ids))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        moved += len(ids)
+        if len(ids) < batch_size:
+            return moved
+
+def count_archivable(conn, older_than_days=ARCHIVE_AFTER_DAYS):
+    """archive_items'ın şu anda taşıyacağı öğe sayısı (kısmi indeksten)."""
+    cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+    cursor = conn.cursor()
+    status_id = _lookup_id(cursor, 'status', ARCHIVE_STATUS)
+    if status_id is None:
+        return 0
+    # Kısmi indeksin koşuluyla aynı sabit id (parametre olursa indeks kullanılamaz)
+    cursor.execute(f"SELECT COUNT(*) FROM inventory_items WHERE status_id = {status_id} AND status_changed_at < ?", (cutoff,))
+    return cursor.fetchone()[0]
 
 def get_all_inventory(conn):
     """Tüm envanter öğelerini main_window.py'nin beklediği formatta çeker."""
@@ -94,6 +1175,149 @@ def get_all_inventory(conn):
     cursor.execute('''
         SELECT id, assigned_to, name, category, model, brand, 
                serial_number, purchase_date, status, location 
-        FROM inventory_items
+        FROM inventory_view
     ''')
-    return cursor.fetchall()
\ No newline at end of file
+    return cursor.fetchall()
+
+def get_inventory_row(conn, item_id, archive=False):
+    """Tek bir öğeyi tablo satırı biçiminde (get_inventory_page ile aynı sütunlar) döndürür; archive True ise arşivde de arar."""
+    cursor = conn.cursor()
+    for table in _view_tables(archive):
+        cursor.execute(f'SELECT {_TABLE_SELECT} FROM {READ_VIEWS[table]} WHERE id = ?', (item_id,))
+        row = cursor.fetchone()
+        if row:
+            return row
+    return None
+
+def get_inventory_item(conn, item_id):
+    """Detay paneli ve düzenleme penceresi için öğenin tüm alanlarını (arşivdeyse oradan) döndürür."""
+    items = get_inventory_items(conn, [item_id])
+    return items[0] if items else None
+
+def get_inventory_items(conn, item_ids):
+    """Birden çok öğeyi get_inventory_item biçiminde döndürür (sıra garanti edilmez).
+
+    Ana tabloda bulunamayan id'ler arşivde aranır (id'ler iki tabloda tekildir).
+    """
+    cursor = conn.cursor()
+    missing = list(item_ids)
+    rows = []
+    for table in _view_tables(archive=True):
+        found = []
+        for chunk in _id_chunks(missing):
+            cursor.execute(f'''
+                SELECT id, name, category, model, brand, serial_number, purchase_date, status, location, notes, assigned_to
+                FROM {READ_VIEWS[table]} WHERE id IN ({', '.join('?' * len(chunk))})
+            ''', chunk)
+            found.extend(cursor.fetchall())
+        rows.extend(found)
+        found_ids = {row[0] for row in found}
+        missing = [i for i in missing if int(i) not in found_ids]
+        if not missing:
+            break
+    return rows
+
+def matching_item_ids(conn, item_ids, search=None, filters=None, archive=False):
+    """Verilen id'lerden arama ve filtrelerle eşleşenlerin kümesini döndürür (toplu işlemlerden sonra görünürlük için)."""
+    cursor = conn.cursor()
+    matched = set()
+    for table in _view_tables(archive):
+        where, params = _view_filter(conn, search, filters, table)
+        for chunk in _id_chunks(item_ids, reserved=len(params)):
+            cursor.execute(f"SELECT id FROM {table} WHERE id IN ({', '.join('?' * len(chunk))}){where}", chunk + params)
+            matched.update(row[0] for row in cursor.fetchall())
+    return matched
+
+def inventory_matches(conn, item_id, search, filters=None, archive=False):
+    """Öğenin verilen arama metni ve alan filtreleriyle eşleşip eşleşmediğini döndürür."""
+    sql, params = _view_select(conn, '1', ' AND id = ?', [item_id], search, filters, archive)
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    return cursor.fetchone() is not None
+
+def get_status_counts(conn, archive=False):
+    """Durum bazında öğe sayılarını {durum: adet} sözlüğü olarak döndürür (özet tablodan)."""
+    return get_statistics(conn, 'status', archive)
+
+def count_inventory(conn, search=None, filters=None, archive=False):
+    """Görünümdeki (arama ve filtrelere uyan) öğe sayısını döndürür; kısıt yoksa özet tablodan okunur."""
+    if not build_match_query(search or '') and not filters:
+        return sum(get_status_counts(conn, archive).values())
+    sql, params = _view_select(conn, 'COUNT(*)', '', [], search, filters, archive)
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    return sum(row[0] for row in cursor.fetchall())
+
+def iter_inventory(conn, sort_column='name', descending=False, search=None, chunk_size=2000, filters=None, archive=False):
+    """Tablodaki sıralama, arama ve filtrelerle tüm satırları parça parça (liste halinde) üretir; hepsini belleğe almaz."""
+    key = None
+    while True:
+        rows, key = get_inventory_page(conn, sort_column, descending, key, chunk_size, search, filters, archive)
+        if rows:
+            yield rows
+        if key is None:
+            break
+
+def get_inventory_page(conn, sort_column='name', descending=False, after=None, limit=PAGE_SIZE, search=None, filters=None, archive=False):
+    """Envanterin bir sayfasını doğal sıralamayla ve keyset (anahtar tabanlı) sayfalama ile çeker.
+
+    after: önceki sayfanın son anahtarı (aşama, sıralama anahtarı, id); None ise ilk sayfa.
+    search: verilirse yalnızca tam metin aramayla (önek eşleşmeli) eşleşen öğeler döner.
+    filters: {sütun: değer} alan filtreleri (FACET_COLUMNS).
+    archive: True ise arşivdeki öğeler de aynı sırada araya katılır.
+    Boş değerli satırlar her iki yönde de sona gelir (aşama 1).
+    (satırlar, sonraki_anahtar) döndürür; sonraki_anahtar None ise başka sayfa yoktur.
+    """
+    return _select_page(conn, _TABLE_SELECT, sort_column, descending, after, limit, search, filters, archive, names=True)
+
+def get_inventory_page_ids(conn, sort_column='name', descending=False, after=None, limit=PAGE_SIZE, search=None, filters=None, archive=False):
+    """get_inventory_page ile aynı sayfanın yalnızca id'lerini (sıralama indeksinden) döndürür."""
+    rows, next_key = _select_page(conn, 'id', sort_column, descending, after, limit, search, filters, archive)
+    return [row[0] for row in rows], next_key
+
+def _select_page(conn, cols, sort_column, descending, after, limit, search, filters, archive=False, names=False):
+    """Keyset sayfa sorgusu; cols ilk sütunu id olan SELECT listesidir (names: _view_select'teki gibi).
+
+    Arşiv dahilse iki tablonun sıralı sonuçları UNION ALL ile birleştirilir; her kol kendi
+    sıralama indeksinden okunduğundan SQLite sonuçları sıralamadan birleştirir (merge).
+    """
+    if sort_column not in SORTABLE_COLUMNS:
+        sort_column = 'name'
+    sort_col = f'{sort_column}_sort'
+    op, order = ('<', 'DESC') if descending else ('>', 'ASC')
+    phase, last_value, last_id = after or (0, None, None)
+    cursor = conn.cursor()
+    
+    rows = []
+    if phase == 0:
+        # (anahtar, id) ikilisi ile devam: OFFSET gibi önceki satırları taramaz, indeksi kullanır
+        where, params = f" AND {sort_col} <> ''", []
+        if last_id is not None:
+            where += f" AND ({sort_col}, id) {op} (?, ?)"
+            params.extend([last_value, last_id])
+        sql, params = _view_select(conn, f'{cols}, {sort_col}', where, params, search, filters, archive, names)
+        cursor.execute(f'''
+            {sql}
+            ORDER BY {sort_col} {order}, id {order}
+            LIMIT ?
+        ''', params + [limit])
+        rows = cursor.fetchall()
+        if len(rows) == limit:
+            return [row[:-1] for row in rows], (0, rows[-1][-1], rows[-1][0])
+        last_id = None
+    
+    # Boş değerli satırlar
+    where, params = f" AND {sort_col} = ''", []
+    if last_id is not None:
+        where += f" AND id {op} ?"
+        params.append(last_id)
+    sql, params = _view_select(conn, f'{cols}, {sort_col}', where, params, search, filters, archive, names)
+    cursor.execute(f'''
+        {sql}
+        ORDER BY id {order}
+        LIMIT ?
+    ''', params + [limit - len(rows)])
+    rows += cursor.fetchall()
+    
+    next_key = (1, '', rows[-1][0]) if len(rows) == limit else None
+    return [row[:-1] for row in rows], next_key
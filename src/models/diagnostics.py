@@ -0,0 +1,195 @@
+import collections
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Ölçüm kapalıyken sarmalanan fonksiyonlar yalnızca bu bayrağı kontrol edip doğrudan çağrılır.
+# ENVANTER_DIAGNOSTICS=1 ile açık başlar; Yardım → Tanılama penceresinden de açılıp kapatılabilir.
+_enabled = os.environ.get('ENVANTER_DIAGNOSTICS') == '1'
+MAX_RECORDS = 2000 # Bellekte tutulan son ölçüm sayısı
+MAX_STATEMENTS = 20 # Bir kayıtta saklanan en fazla SQL ifadesi (executemany her satır için bir ifade üretir)
+SLOW_QUERY_MS = 50 # Bu süreyi aşan veritabanı çağrılarının SELECT'leri için EXPLAIN QUERY PLAN alınır
+
+_records = collections.deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local() # İş parçacığında süren ölçüm (_Span); track() buna bağlantı ekler
+
+class Record:
+    """Tek bir ölçüm: tür ('db' / 'ui'), ad, süre, satır sayısı, çalışan SQL ve yavaşsa sorgu planı."""
+    __slots__ = ('kind', 'name', 'started', 'duration_ms', 'rows', 'statements', 'plans', 'thread')
+
+    def __init__(self, kind, name, started, duration_ms, rows=None, statements=(), plans=()):
+        self.kind = kind
+        self.name = name
+        self.started = started
+        self.duration_ms = duration_ms
+        self.rows = rows
+        self.statements = list(statements)
+        self.plans = list(plans)
+        self.thread = threading.current_thread().name
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+def is_enabled():
+    return _enabled
+
+def enable(flag=True):
+    """Ölçümü açar veya kapatır."""
+    global _enabled
+    _enabled = bool(flag)
+
+def clear():
+    with _lock:
+        _records.clear()
+
+def records():
+    """Kayıtların (eskiden yeniye) bir kopyasını döndürür."""
+    with _lock:
+        return list(_records)
+
+def record(kind, name, started, duration_ms, rows=None, statements=(), plans=()):
+    """Bir ölçümü kaydeder (ör. birden çok geri çağrıya yayılan işlemler için elle)."""
+    with _lock:
+        _records.append(Record(kind, name, started, duration_ms, rows, statements, plans))
+
+class _Trace:
+    """Bağlantının izleme geri çağrısı: ilk MAX_STATEMENTS ifadeyi saklar, kalanları yalnızca sayar."""
+    __slots__ = ('statements', 'dropped')
+
+    def __init__(self):
+        self.statements = []
+        self.dropped = 0
+
+    def __call__(self, sql):
+        if len(self.statements) < MAX_STATEMENTS: self.statements.append(sql)
+        else: self.dropped += 1
+
+def _count_rows(result):
+    """Sonuçtan satır sayısını tahmin eder: liste, (liste, ...) çifti veya tamsayı."""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    return None
+
+def _explain(conn, statements):
+    """SELECT ifadelerinin sorgu planlarını toplar (bağlantının kendi iş parçacığında çağrılmalıdır)."""
+    plans = []
+    for sql in dict.fromkeys(statements):
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            continue
+        try:
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+        except sqlite3.Error as e:
+            plans.append((sql, [f"plan alınamadı: {e}"]))
+            continue
+        plans.append((sql, [row[-1] for row in rows]))
+    return plans
+
+class _Span:
+    """Süren bir ölçüm: izlenen bağlantılar (ve dosya yolları) ile ortak SQL izi."""
+    __slots__ = ('trace', 'connections', 'paths')
+
+    def __init__(self):
+        self.trace = _Trace()
+        self.connections = []
+        self.paths = []
+
+    def add(self, conn):
+        if any(c is conn for c in self.connections):
+            return
+        conn.set_trace_callback(None) # Yolu okuyan PRAGMA dıştaki bir ölçümün izine girmesin
+        path = next((row[2] for row in conn.execute('PRAGMA database_list') if row[1] == 'main'), '')
+        self.connections.append(conn)
+        self.paths.append(path)
+        conn.set_trace_callback(self.trace)
+
+def track(conn):
+    """Bu iş parçacığında süren ölçüme, ölçülen fonksiyonun kendi açtığı bağlantıyı ekler; conn'u döndürür.
+
+    Bağlantıyı argüman olarak almayan fonksiyonlar (ör. export_inventory, backup_database) açtıkları
+    bağlantıyı bununla kaydeder; SQL'leri ve yavaşsa sorgu planları da kayda girer. Ölçüm kapalıyken etkisizdir.
+    """
+    span = getattr(_local, 'span', None)
+    if span is not None:
+        span.add(conn)
+    return conn
+
+def _plans(span):
+    """Yavaş çağrının SELECT planları; bağlantı çağrı içinde kapatıldıysa aynı dosyaya salt okunur açılan bağlantıyla."""
+    for conn, path in zip(span.connections, span.paths):
+        try:
+            conn.total_changes # Kapalı bağlantıda ProgrammingError
+        except sqlite3.ProgrammingError:
+            try: check = sqlite3.connect(f'file:{path}?mode=ro', uri=True) if path else None
+            except sqlite3.Error: check = None # Dosya artık yok (ör. geçici açılmış anlık görüntü)
+            if check is None: continue
+            try: return _explain(check, span.trace.statements)
+            finally: check.close()
+        return _explain(conn, span.trace.statements)
+    return ()
+
+def call(kind, name, func, *args, **kwargs):
+    """func(*args, **kwargs) çağrısını ölçerek çalıştırır.
+
+    İlk argüman bir sqlite3 bağlantısıysa veya func kendi bağlantısını track() ile kaydederse çağrı
+    boyunca çalışan SQL ifadeleri izlenir; süre SLOW_QUERY_MS'i aşarsa SELECT'lerin sorgu planları da kaydedilir.
+    """
+    if not _enabled:
+        return func(*args, **kwargs)
+    outer = getattr(_local, 'span', None)
+    span = _local.span = _Span()
+    if args and isinstance(args[0], sqlite3.Connection):
+        span.add(args[0])
+    started, clock = time.time(), time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        duration_ms = (time.perf_counter() - clock) * 1000
+        _local.span = outer
+        for conn in span.connections: # İç içe ölçümde bağlantı dıştaki ize geri verilir
+            try: conn.set_trace_callback(outer.trace if outer is not None and any(c is conn for c in outer.connections) else None)
+            except sqlite3.ProgrammingError: pass
+    statements = span.trace.statements
+    plans = _plans(span) if duration_ms >= SLOW_QUERY_MS else ()
+    if span.trace.dropped:
+        statements = statements + [f"... (+{span.trace.dropped} ifade)"]
+    record(kind, name, started, duration_ms, _count_rows(result), statements, plans)
+    return result
+
+def timed(kind, name=None):
+    """Fonksiyonu call() ile ölçen dekoratör; kapalıyken yalnızca bir bayrak kontrolü ekler."""
+    def decorator(func):
+        label = name or func.__qualname__
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return call(kind, label, func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def summary():
+    """Ad bazında (tür, ad, çağrı sayısı, ortalama ms, en yüksek ms, toplam ms) listesi; toplam süreye göre sıralı."""
+    groups = {}
+    for rec in records():
+        groups.setdefault((rec.kind, rec.name), []).append(rec.duration_ms)
+    rows = [(kind, name, len(d), sum(d) / len(d), max(d), sum(d)) for (kind, name), d in groups.items()]
+    return sorted(rows, key=lambda r: -r[5])
+
+def export_json(path):
+    """Kayıtları ve özeti JSON dosyasına yazar."""
+    data = {
+        'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'slow_query_ms': SLOW_QUERY_MS,
+        'summary': [dict(zip(('kind', 'name', 'count', 'avg_ms', 'max_ms', 'total_ms'), row)) for row in summary()],
+        'records': [rec.as_dict() for rec in records()],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,166 @@
+import csv
+
+from . import diagnostics
+from .database import serial_key, name_key, get_inventory_items
+
+SIMILAR_LIMIT = 10 # Kayıt penceresinde gösterilecek en fazla benzer kayıt
+MIN_KEY_LENGTH = 3 # Bundan kısa anahtarlar (trigramı olmayan) karşılaştırılmaz
+REPORT_HEADERS = ['Grup', 'Neden', 'ID', 'Ad', 'Model', 'Seri No', 'Departman', 'Zimmet Sahibi']
+REASONS = {'exact': "Aynı seri no", 'serial': "Benzer seri no", 'name': "Benzer ad+model (seri no yok)"}
+
+def one_edit_apart(a, b):
+    """İki anahtar en fazla bir düzenleme (ekleme, silme, değiştirme, yan yana harf takası) uzaklıktaysa True.
+
+    Yalnızca rakamların değiştiği veya yer değiştirdiği farklar sayılmaz: '5CD1234001' ile '5CD1234010'
+    aynı partiden seri numaraları, 'Latitude 5420' ile 'Latitude 5430' ise farklı modellerdir.
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        if a[i + 1:] == b[i + 1:]:
+            return not (a[i].isdigit() and b[i].isdigit())
+        swapped = a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+        return swapped and not (a[i].isdigit() and a[i + 1].isdigit())
+    if len(a) > len(b):
+        a, b = b, a
+    return a[i:] == b[i + 1:]
+
+def _phrase(text):
+    """Metni FTS5 tırnaklı ifadesine çevirir."""
+    return '"' + text.replace('"', '""') + '"'
+
+def _candidate_match(column, key):
+    """Anahtara bir düzenleme uzaklıktaki tüm kayıtları kapsayan trigram MATCH ifadesini döndürür.
+
+    Tek düzenleme anahtarın en çok iki komşu karakterini değiştirir; bu yüzden benzer kaydın anahtarı
+    ilk yarıyı veya son yarıyı (en az (n-2)/2 karakter) aynen içerir. Yarılar trigramdan kısaysa
+    (kısa anahtarlar) tüm trigramların herhangi biri aranır.
+    """
+    half = (len(key) - 2) // 2
+    if half >= 3:
+        parts = [key[:half], key[-half:]]
+    else:
+        parts = [key[i:i + 3] for i in range(len(key) - 2)]
+    return f"{column} : ({' OR '.join(_phrase(p) for p in dict.fromkeys(parts))})"
+
+def _similar_ids(conn, column, key, exclude_id, serial_less=False):
+    """column anahtarı key'e bir düzenleme uzaklıkta olan öğe id'lerini döndürür (trigram indeksinden)."""
+    if not key or len(key) < MIN_KEY_LENGTH:
+        return []
+    extra = ' AND serial_key IS NULL' if serial_less else ''
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT rowid, {column} FROM inventory_dup
+        WHERE inventory_dup MATCH ? AND length({column}) BETWEEN ? AND ? AND rowid != ?{extra}
+    ''', (_candidate_match(column, key), len(key) - 1, len(key) + 1, exclude_id or 0))
+    return [item_id for item_id, other in cursor.fetchall() if one_edit_apart(key, other)]
+
+def has_duplicate_index(conn):
+    """Trigram indeksi kurulmuşsa True (SQLite 3.34 öncesinde kurulamaz)."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'inventory_dup'")
+    return cursor.fetchone() is not None
+
+@diagnostics.timed('db')
+def find_similar_items(conn, item, exclude_id=None, limit=SIMILAR_LIMIT):
+    """Kaydedilmek üzere olan öğeye benzeyen kayıtları [(neden, öğe tuple'ı)] olarak döndürür.
+
+    Neden 'exact' (aynı seri no, UNIQUE kısıtına takılır), 'serial' (seri no bir düzenleme
+    uzaklıkta) veya 'name' (seri no yokken ad+model bir düzenleme uzaklıkta) olur. Seri numarası
+    olan kayıtlar ad+model ile karşılaştırılmaz: aynı modelden çok sayıda cihaz olağandır.
+    exclude_id düzenlenen öğenin kendisidir. Trigram indeksi yoksa boş liste döner.
+    """
+    if not has_duplicate_index(conn):
+        return []
+    serial = item.get('serial_number')
+    if serial:
+        ids = _similar_ids(conn, 'serial_key', serial_key(serial), exclude_id)
+        reason = 'serial'
+    else:
+        ids = _similar_ids(conn, 'name_key', name_key(item.get('name'), item.get('model')), exclude_id, serial_less=True)
+        reason = 'name'
+    rows = get_inventory_items(conn, ids[:limit])
+    return [('exact' if serial and row[5] == serial else reason, row) for row in rows]
+
+def _similar_pairs(conn, column, where=''):
+    """Tüm tabloda column anahtarı bir düzenleme uzaklıkta olan (id, id) çiftlerini döndürür.
+
+    Her anahtar ve tek karakter silinmiş tüm biçimleri tek bir SQL sorgusunda gruplanır: bir düzenleme
+    uzaklıktaki iki anahtar en az bir ortak biçim paylaşır. Aday çiftler one_edit_apart ile doğrulanır.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        WITH RECURSIVE
+            keys(id, k) AS (SELECT rowid, {column} FROM inventory_dup WHERE length({column}) >= ?{where}),
+            pos(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM pos WHERE i < (SELECT MAX(length(k)) FROM keys)),
+            variants(v, id) AS (
+                SELECT CASE WHEN i = 0 THEN k ELSE substr(k, 1, i - 1) || substr(k, i + 1) END, id
+                FROM keys JOIN pos ON pos.i <= length(k)
+            )
+        SELECT group_concat(DISTINCT id) FROM variants GROUP BY v HAVING COUNT(DISTINCT id) > 1
+    ''', (MIN_KEY_LENGTH,))
+    candidates = set()
+    for (ids,) in cursor.fetchall():
+        ids = sorted(int(i) for i in ids.split(','))
+        candidates.update((a, b) for n, a in enumerate(ids) for b in ids[n + 1:])
+    if not candidates:
+        return []
+    cursor.execute(f'SELECT rowid, {column} FROM inventory_dup WHERE length({column}) >= ?{where}', (MIN_KEY_LENGTH,))
+    keys = dict(cursor.fetchall())
+    return [(a, b) for a, b in sorted(candidates) if one_edit_apart(keys[a], keys[b])]
+
+def _group(pairs):
+    """Çiftleri birleşik gruplara (union-find) ayırır; her grup sıralı id listesidir."""
+    parent = {}
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for a, b in pairs:
+        parent[find(a)] = find(b)
+    groups = {}
+    for x in parent:
+        groups.setdefault(find(x), []).append(x)
+    return sorted(sorted(ids) for ids in groups.values())
+
+@diagnostics.timed('db')
+def find_duplicate_groups(conn):
+    """Tüm envanterde benzer kayıt gruplarını [(neden, [öğe tuple'ları])] olarak döndürür.
+
+    Seri numarası bir düzenleme uzaklıkta olanlar 'serial', seri numarası olmayıp ad+modeli
+    bir düzenleme uzaklıkta olanlar 'name' grubu olur (find_similar_items ile aynı kurallar).
+    """
+    if not has_duplicate_index(conn):
+        return []
+    groups = []
+    for reason, column, where in (('serial', 'serial_key', ''), ('name', 'name_key', ' AND serial_key IS NULL')):
+        for ids in _group(_similar_pairs(conn, column, where)):
+            groups.append((reason, get_inventory_items(conn, ids)))
+    return groups
+
+def write_duplicate_report(path, groups):
+    """Benzer kayıt gruplarını CSV olarak yazar (Excel için BOM ile); yazılan grup sayısını döndürür."""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_HEADERS)
+        for number, (reason, items) in enumerate(groups, start=1):
+            for item in items:
+                writer.writerow([number, REASONS[reason], item[0], item[1], item[3] or '', item[5] or '', item[8] or '', item[10] or ''])
+    return len(groups)
+
+if __name__ == '__main__':
+    # Komut satırından rapor: python -m src.models.duplicates rapor.csv [veritabanı]
+    import sys
+    from .database import connect
+    if len(sys.argv) < 2:
+        sys.exit("Kullanım: python -m src.models.duplicates <rapor.csv> [inventory.db]")
+    conn = connect(sys.argv[2] if len(sys.argv) > 2 else 'inventory.db')
+    groups = find_duplicate_groups(conn)
+    conn.close()
+    print(f"{write_duplicate_report(sys.argv[1], groups)} benzer kayıt grubu bulundu.")
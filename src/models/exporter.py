@@ -0,0 +1,84 @@
+import csv
+import os
+from pathlib import Path
+
+from . import diagnostics
+from .database import connect, count_inventory
+from .cache import iter_cached_inventory
+
+EXPORT_CHUNK_SIZE = 2000 # İmleçten tek seferde okunan satır sayısı
+
+class ExportCancelled(Exception):
+    """Dışa aktarım kullanıcı tarafından iptal edildiğinde fırlatılır."""
+
+class _CsvWriter:
+    """Satırları doğrudan CSV dosyasına yazar (Excel'in Türkçe karakterleri tanıması için BOM ile)."""
+    def __init__(self, path, headers):
+        self.file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+    def discard(self):
+        self.file.close()
+
+class _XlsxWriter:
+    """Satırları openpyxl'in write-only kipinde yazar; hücreler bellekte tutulmaz."""
+    def __init__(self, path, headers):
+        from openpyxl import Workbook # Yalnızca XLSX aktarımında gerekli
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Envanter')
+        self.sheet.append(headers)
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.sheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.path)
+
+    def discard(self):
+        if not self.sheet.closed: self.sheet.close() # Akış kapatılır; openpyxl'in geçici dosyası çıkışta silinir
+
+@diagnostics.timed('db')
+def export_inventory(db_path, file_path, headers, sort_column='name', descending=False, search=None,
+                     progress=None, cancel_event=None, filters=None, archive=False):
+    """Envanteri tablodaki sıra, arama ve filtrelerle (archive ise arşiv dahil) parça parça okuyup XLSX veya CSV dosyasına yazar.
+
+    Arka plan iş parçacığında çalışmak üzere kendi veritabanı bağlantısını açar.
+    progress(yazılan, toplam) her parçadan sonra çağrılır; cancel_event set edilirse
+    ExportCancelled fırlatılır. Dosya önce yanındaki geçici dosyaya yazılır ve yalnızca başarıda
+    hedefin yerine konur; iptal veya hatada üzerine yazılacak mevcut dosya korunur.
+    Yazılan satır sayısını döndürür.
+    """
+    path = Path(file_path)
+    partial = path.with_name(f'.{path.name}.partial')
+    writer_class = _CsvWriter if path.suffix.lower() == '.csv' else _XlsxWriter
+    conn = diagnostics.track(connect(db_path)) # Kendi bağlantısı: SQL'i Tanılama kaydına girer
+    writer = None
+    try:
+        total = count_inventory(conn, search, filters, archive)
+        writer = writer_class(partial, headers)
+        written = 0
+        for rows in iter_cached_inventory(conn, sort_column, descending, search, EXPORT_CHUNK_SIZE, filters, archive):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            writer.write_rows(row[1:] for row in rows) # id sütunu dışa aktarılmaz
+            written += len(rows)
+            if progress:
+                progress(written, total)
+        writer.close()
+        os.replace(partial, path)
+        return written
+    except BaseException:
+        if writer is not None: writer.discard()
+        if partial.exists(): partial.unlink() # Yalnızca yarım kalan geçici dosya silinir
+        raise
+    finally:
+        conn.close()
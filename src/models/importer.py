@@ -0,0 +1,175 @@
+import codecs
+import csv
+import sqlite3
+import time
+from pathlib import Path
+
+from . import diagnostics
+from .database import connect, normalize_item, find_existing_serials, insert_inventory_items, update_inventory_items_by_serial
+
+IMPORT_BATCH_SIZE = 5000 # Tek işlemde (transaction) yazılan satır sayısı
+CSV_FALLBACK_ENCODING = 'cp1254' # UTF-8 olmayan CSV'ler: Türkçe Excel'in "CSV" çıktısı bu kodlamadadır
+# Seri numarası çakışmalarında uygulanacak politikalar
+CONFLICT_POLICIES = {'skip': "Atla", 'update': "Güncelle", 'report': "Hata olarak raporla"}
+
+# Dosya başlıklarının alan karşılıkları (dışa aktarım başlıkları, form etiketleri ve sütun adları)
+HEADER_ALIASES = {
+    'zimmet sahibi': 'assigned_to', 'ad': 'name', 'cihaz adı': 'name', 'kategori': 'category',
+    'model': 'model', 'marka': 'brand', 'seri no': 'serial_number', 'alım tarihi': 'purchase_date',
+    'durum': 'status', 'konum': 'location', 'departman': 'location', 'notlar': 'notes',
+    'name': 'name', 'category': 'category', 'brand': 'brand', 'serial_number': 'serial_number',
+    'purchase_date': 'purchase_date', 'status': 'status', 'location': 'location', 'notes': 'notes',
+    'assigned_to': 'assigned_to',
+}
+
+class ImportResult:
+    """İçe aktarım sonucunu ve satır bazlı hata raporunu tutar."""
+    def __init__(self):
+        self.total = 0 # Okunan veri satırı sayısı
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.errors = [] # (dosya satır no, seri no, hata mesajı)
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        """Okunan satır başına ölçülen işlem hızı."""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Kullanıcıya gösterilecek kısa özet metni döndürür."""
+        return (f"{self.total} satır okundu: {self.inserted} eklendi, {self.updated} güncellendi, "
+                f"{self.skipped} atlandı, {len(self.errors)} hata ({self.rows_per_second:,.0f} satır/sn)")
+
+    def write_error_report(self, path):
+        """Satır bazlı hata raporunu CSV olarak yazar."""
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Satır', 'Seri No', 'Hata'])
+            writer.writerows(self.errors)
+
+def _map_headers(headers):
+    """Dosya başlıklarını öğe alanlarına eşler; tanınmayan sütunlar None olur."""
+    return [HEADER_ALIASES.get(str(h or '').strip().lower()) for h in headers]
+
+def _csv_encoding(path):
+    """Dosya baştan sona geçerli UTF-8 ise 'utf-8-sig', değilse CSV_FALLBACK_ENCODING.
+
+    Satırlar akış halinde okunduğundan kodlama okumadan önce belirlenir; dosya parça parça
+    çözülür, belleğe alınmaz.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    with open(path, 'rb') as f:
+        try:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return CSV_FALLBACK_ENCODING
+    return 'utf-8-sig'
+
+def _read_csv(path):
+    """CSV satırlarını (satır no, değer listesi) olarak akış halinde okur; ayırıcıyı ve kodlamayı otomatik algılar."""
+    with open(path, newline='', encoding=_csv_encoding(path)) as f:
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try: dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error: dialect = csv.excel
+        for row_no, row in enumerate(csv.reader(f, dialect), start=1):
+            yield row_no, row
+
+def _read_xlsx(path):
+    """XLSX'in ilk sayfasını read-only kipte satır satır okur (tüm çalışma kitabı belleğe alınmaz)."""
+    from openpyxl import load_workbook # Yalnızca XLSX içe aktarımında gerekli
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row_no, row in enumerate(workbook.worksheets[0].iter_rows(values_only=True), start=1):
+            yield row_no, list(row)
+    finally:
+        workbook.close()
+
+def read_rows(path):
+    """Dosyanın satırlarını (satır no, değer listesi) olarak üretir; XLSX uzantıya göre, diğerleri CSV/metin okunur."""
+    path = Path(path)
+    return _read_xlsx(path) if path.suffix.lower() in ('.xlsx', '.xlsm') else _read_csv(path)
+
+def read_items(path):
+    """Dosyadaki veri satırlarını (satır no, alan sözlüğü) olarak üretir; ilk satır başlıktır."""
+    fields = None
+    for row_no, values in read_rows(path):
+        if fields is None:
+            fields = _map_headers(values)
+            if 'name' not in fields or 'category' not in fields:
+                raise ValueError("Dosyada 'Ad' ve 'Kategori' sütunları bulunamadı.")
+            continue
+        if not any(v not in (None, '') for v in values): continue # Boş satırları atla
+        yield row_no, {f: v for f, v in zip(fields, values) if f}
+
+@diagnostics.timed('db')
+def import_inventory(conn, path, policy='skip', batch_size=IMPORT_BATCH_SIZE, progress=None, author=None):
+    """CSV/XLSX dosyasındaki öğeleri doğrulayıp toplu olarak ekler.
+
+    Satırlar akış halinde okunur, InventoryDialog ile aynı kurallarla (normalize_item)
+    normalize edilir ve batch_size'lık gruplar halinde tek işlemde executemany ile yazılır.
+    Mevcut veya dosyada tekrar eden seri numaraları policy'ye göre atlanır ('skip'),
+    güncellenir ('update') ya da hata olarak raporlanır ('report').
+    progress(okunan_satır) her gruptan sonra çağrılır; author değişiklik günlüğüne yazılır. ImportResult döndürür.
+    """
+    if policy not in CONFLICT_POLICIES:
+        raise ValueError(f"Geçersiz çakışma politikası: {policy}")
+    result = ImportResult()
+    started = time.perf_counter()
+    batch = []
+    seen = set() # Dosyada daha önce görülen seri numaraları
+
+    def flush():
+        existing = find_existing_serials(conn, [item['serial_number'] for _, item in batch if item['serial_number']])
+        inserts, updates = [], {}
+        pending = {} # Bu grupta eklenecek seri no -> inserts içindeki sıra
+        written = [] # Yazılacak satırlar (satır no, seri no): işlem geri alınırsa hata olarak raporlanır
+        added = set() # Bu grupta seen'e eklenen seri numaraları
+        for row_no, item in batch:
+            serial = item['serial_number']
+            if serial is not None and (serial in existing or serial in seen):
+                if policy == 'skip': result.skipped += 1; continue
+                if policy == 'report': result.errors.append((row_no, serial, "Seri numarası zaten mevcut")); continue
+                if serial in pending: inserts[pending[serial]] = item # Dosyada tekrar: son satır geçerli
+                else: updates[serial] = item
+                written.append((row_no, serial))
+                continue
+            if serial is not None: seen.add(serial); added.add(serial); pending[serial] = len(inserts)
+            inserts.append(item)
+            written.append((row_no, serial))
+        try:
+            inserted = insert_inventory_items(conn, inserts, author)
+            updated = update_inventory_items_by_serial(conn, updates.values(), author) if updates else 0
+            conn.commit()
+            result.inserted += inserted; result.updated += updated # Sayılar yalnızca işlem kalıcı olunca eklenir
+        except sqlite3.Error as e:
+            conn.rollback()
+            seen.difference_update(added) # Geri alınan satırların seri numaraları sonraki gruplarda yeniden eklenebilir
+            result.errors.extend((row_no, serial, f"Veritabanı hatası: {e}") for row_no, serial in written)
+        batch.clear()
+        if progress: progress(result.total)
+
+    for row_no, data in read_items(path):
+        result.total += 1
+        try: batch.append((row_no, normalize_item(data)))
+        except ValueError as e: result.errors.append((row_no, data.get('serial_number', ''), str(e)))
+        if len(batch) >= batch_size: flush()
+    if batch: flush()
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+if __name__ == '__main__':
+    # Komut satırından deneme ve hız ölçümü: python -m src.models.importer dosya.csv [politika] [veritabanı]
+    import sys
+    if len(sys.argv) < 2:
+        sys.exit("Kullanım: python -m src.models.importer <dosya.csv|xlsx> [skip|update|report] [inventory.db]")
+    conn = connect(sys.argv[3] if len(sys.argv) > 3 else 'inventory.db')
+    result = import_inventory(conn, sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else 'skip')
+    conn.close()
+    print(result.summary())
+    for row_no, serial, message in result.errors[:20]: print(f"  Satır {row_no} ({serial}): {message}")
@@ -0,0 +1,130 @@
+import datetime
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import diagnostics
+from .database import DEFAULT_STATUS, LEGACY_STATUSES, READ_VIEWS, get_data_version, get_db_path
+
+# Bu modül pandas/numpy yüklediğinden uygulama tarafından yalnızca rapor istendiğinde içe aktarılır.
+REPORT_CACHE_LIMIT = 32 # Bellekte tutulan en fazla rapor/çerçeve sonucu
+DAYS_PER_YEAR = 365.25
+RETIRED_STATUS = 'Hurda' # Yenileme tahminlerinde sayılmayan durum
+# Yaş dilimleri (yıl): [0, 1), [1, 2), ... ; alım tarihi olmayan veya okunamayanlar 'Bilinmiyor'
+AGE_BINS = [0, 1, 2, 3, 4, 5, 7, np.inf]
+AGE_LABELS = ["0-1 yıl", "1-2 yıl", "2-3 yıl", "3-4 yıl", "4-5 yıl", "5-7 yıl", "7+ yıl"]
+UNKNOWN_AGE = "Bilinmiyor"
+EMPTY_LABEL = "(Boş)" # Gruplamada boş alan değeri
+PERCENTILES = [0.25, 0.5, 0.75, 0.9]
+GROUP_LABELS = {'category': "Kategori", 'location': "Departman", 'status': "Durum", 'brand': "Marka", 'assigned_to': "Zimmet Sahibi"}
+FRAME_COLUMNS = ['id', 'category', 'location', 'status', 'brand', 'assigned_to', 'purchase_date']
+
+_cache = OrderedDict() # (veritabanı, veri sürümü, bugün, ad, parametreler) -> sonuç
+_lock = threading.Lock()
+
+def _cached(conn, name, params, compute):
+    """compute() sonucunu veri sürümüne göre önbellekten döndürür; herhangi bir yazma sürümü değiştirir.
+
+    Yaşlar bugüne göre hesaplandığından gün değişince de yeniden hesaplanır. Sonuçlar
+    paylaşıldığından çağıran tarafından değiştirilmemelidir.
+    """
+    key = (get_db_path(conn), get_data_version(conn), datetime.date.today(), name, params)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = compute()
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > REPORT_CACHE_LIMIT:
+            _cache.popitem(last=False)
+    return result
+
+def clear_cache():
+    """Önbelleği boşaltır."""
+    with _lock:
+        _cache.clear()
+
+def load_frame(conn, purchased_from=None, purchased_to=None):
+    """Raporların ihtiyaç duyduğu sütunları tek sorguda çekip yaş sütunlarıyla birlikte DataFrame döndürür.
+
+    purchased_from / purchased_to ('YYYY-MM-DD', dahil) verilirse alım tarihi indeksiyle aralık sorgusu
+    yapılır. Yaşam döngüsü tüm filoyu kapsadığından arşivdeki (hurdaya ayrılmış) öğeler de okunur.
+    age_years (ondalıklı yıl) ve age_bucket sütunları tüm satırlar için tek seferde hesaplanır.
+    """
+    def compute():
+        where, params = [], []
+        if purchased_from: where.append('purchase_date >= ?'); params.append(purchased_from)
+        if purchased_to: where.append('purchase_date <= ?'); params.append(purchased_to)
+        where = f" WHERE {' AND '.join(where)}" if where else ''
+        sql = ' UNION ALL '.join(f"SELECT {', '.join(FRAME_COLUMNS)} FROM {view}{where}" for view in READ_VIEWS.values())
+        frame = pd.DataFrame(conn.execute(sql, params * 2).fetchall(), columns=FRAME_COLUMNS)
+        frame['status'] = frame['status'].replace(LEGACY_STATUSES).fillna(DEFAULT_STATUS).replace('', DEFAULT_STATUS)
+        for col in GROUP_LABELS: # Az sayıda farklı değer: kategorik tip hem bellek hem gruplama için hızlıdır
+            frame[col] = frame[col].fillna('').replace('', EMPTY_LABEL).astype('category')
+        dates = pd.to_datetime(frame.pop('purchase_date'), format='%Y-%m-%d', errors='coerce')
+        frame['age_years'] = (pd.Timestamp(datetime.date.today()) - dates).dt.days / DAYS_PER_YEAR
+        buckets = pd.cut(frame['age_years'].clip(lower=0), AGE_BINS, labels=AGE_LABELS, right=False)
+        frame['age_bucket'] = buckets.cat.add_categories([UNKNOWN_AGE]).fillna(UNKNOWN_AGE)
+        return frame
+    return _cached(conn, 'frame', (purchased_from, purchased_to), compute)
+
+@diagnostics.timed('db')
+def age_distribution(conn, by='category', purchased_from=None, purchased_to=None):
+    """by alanının her değeri için yaş dilimlerindeki öğe sayıları (satır: değer, sütun: dilim, son sütun: Toplam)."""
+    def compute():
+        frame = load_frame(conn, purchased_from, purchased_to)
+        table = pd.crosstab(frame[by], frame['age_bucket'], margins=True, margins_name="Toplam", dropna=False)
+        return table.rename_axis(index=GROUP_LABELS[by], columns=None)
+    return _cached(conn, 'age_distribution', (by, purchased_from, purchased_to), compute)
+
+@diagnostics.timed('db')
+def age_percentiles(conn, by='category', purchased_from=None, purchased_to=None, percentiles=tuple(PERCENTILES)):
+    """by alanının her değeri için yaş (yıl) adedi, ortalaması ve yüzdelikleri; alım tarihi bilinmeyenler hariç."""
+    def compute():
+        frame = load_frame(conn, purchased_from, purchased_to).dropna(subset=['age_years'])
+        ages = frame.groupby(by)['age_years']
+        table = ages.quantile(list(percentiles)).unstack()
+        table.columns = [f"%{round(p * 100)}" for p in percentiles]
+        table.insert(0, "Ortalama", ages.mean())
+        table.insert(0, "Adet", ages.size())
+        return table.round(1).rename_axis(index=GROUP_LABELS[by])
+    return _cached(conn, 'age_percentiles', (by, purchased_from, purchased_to, percentiles), compute)
+
+@diagnostics.timed('db')
+def status_pivot(conn, index='location', columns='status', purchased_from=None, purchased_to=None):
+    """index × columns çapraz adet tablosu (ör. departman × durum), Toplam satır ve sütunuyla."""
+    def compute():
+        frame = load_frame(conn, purchased_from, purchased_to)
+        table = pd.crosstab(frame[index], frame[columns], margins=True, margins_name="Toplam")
+        return table.rename_axis(index=GROUP_LABELS[index], columns=None)
+    return _cached(conn, 'status_pivot', (index, columns, purchased_from, purchased_to), compute)
+
+@diagnostics.timed('db')
+def refresh_forecast(conn, category='Bilgisayar', older_than=4, by='location', years=3, purchased_from=None, purchased_to=None):
+    """Yenileme tahmini: by alanının her değeri için older_than yaşını geçmiş (Şimdi) ve sonraki
+    her yıl sonunda geçmiş olacak kullanımdaki (Hurda olmayan) category öğelerinin sayısı.
+
+    Örn. category='Bilgisayar', older_than=4, by='location': departman başına 4 yaşından büyük dizüstü sayısı.
+    """
+    def compute():
+        frame = load_frame(conn, purchased_from, purchased_to)
+        frame = frame[(frame['category'] == category) & (frame['status'] != RETIRED_STATUS) & frame['age_years'].notna()]
+        ages = frame['age_years'].to_numpy()
+        offsets = np.arange(years + 1)
+        due = ages[:, None] + offsets[None, :] >= older_than # satır × yıl mantıksal matrisi
+        columns = ["Şimdi"] + [f"+{n} yıl" for n in offsets[1:]]
+        table = pd.DataFrame(due.astype(int), columns=columns, index=frame.index).groupby(frame[by]).sum()
+        table = table[table.any(axis=1)].sort_values(columns[-1], ascending=False)
+        table.loc["Toplam"] = table.sum()
+        return table.rename_axis(index=GROUP_LABELS[by])
+    return _cached(conn, 'refresh_forecast', (category, older_than, by, years, purchased_from, purchased_to), compute)
+
+def export_report(table, path, title="Rapor"):
+    """Rapor tablosunu uzantıya göre Excel'e (openpyxl) veya CSV'ye (Excel için BOM ile) yazar."""
+    if str(path).lower().endswith('.xlsx'):
+        table.to_excel(path, sheet_name=title[:31])
+    else:
+        table.to_csv(path, encoding='utf-8-sig')
@@ -0,0 +1,193 @@
+import csv
+
+from . import diagnostics
+from .database import ARCHIVE_STATUS, READ_VIEWS
+
+# Fark kümeleri ve rapordaki adları (rapor bu sırayla yazılır)
+RESULT_LABELS = {'found': "Bulundu", 'wrong_location': "Yanlış konum", 'missing': "Eksik", 'archived': "Arşivde", 'unknown': "Bilinmeyen seri no"}
+REPORT_HEADERS = ['Sonuç', 'Seri No', 'ID', 'Ad', 'Durum', 'Kayıtlı Konum', 'Okutulan Konum', 'Zimmet Sahibi', 'Okutma Sayısı']
+
+# Okutma ekleme; kapalı veya olmayan oturumda satır eklenmez (rowcount 0). Tekrar okutma sayacı artırır,
+# son konum ve okutan kişi güncellenir. WHERE, upsert'ün SELECT ile ayrıştırılabilmesi için de gereklidir.
+_UPSERT_SCAN = '''
+    INSERT INTO stocktake_scans (session_id, serial_number, location_id, scanned_by)
+    SELECT id, ?, (SELECT id FROM locations WHERE name = ?), ? FROM stocktake_sessions WHERE id = ? AND closed_at IS NULL
+    ON CONFLICT (session_id, serial_number) DO UPDATE SET
+        scan_count = scan_count + 1, scanned_at = CURRENT_TIMESTAMP,
+        location_id = COALESCE(excluded.location_id, location_id), scanned_by = excluded.scanned_by
+'''
+
+class StocktakeResult:
+    """Sayım oturumunun kayıtlarla farkı: her küme için (seri no, id, ad, durum, kayıtlı konum,
+    okutulan konum, zimmet sahibi, okutma sayısı) satırları."""
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.rows = {key: [] for key in RESULT_LABELS}
+        self.unscannable = 0 # Kapsamda olup seri numarası olmadığından okutulamayan öğeler
+
+    def summary(self):
+        """Kullanıcıya gösterilecek kısa özet metni döndürür."""
+        text = ', '.join(f"{len(self.rows[key])} {label.lower()}" for key, label in RESULT_LABELS.items())
+        return text + (f" ({self.unscannable} öğenin seri numarası yok)" if self.unscannable else "")
+
+    def write_report(self, path):
+        """Tüm kümeleri tek CSV raporuna yazar (Excel için BOM ile); yazılan satır sayısını döndürür."""
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_HEADERS)
+            for key, label in RESULT_LABELS.items():
+                writer.writerows([label, *row] for row in self.rows[key])
+        return sum(len(rows) for rows in self.rows.values())
+
+def create_session(conn, name, location=None, author=None):
+    """Yeni sayım oturumu açar (location verilirse sayım o konumla sınırlıdır), id'sini döndürür."""
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO stocktake_sessions (name, location_id, started_by)
+        VALUES (?, (SELECT id FROM locations WHERE name = ?), ?)
+    ''', (name.strip(), location or None, author))
+    conn.commit()
+    return cursor.lastrowid
+
+def list_sessions(conn, include_closed=True):
+    """Oturumları yeniden eskiye [(id, ad, konum, başlangıç, başlatan, kapanış, okutulan seri sayısı)] olarak döndürür."""
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT s.id, s.name, COALESCE(l.name, ''), s.started_at, s.started_by, s.closed_at,
+               (SELECT COUNT(*) FROM stocktake_scans WHERE session_id = s.id)
+        FROM stocktake_sessions s LEFT JOIN locations l ON l.id = s.location_id
+        {'' if include_closed else 'WHERE s.closed_at IS NULL'}
+        ORDER BY s.id DESC
+    ''')
+    return cursor.fetchall()
+
+def close_session(conn, session_id):
+    """Oturumu kapatır; kapalı oturuma okutma eklenmez, farkı yine alınabilir."""
+    conn.execute("UPDATE stocktake_sessions SET closed_at = CURRENT_TIMESTAMP WHERE id = ? AND closed_at IS NULL", (session_id,))
+    conn.commit()
+
+def lookup_serial(conn, serial):
+    """Seri numarasının öğesini (id, ad, konum, durum, arşivde mi) olarak döndürür; yoksa None.
+
+    Önce ana tablonun UNIQUE seri no indeksine, bulunamazsa arşivin seri no indeksine bakılır.
+    """
+    cursor = conn.cursor()
+    for archived, view in enumerate(READ_VIEWS.values()):
+        cursor.execute(f"SELECT id, name, location, status FROM {view} WHERE serial_number = ?", (serial,))
+        row = cursor.fetchone()
+        if row:
+            return (*row, bool(archived))
+    return None
+
+def record_scan(conn, session_id, serial, location=None, author=None):
+    """Okutulan seri numarasını oturuma kaydeder ve hemen geri bildirim için (öğe, okutma sayısı) döndürür.
+
+    Öğe lookup_serial() sonucudur (bilinmeyen seri noda None); okutma sayısı 1'den büyükse seri
+    no bu oturumda daha önce okutulmuştur. Kapalı oturumda ValueError verir.
+    """
+    serial = str(serial).strip()
+    if not serial:
+        raise ValueError("Seri numarası boş")
+    cursor = conn.cursor()
+    cursor.execute(_UPSERT_SCAN, (serial, location or None, author, session_id))
+    if cursor.rowcount == 0:
+        conn.rollback()
+        raise ValueError("Sayım oturumu kapalı veya bulunamadı")
+    conn.commit()
+    cursor.execute("SELECT scan_count FROM stocktake_scans WHERE session_id = ? AND serial_number = ?", (session_id, serial))
+    return lookup_serial(conn, serial), cursor.fetchone()[0]
+
+@diagnostics.timed('db')
+def record_scans(conn, session_id, serials, location=None, author=None):
+    """Yapıştırılan veya dosyadan okunan seri numaralarını tek işlemde kaydeder; kaydedilen sayıyı döndürür."""
+    serials = [s for s in (str(s).strip() for s in serials) if s]
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM stocktake_sessions WHERE id = ? AND closed_at IS NULL", (session_id,))
+    if cursor.fetchone() is None:
+        raise ValueError("Sayım oturumu kapalı veya bulunamadı")
+    cursor.executemany(_UPSERT_SCAN, [(serial, location or None, author, session_id) for serial in serials])
+    conn.commit()
+    return len(serials)
+
+def read_serials(path):
+    """Dosyadaki seri numaralarını üretir: düz metinde satır başına bir seri no; CSV/XLSX'te
+    'Seri No' başlıklı sütun, başlık yoksa ilk sütun.
+
+    İlk satırdaki herhangi bir hücre tanınan bir başlıksa (HEADER_ALIASES) satır başlık sayılır ve
+    atlanır; başlıkta seri no sütunu yoksa ValueError fırlatılır.
+    """
+    from .importer import HEADER_ALIASES, read_rows # Yalnızca dosyadan okumada gerekli
+    column = 0
+    for row_no, values in read_rows(path):
+        if row_no == 1:
+            fields = [HEADER_ALIASES.get(str(v or '').strip().lower()) for v in values]
+            if any(fields):
+                if 'serial_number' not in fields:
+                    raise ValueError("Dosyada 'Seri No' sütunu bulunamadı.")
+                column = fields.index('serial_number')
+                continue
+        if column < len(values) and str(values[column] or '').strip():
+            yield str(values[column]).strip()
+
+@diagnostics.timed('db')
+def stocktake_diff(conn, session_id):
+    """Oturumun okutmalarını kayıtlarla küme olarak karşılaştırır ve StocktakeResult döndürür.
+
+    found: ana tablodaki öğe okutuldu; wrong_location: okutulduğu konum (yoksa oturumun konumu)
+    kayıtlı konumundan farklı; missing: kapsamdaki, seri numarası olan ve hurda olmayan öğe okutulmadı;
+    archived: seri no arşivdeki bir öğenin; unknown: seri no hiçbir kayıtta yok. Her küme tek sorgudur:
+    okutmalar birincil anahtardan, öğeler seri no indeksinden eşlenir.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT location_id FROM stocktake_sessions WHERE id = ?", (session_id,))
+    row = cursor.fetchone()
+    if row is None:
+        raise ValueError("Sayım oturumu bulunamadı")
+    scope = row[0]
+    result = StocktakeResult(session_id)
+    items, archive = READ_VIEWS.values()
+    scanned_location = "COALESCE(l.name, ls.name, '')"
+    scans = '''
+        FROM stocktake_scans s
+        LEFT JOIN locations l ON l.id = s.location_id LEFT JOIN locations ls ON ls.id = :scope
+    '''
+
+    cursor.execute(f'''
+        SELECT s.serial_number, i.id, i.name, i.status, i.location, {scanned_location}, i.assigned_to, s.scan_count,
+               COALESCE(s.location_id, :scope) IS NOT NULL AND i.location_id IS NOT COALESCE(s.location_id, :scope)
+        {scans} JOIN {items} i ON i.serial_number = s.serial_number
+        WHERE s.session_id = :session ORDER BY s.serial_number
+    ''', {'session': session_id, 'scope': scope})
+    for *item, wrong in cursor.fetchall():
+        result.rows['wrong_location' if wrong else 'found'].append(tuple(item))
+    cursor.execute(f'''
+        SELECT s.serial_number, a.id, a.name, a.status, a.location, {scanned_location}, a.assigned_to, s.scan_count
+        {scans} JOIN {archive} a ON a.serial_number = s.serial_number
+        WHERE s.session_id = :session AND NOT EXISTS (SELECT 1 FROM inventory_items WHERE serial_number = s.serial_number)
+        ORDER BY s.serial_number
+    ''', {'session': session_id, 'scope': scope})
+    result.rows['archived'] = cursor.fetchall()
+    cursor.execute(f'''
+        SELECT s.serial_number, NULL, '', '', '', {scanned_location}, '', s.scan_count
+        {scans}
+        WHERE s.session_id = :session
+          AND NOT EXISTS (SELECT 1 FROM inventory_items WHERE serial_number = s.serial_number)
+          AND NOT EXISTS (SELECT 1 FROM inventory_archive WHERE serial_number = s.serial_number)
+        ORDER BY s.serial_number
+    ''', {'session': session_id, 'scope': scope})
+    result.rows['unknown'] = cursor.fetchall()
+
+    # Beklenen öğeler: kapsamdaki, hurda olmayanlar (hurdalar sayımda aranmaz)
+    where = "i.status_id IS NOT (SELECT id FROM statuses WHERE name = :retired)" + (" AND i.location_id = :scope" if scope is not None else '')
+    params = {'session': session_id, 'scope': scope, 'retired': ARCHIVE_STATUS}
+    cursor.execute(f'''
+        SELECT i.serial_number, i.id, i.name, i.status, i.location, '', i.assigned_to, 0
+        FROM {items} i
+        WHERE {where} AND i.serial_number <> ''
+          AND NOT EXISTS (SELECT 1 FROM stocktake_scans WHERE session_id = :session AND serial_number = i.serial_number)
+        ORDER BY i.location, i.serial_number
+    ''', params)
+    result.rows['missing'] = cursor.fetchall()
+    cursor.execute(f"SELECT COUNT(*) FROM inventory_items i WHERE {where} AND COALESCE(i.serial_number, '') = ''", params)
+    result.unscannable = cursor.fetchone()[0]
+    return result
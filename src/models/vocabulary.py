@@ -0,0 +1,15 @@
+# Sözlük tablolarının (categories, statuses, locations, brands, category_brands) ilk değerleri; formlar seçenekleri veritabanından okur, test verisi üretimi bunları kullanır
+CATEGORIES = ["Bilgisayar", "Monitör", "Yazıcı", "Switch", "Güvenlik", "Sunucu", "UPS"]
+STATUSES = ["Aktif Kullanımda", "Depoda", "Serviste", "Arızalı", "Hurda"]
+LOCATIONS = ["IT", "Muhasebe", "Satış", "Yönetim", "Resepsiyon", "İnsan Kaynakları", "Pazarlama", "Üretim", "Depo",
+             "Toplantı Odası", "Ortak Alan", "1. Kat", "2. Kat", "3. Kat"]
+# Kategoriye göre marka listeleri
+BRANDS_BY_CATEGORY = {
+    "Bilgisayar": ["Dell", "HP", "Lenovo", "ASUS", "Acer", "MSI", "Apple", "Microsoft", "Gigabyte", "Casper", "Monster", "Huawei", "Toshiba", "Fujitsu", "Samsung", "Razer", "LG", "Sony", "Exa", "Izoly"],
+    "Monitör": ["Samsung", "LG", "ASUS", "Dell", "HP", "BenQ", "ViewSonic", "AOC", "Philips", "MSI", "Acer", "Gigabyte", "Lenovo", "Huawei", "iiyama", "Eizo"],
+    "Yazıcı": ["HP", "Canon", "Epson", "Brother", "Xerox", "Kyocera", "Lexmark", "Ricoh", "Pantum", "OKI", "Samsung", "Zebra", "Honeywell", "Datamax", "Konica Minolta"],
+    "Switch": ["Cisco", "HP Aruba", "Juniper", "D-Link", "TP-Link", "Ubiquiti", "Zyxel", "MikroTik", "Netgear", "Dell Networking", "Extreme Networks", "Huawei", "Fortinet", "Mellanox"],
+    "Güvenlik": ["Fortinet", "Palo Alto", "Cisco", "SonicWall", "WatchGuard", "Check Point", "Sophos", "Juniper", "Barracuda", "Zyxel", "Cyberom", "F5 Networks"],
+    "Sunucu": ["Dell", "HP", "Lenovo", "IBM", "Fujitsu", "Supermicro", "Huawei", "Cisco (UCS)", "Oracle", "Inspur", "Hitachi", "NEC"],
+    "UPS": ["APC", "Eaton", "PowerWalker", "CyberPower", "Vertiv", "Delta", "Tripp Lite", "Emerson", "Legrand", "Makelsan", "Inform", "Riello", "Socomec"],
+}
@@ -0,0 +1,113 @@
+import itertools
+import queue
+import threading
+
+from . import diagnostics
+from .database import connect
+
+class DatabaseJob:
+    """Veritabanı iş parçacığına gönderilen tek bir istek."""
+    def __init__(self, job_id, func, args, kwargs, callback, error, channel):
+        self.id = job_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.callback = callback # Başarılı sonuçta UI iş parçacığında çağrılır: callback(sonuç)
+        self.error = error # Hata durumunda UI iş parçacığında çağrılır: error(istisna)
+        self.channel = channel # Aynı kanaldaki yeni istek bu işi eskitir (ör. 'detail', 'page')
+        self.cancelled = False
+
+class DatabaseWorker(threading.Thread):
+    """Kendi bağlantısına sahip arka plan veritabanı iş parçacığı.
+
+    UI iş parçacığı submit() ile func(conn, *args) isteklerini kuyruğa ekler; sonuçlar
+    bir sonuç kuyruğunda birikir ve UI tarafında (after() ile düzenli çağrılan)
+    process_results() içinde geri çağrılara dağıtılır. Tk'ye yalnızca UI iş parçacığı dokunur.
+    """
+    def __init__(self, db_path, on_error=None):
+        super().__init__(name='DatabaseWorker', daemon=True)
+        self.db_path = db_path
+        self.on_error = on_error # Kendi hata geri çağrısı olmayan işler için
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.channels = {} # kanal -> o kanaldaki en son iş
+        self.lock = threading.Lock()
+        self.current = None # Şu anda çalışan iş
+        self.conn = None
+        self._ids = itertools.count(1)
+        self.start()
+
+    def submit(self, func, *args, callback=None, error=None, channel=None, **kwargs):
+        """func(conn, *args, **kwargs) çağrısını kuyruğa ekler ve DatabaseJob döndürür.
+
+        channel verilirse aynı kanalda bekleyen eski iş iptal edilir, çalışmakta olan eski
+        okuma sorgusu da kesilir (sqlite3 interrupt); böylece kullanıcı yeni bir satıra
+        tıkladığında veya yeniden sıraladığında eskiyen sonuçlar UI'a hiç ulaşmaz.
+        Kanal yalnızca okuma işleri için kullanılmalıdır; yazma işleri kesilmez.
+        """
+        job = DatabaseJob(next(self._ids), func, args, kwargs, callback, error, channel)
+        if channel:
+            with self.lock:
+                old = self.channels.get(channel)
+                self.channels[channel] = job
+                if old is not None:
+                    old.cancelled = True
+                    if old is self.current and self.conn is not None:
+                        self.conn.interrupt()
+        self.requests.put(job)
+        return job
+
+    def cancel(self, channel):
+        """Kanaldaki bekleyen işi iptal eder (sonucu UI'a ulaşmaz)."""
+        with self.lock:
+            job = self.channels.pop(channel, None)
+            if job is not None:
+                job.cancelled = True
+
+    def run(self):
+        """(Arka plan) Kuyruktaki işleri sırayla kendi bağlantısıyla çalıştırır."""
+        self.conn = connect(self.db_path)
+        while True:
+            job = self.requests.get()
+            if job is None:
+                break
+            if job.cancelled:
+                continue
+            with self.lock:
+                self.current = job
+            try:
+                name = getattr(job.func, '__name__', 'job')
+                outcome = ('ok', diagnostics.call('db', name, job.func, self.conn, *job.args, **job.kwargs))
+            except Exception as e:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                outcome = ('error', e)
+            with self.lock:
+                self.current = None
+            if not job.cancelled:
+                self.results.put((job, outcome))
+        self.conn.close()
+
+    def process_results(self):
+        """(UI) Biten işlerin geri çağrılarını çalıştırır; after() ile düzenli çağrılmalıdır."""
+        while True:
+            try:
+                job, (status, value) = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if job.cancelled:
+                continue
+            if job.channel:
+                with self.lock:
+                    if self.channels.get(job.channel) is job:
+                        del self.channels[job.channel]
+            if status == 'ok':
+                if job.callback: job.callback(value)
+            elif job.error:
+                job.error(value)
+            elif self.on_error:
+                self.on_error(value)
+
+    def stop(self):
+        """Kuyruktaki işler bittikten sonra iş parçacığını durdurur ve bağlantıyı kapatır."""
+        self.requests.put(None)
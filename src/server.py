@@ -0,0 +1,327 @@
+"""Envanter veritabanı için yerel HTTP/JSON API sunucusu (arayüzsüz).
+
+Kullanım:
+    python -m src.server [--db inventory.db] [--host 127.0.0.1] [--port 8765] [--readers 4]
+
+Uç noktalar (tüm istekler HTTP Basic kimlik doğrulaması ister, kullanıcılar `users` tablosundan):
+    GET    /items?sort=name&desc=1&search=dell&limit=200&after=<next>   Sayfalı liste
+                                                                        (status=, category=, location=, brand=, assigned_to= ile süzülür,
+                                                                        archive=1 arşivdeki öğeleri de listeler)
+    GET    /search?q=dell                                               /items?search=... kısayolu
+    GET    /items/<id>                                                  Tek öğe
+    POST   /items                                                       Yeni öğe (JSON gövde)
+    PUT    /items/<id>                                                  Öğeyi tümüyle değiştirir (serial_number zorunlu; null siler)
+    PATCH  /items/<id>                                                  Verilen alanları günceller
+    DELETE /items/<id>                                                  Öğeyi siler
+    GET    /stats?archive=1                                             Durum/kategori/konum/marka/zimmet sayıları
+
+GET yanıtları veri sürümünden türetilen bir ETag taşır; If-None-Match eşleşirse sorgu
+çalıştırılmadan 304 döner.
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import functools
+import json
+import sqlite3
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+
+from .models.database import (DB_PATH, PAGE_SIZE, TABLE_COLUMNS, ITEM_FIELDS, STAT_DIMENSIONS, FACET_COLUMNS, connect, init_db, get_user,
+                              get_data_version, get_statistics, normalize_item, add_inventory_item, update_inventory_item,
+                              delete_inventory_items)
+from .models.cache import get_cached_page, get_cached_item
+
+DEFAULT_HOST = '127.0.0.1' # Yalnızca yerel makineden erişim
+DEFAULT_PORT = 8765
+DEFAULT_READERS = 4 # Okuma bağlantısı havuzunun boyutu
+MAX_PAGE_SIZE = 1000
+MAX_BODY_SIZE = 1024 * 1024
+# get_inventory_item tuple'ının alan sırası
+_DETAIL_ORDER = ['id', 'name', 'category', 'model', 'brand', 'serial_number', 'purchase_date', 'status', 'location', 'notes', 'assigned_to']
+
+class HTTPError(Exception):
+    """İstemciye JSON hata gövdesiyle döndürülecek HTTP hatası."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class DatabaseThread:
+    """Kendi bağlantısına sahip tek iş parçacıklı yürütücü; bağlantı hep aynı iş parçacığında kullanılır."""
+    def __init__(self, db_path):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.conn = self.executor.submit(connect, db_path).result()
+
+    async def run(self, func, *args):
+        """func(conn, *args) çağrısını bu iş parçacığında çalıştırır; hata olursa açık işlemi geri alır."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(self._call, func, args))
+
+    def _call(self, func, args):
+        try:
+            return func(self.conn, *args)
+        except Exception:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+
+    def close(self):
+        self.executor.submit(self.conn.close).result()
+        self.executor.shutdown()
+
+class Database:
+    """Okumalar için bağlantı havuzu, yazmalar için tek (sıraya alınmış) yazıcı bağlantısı.
+
+    WAL kipinde okuyucular yazıcıyı beklemez; tek yazıcı SQLite'ın kilit yarışını süreç içinde
+    sıraya sokar, böylece masaüstü istemcileriyle 'database is locked' hataları azalır.
+    """
+    def __init__(self, db_path, readers=DEFAULT_READERS):
+        self.writer = DatabaseThread(db_path)
+        self.readers = [DatabaseThread(db_path) for _ in range(readers)]
+        self.pool = asyncio.Queue()
+        for reader in self.readers:
+            self.pool.put_nowait(reader)
+
+    async def read(self, func, *args):
+        """Havuzdan boş bir okuma bağlantısı alıp func(conn, *args) çalıştırır."""
+        reader = await self.pool.get()
+        try:
+            return await reader.run(func, *args)
+        finally:
+            self.pool.put_nowait(reader)
+
+    async def write(self, func, *args):
+        """func(conn, *args) çağrısını tek yazıcı bağlantısında sırayla çalıştırır."""
+        return await self.writer.run(func, *args)
+
+    def close(self):
+        for thread in self.readers + [self.writer]:
+            thread.close()
+
+def _row_dict(row):
+    """Tablo satırını (get_inventory_page biçimi) sözlüğe çevirir."""
+    return dict(zip(TABLE_COLUMNS, row))
+
+def _item_dict(item):
+    """get_inventory_item tuple'ını sözlüğe çevirir."""
+    return dict(zip(_DETAIL_ORDER, item))
+
+def _encode_key(key):
+    """Sayfa anahtarını URL'de taşınabilir opak bir dizgeye çevirir."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode() if key else None
+
+def _decode_key(token):
+    try:
+        phase, value, item_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return int(phase), str(value), int(item_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Geçersiz 'after' değeri")
+
+def _etag(version, *parts):
+    """Veri sürümü ve istek parametrelerinden ETag üretir."""
+    digest = binascii.crc32(json.dumps(parts).encode())
+    return f'"{version}-{digest:08x}"'
+
+def _read_item(conn, item_id):
+    item = get_cached_item(conn, item_id)
+    if item is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Öğe bulunamadı")
+    return _item_dict(item)
+
+def _create_item(conn, data, author):
+    try: item = normalize_item(data)
+    except ValueError as e: raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+    try: item_id = add_inventory_item(conn, item, author)
+    except sqlite3.IntegrityError: raise HTTPError(HTTPStatus.CONFLICT, "Seri numarası zaten mevcut!")
+    return _read_item(conn, item_id)
+
+def _update_item(conn, item_id, data, partial, author):
+    current = get_cached_item(conn, item_id)
+    if current is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Öğe bulunamadı")
+    if partial: # PATCH: verilmeyen alanlar korunur
+        data = {**_item_dict(current), **data}
+    elif 'serial_number' not in data: # PUT tüm kaydı değiştirir: seri no sessizce silinmesin
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "PUT için 'serial_number' gerekli (silmek için null gönderin, kısmi güncelleme için PATCH)")
+    elif 'purchase_date' not in data: # PUT'ta verilmeyen alım tarihi bugüne çekilmez, kayıtlı değer kalır
+        data = {**data, 'purchase_date': _item_dict(current)['purchase_date']}
+    try: item = normalize_item(data, new=False)
+    except ValueError as e: raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+    try: update_inventory_item(conn, item_id, item, author)
+    except sqlite3.IntegrityError: raise HTTPError(HTTPStatus.CONFLICT, "Seri numarası zaten mevcut!")
+    return _read_item(conn, item_id)
+
+def _flag(query, name):
+    return query.get(name, '0').lower() in ('1', 'true', 'yes')
+
+def _all_statistics(conn, archive=False):
+    return {dim: get_statistics(conn, dim, archive) for dim in STAT_DIMENSIONS}
+
+class InventoryServer:
+    """asyncio tabanlı, bağımlılıksız küçük HTTP/1.1 sunucusu (keep-alive destekli)."""
+    def __init__(self, db_path=DB_PATH, readers=DEFAULT_READERS):
+        init_db(db_path).close() # Şema geçişleri sunucu açılmadan uygulanır
+        self.db = Database(db_path, readers)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Sunucuyu başlatır ve asyncio.Server döndürür (port=0 ise boş bir port seçilir)."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self.db.close()
+
+    async def handle_connection(self, reader, writer):
+        """Bir istemci bağlantısındaki istekleri sırayla yanıtlar."""
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload, extra = await self.dispatch(method, target, headers, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self.write_response(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError): # Kopan bağlantı veya bozuk istek
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """İstek satırını, başlıkları ve gövdeyi okur; bağlantı kapandıysa None döndürür."""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length') or 0)
+        if length > MAX_BODY_SIZE:
+            raise ConnectionError("İstek gövdesi çok büyük")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, headers, body
+
+    async def write_response(self, writer, status, payload, extra, keep_alive):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = [f'HTTP/1.1 {status.value} {status.phrase}', f'Content-Length: {len(body)}',
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if payload is not None:
+            head.append('Content-Type: application/json; charset=utf-8')
+        head.extend(f'{name}: {value}' for name, value in extra.items())
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, headers, body):
+        """İsteği ilgili uç noktaya yönlendirir; (durum, JSON gövde, ek başlıklar) döndürür."""
+        try:
+            author = (await self.authenticate(headers))[1] # Değişiklik günlüğüne yazılan kullanıcı adı
+            url = urlsplit(target)
+            query = dict(parse_qsl(url.query))
+            parts = [p for p in url.path.split('/') if p]
+            if parts == ['items'] and method == 'GET':
+                return await self.list_items(query, headers)
+            if parts == ['search'] and method == 'GET':
+                return await self.list_items({**query, 'search': query.get('q', '')}, headers)
+            if parts == ['stats'] and method == 'GET':
+                return await self.conditional(headers, ('stats', _flag(query, 'archive')), _all_statistics, _flag(query, 'archive'))
+            if parts == ['items'] and method == 'POST':
+                return HTTPStatus.CREATED, await self.db.write(_create_item, self.parse_body(body), author), {}
+            if len(parts) == 2 and parts[0] == 'items':
+                try: item_id = int(parts[1])
+                except ValueError: raise HTTPError(HTTPStatus.NOT_FOUND, "Öğe bulunamadı")
+                if method == 'GET':
+                    return await self.conditional(headers, ('item', item_id), _read_item, item_id)
+                if method in ('PUT', 'PATCH'):
+                    return HTTPStatus.OK, await self.db.write(_update_item, item_id, self.parse_body(body), method == 'PATCH', author), {}
+                if method == 'DELETE':
+                    if not await self.db.write(delete_inventory_items, [item_id], author):
+                        raise HTTPError(HTTPStatus.NOT_FOUND, "Öğe bulunamadı")
+                    return HTTPStatus.NO_CONTENT, None, {}
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Desteklenmeyen yöntem")
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Bilinmeyen adres")
+        except HTTPError as e:
+            extra = {'WWW-Authenticate': 'Basic realm="envanter"'} if e.status == HTTPStatus.UNAUTHORIZED else {}
+            return e.status, {'error': e.message}, extra
+        except sqlite3.Error as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': f"Veritabanı hatası: {e}"}, {}
+        except Exception as e: # Beklenmeyen hata bağlantıyı yanıtsız kapatmasın; keep-alive istemci sürer
+            traceback.print_exc()
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Sunucu hatası: {e}"}, {}
+
+    async def authenticate(self, headers):
+        """HTTP Basic bilgilerini users tablosuna karşı doğrular, kullanıcı satırını döndürür."""
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        try:
+            username, _, password = base64.b64decode(token).decode('utf-8').partition(':')
+        except (ValueError, binascii.Error):
+            username = password = ''
+        user = await self.db.read(get_user, username, password) if scheme.lower() == 'basic' and username else None
+        if not user:
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Kimlik doğrulaması gerekli")
+        return user
+
+    async def conditional(self, headers, etag_parts, func, *args):
+        """Veri sürümü değişmediyse (If-None-Match) func'ı çalıştırmadan 304 döndürür."""
+        etag = _etag(await self.db.read(get_data_version), *etag_parts)
+        if etag in [t.strip().removeprefix('W/') for t in headers.get('if-none-match', '').split(',')]:
+            return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag}
+        return HTTPStatus.OK, await self.db.read(func, *args), {'ETag': etag}
+
+    async def list_items(self, query, headers):
+        sort = query.get('sort', 'name')
+        descending = _flag(query, 'desc')
+        archive = _flag(query, 'archive')
+        try: limit = max(1, min(int(query.get('limit', PAGE_SIZE)), MAX_PAGE_SIZE))
+        except ValueError: raise HTTPError(HTTPStatus.BAD_REQUEST, "Geçersiz 'limit' değeri")
+        after = _decode_key(query['after']) if query.get('after') else None
+        search = query.get('search') or None
+        filters = {col: query[col] for col in FACET_COLUMNS if col in query}
+
+        def page(conn):
+            rows, next_key = get_cached_page(conn, sort, descending, after, limit, search, filters, archive)
+            return {'items': [_row_dict(r) for r in rows], 'next': _encode_key(next_key)}
+        return await self.conditional(headers, ('items', sort, descending, limit, query.get('after'), search, filters, archive), page)
+
+    @staticmethod
+    def parse_body(body):
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Gövde geçerli JSON değil")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Gövde bir JSON nesnesi olmalı")
+        return {k: v for k, v in data.items() if k in ITEM_FIELDS}
+
+async def _run(args):
+    server = InventoryServer(args.db, args.readers)
+    http = await server.serve(args.host, args.port)
+    print(f"Envanter API http://{args.host}:{http.sockets[0].getsockname()[1]} adresinde ({args.db})")
+    try:
+        async with http:
+            await http.serve_forever()
+    finally:
+        server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Envanter veritabanı için yerel HTTP/JSON API sunucusu.")
+    parser.add_argument('--db', default=DB_PATH, help="Veritabanı dosyası")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS, help="Okuma bağlantısı sayısı")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
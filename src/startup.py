@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+import time
+
+PROFILE_ENV = 'ENVANTER_STARTUP_PROFILE' # Tanımlıysa rapor bu JSON dosyasına yazılır
+LAUNCHED_AT_ENV = 'ENVANTER_LAUNCHED_AT' # Süreci başlatanın time.time() değeri (ör. benchmarks.startup)
+
+# Bu modül src/main.py'de ilk iş olarak içe aktarılır; saatler buradan başlar.
+_CPU_AT_IMPORT = time.process_time() # Yorumlayıcının bu ana kadar harcadığı CPU süresi (duvar saati değil)
+_last = time.perf_counter()
+phases = {} # aşama adı -> duvar saati süresi (ms), kayıt sırasıyla
+try: # Başlatan zamanı verdiyse süreç açılışı ve yorumlayıcı da aynı (duvar) saatle bir aşamadır
+    phases['interpreter'] = max(time.time() - float(os.environ[LAUNCHED_AT_ENV]), 0) * 1000
+except (KeyError, ValueError):
+    pass
+
+def mark(name):
+    """Bir önceki işaretten bu yana geçen süreyi 'name' aşaması olarak kaydeder."""
+    global _last
+    now = time.perf_counter()
+    phases[name] = (now - _last) * 1000
+    _last = now
+
+def skip():
+    """Kullanıcı beklemesi gibi ölçülmeyecek süreyi atlar (ör. giriş bilgileri yazılırken)."""
+    global _last
+    _last = time.perf_counter()
+
+def _rss_kb():
+    """Sürecin en yüksek bellek kullanımı (KB); ölçülemiyorsa None."""
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss # macOS bayt, Linux KB döndürür
+
+def report():
+    """Aşama sürelerini, toplamı ve bellek kullanımını sözlük olarak döndürür.
+
+    total_ms yalnızca duvar saati aşamalarının toplamıdır; yorumlayıcının içe aktarıma kadarki CPU
+    süresi ayrı (interpreter_cpu_ms) verilir. 'interpreter' aşaması yalnızca LAUNCHED_AT_ENV varsa vardır.
+    """
+    return {'phases_ms': dict(phases), 'total_ms': sum(phases.values()), 'interpreter_cpu_ms': _CPU_AT_IMPORT * 1000, 'max_rss_kb': _rss_kb(),
+            'heavy_modules': sorted(m for m in ('pandas', 'numpy', 'openpyxl') if m in sys.modules)}
+
+def write_report(path=None):
+    """Raporu path'e (veya PROFILE_ENV ile verilen dosyaya) yazar; ikisi de yoksa bir şey yapmaz."""
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path:
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report(), f, ensure_ascii=False, indent=2)
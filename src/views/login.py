@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import ttkbootstrap as ttk
-from .main_window import MainWindow
+from ..models.database import get_user
+from .. import startup
 import sqlite3
 
 class LoginWindow(ttk.Window):
@@ -12,6 +13,7 @@ class LoginWindow(ttk.Window):
         
         self.db_conn = db_conn
         self.init_ui()
+        self.after_idle(lambda: startup.mark('login_first_paint')) # Bekleyen çizimlerden sonra çalışır
         
     def init_ui(self):
         """Giriş penceresinin arayüz elemanlarını oluşturur ve yerleştirir."""
@@ -109,18 +111,17 @@ class LoginWindow(ttk.Window):
              return
              
         try:
-            cursor = self.db_conn.cursor() 
-            cursor.execute('SELECT * FROM users WHERE username = ? AND password = ?', (username, password))
-            user = cursor.fetchone()
+            user = get_user(self.db_conn, username, password)
         except sqlite3.Error as e:
              messagebox.showerror("Veritabanı Hatası", f"Giriş sırasında hata:\n{e}")
              return
             
         if user:
             print(f"Giriş başarılı: {user}") 
-            self.withdraw() 
-            main_app = MainWindow(self.db_conn, user) 
-            main_app.protocol("WM_DELETE_WINDOW", self.quit) 
+            startup.skip() # Kullanıcının giriş bilgilerini yazdığı süre ölçülmez
+            from .main_window import MainWindow # Ana pencere modülleri yalnızca girişten sonra yüklenir
+            self.withdraw() # Kök pencere gizlenir; ana pencere aynı Tcl yorumlayıcısını ve temayı kullanır
+            MainWindow(self, self.db_conn, user) 
         else:
             messagebox.showerror("Giriş Başarısız", "Hatalı kullanıcı adı veya şifre!")
             self.password_var.set("") 
\ No newline at end of file
@@ -1,38 +1,85 @@
-import re
+import bisect
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import datetime
 import sqlite3
-import pandas as pd
 import ttkbootstrap as ttk
+from ..models.database import (TABLE_COLUMNS, FACET_COLUMNS, get_inventory_row, get_status_counts, get_facet_counts, inventory_sort_key, inventory_matches,
+                               add_inventory_item, update_inventory_item, delete_inventory_items, bulk_update_items, matching_item_ids, normalize_status, normalize_item, get_changes, get_change_version,
+                               get_db_path, connect, init_db, archive_items, count_archivable, ARCHIVE_AFTER_DAYS)
+from ..models.worker import DatabaseWorker
+from ..models.cache import inventory_cache, get_cached_page, get_cached_item, get_cached_vocabulary, clear_vocabulary_cache
+from ..models import diagnostics
+from ..models.backup import BACKUP_INTERVAL_HOURS, backup_due, backup_database, list_backups, verify_snapshot, restore_backup
+from ..models.duplicates import REASONS, find_similar_items, find_duplicate_groups, write_duplicate_report
+from ..models.stocktake import RESULT_LABELS, create_session, list_sessions, close_session, record_scan, record_scans, read_serials, stocktake_diff
+from .. import startup
 
-class MainWindow(tk.Tk): 
-    def __init__(self, db_conn, user):
-        """Ana uygulama penceresini başlatır."""
-        super().__init__()
+SEARCH_DELAY_MS = 250 # Yazarken aramanın çalışması için beklenen süre (debounce)
+DB_POLL_MS = 20 # Veritabanı iş parçacığından gelen sonuçların UI'da kontrol aralığı
+CHANGE_POLL_MS = 3000 # Diğer istemcilerin değişiklikleri için değişiklik günlüğünün yoklanma aralığı
+BACKUP_CHECK_MS = 60 * 60 * 1000 # Zamanlanmış yedeğin gerekip gerekmediğinin kontrol aralığı
+ARCHIVE_CHECK_MS = 60 * 60 * 1000 # Arşivlenecek hurda öğelerin kontrol aralığı
+
+FACET_LABELS = {'status': "Durum", 'category': "Kategori", 'location': "Konum", 'brand': "Marka", 'assigned_to': "Zimmet Sahibi"}
+BULK_ACTIONS = {'status': "🔁 Durum Değiştir...", 'location': "📍 Konuma Taşı...", 'assigned_to': "👤 Zimmetle..."}
+# Yaşam döngüsü raporları: başlık -> src.models.reports fonksiyonu
+REPORTS = {"Yaş dağılımı": 'age_distribution', "Yaş yüzdelikleri": 'age_percentiles', "Durum dağılımı": 'status_pivot', "Yenileme tahmini": 'refresh_forecast'}
+FACET_LIMIT = 50 # Filtre listesinde gösterilecek en fazla değer (en kalabalıklar)
+DIFF_DISPLAY_LIMIT = 1000 # Sayım farkında küme başına listelenen en fazla öğe (tamamı raporda)
+
+# Tablo başlıklarının veritabanı sütun karşılıkları
+COLUMN_MAP = {'Zimmet Sahibi': 'assigned_to', 'Ad': 'name', 'Kategori': 'category', 'Model': 'model', 'Marka': 'brand', 'Seri No': 'serial_number', 'Alım Tarihi': 'purchase_date', 'Durum': 'status', 'Konum': 'location'}
+
+class MainWindow(tk.Toplevel): 
+    def __init__(self, master, db_conn, user):
+        """Ana uygulama penceresini giriş penceresinin (tek Tk kökü) alt penceresi olarak başlatır."""
+        super().__init__(master)
         
         self.db_conn = db_conn
         self.user = user 
+        self.author = user[1] if user else None # Değişiklik günlüğüne yazılan kullanıcı adı
         self.selected_item = None 
         
-        try:
-            self.style = ttk.Style(theme="litera") 
-        except tk.TclError:
-            print("Uyarı: 'litera' teması bulunamadı. Varsayılan ttk teması kullanılıyor.")
-            self.style = ttk.Style() 
+        # Tema kök pencerede (ttk.Window) bir kez yüklenir; Style tüm pencerelerde ortaktır
+        self.style = ttk.Style() 
+        self.protocol("WM_DELETE_WINDOW", self.master.destroy) # Kökü kapatmak uygulamayı sonlandırır
 
         self.sort_column = None 
         self.sort_reverse = False 
+        self.page_key = None # Sanal kaydırma: son yüklenen satırın (değer, id) anahtarı
+        self.loading_page = False 
+        self.pending_selection = () # Yenileme sonrası yeniden seçilecek satırlar
+        self.loaded_keys = [] # Yüklü satırların tablodaki sırayla sıralama anahtarları (bisect için)
+        self.status_counts = {} # İstatistik paneli için bellekteki durum sayaçları
+        self.active_search = '' # Tabloya uygulanmış arama metni
+        self.facet_filters = {} # Filtre panelinde seçili {sütun: değer}
+        self.show_archive = tk.BooleanVar(value=False) # Görünüm > Arşivi Dahil Et: arşivdeki hurda öğeler de listelenir
+        self.search_job = None # Bekleyen (debounce) arama için after() kimliği
+        self.change_version = None # Tabloya uygulanmış son değişiklik günlüğü sürümü
+        self.refresh_started = None
+        # Tüm sorgular bu iş parçacığının kendi bağlantısında çalışır; UI donmaz
+        self.db_path = get_db_path(db_conn) # Arka plan iş parçacıkları kendi bağlantılarını bu yoldan açar
+        self.db_worker = DatabaseWorker(self.db_path, on_error=self.on_db_error)
+        self.db_worker.submit(get_cached_vocabulary) # Form seçenekleri oturumda bir kez, pencereler açılmadan okunur
+        self.after(DB_POLL_MS, self.poll_db_worker)
+        self.after(CHANGE_POLL_MS, self.poll_changes)
+        if BACKUP_INTERVAL_HOURS > 0: self.after(CHANGE_POLL_MS, self.scheduled_backup)
+        if ARCHIVE_AFTER_DAYS > 0: self.after(CHANGE_POLL_MS, self.scheduled_archive)
         
         self.init_ui() 
         self.setup_menu() 
         self.setup_styles()
+        self.after_idle(self.on_first_paint)
         
     def init_ui(self):
         """Ana pencerenin arayüz elemanlarını (widget'lar) oluşturur ve grid ile yerleştirir."""
         self.title('IT Envanter Yönetim Sistemi')
         self.geometry('1200x650') 
-        self.eval('tk::PlaceWindow . center') 
+        self.eval(f'tk::PlaceWindow {str(self)} center') 
 
         self.main_frame = ttk.Frame(self, padding="10")
         self.main_frame.pack(fill='both', expand=True) 
@@ -67,6 +114,19 @@ class MainWindow(tk.Tk):
             self.stats_labels[key] = text_label 
             row_index += 1
 
+        facets_frame = ttk.LabelFrame(left_panel, text="🔎 Filtreler", padding=(10, 8), bootstyle="info")
+        facets_frame.grid(row=1, column=0, sticky='nsew', pady=10)
+        left_panel.rowconfigure(1, weight=1)
+        self.facet_trees = {}
+        for i, col in enumerate(FACET_COLUMNS):
+            tree = ttk.Treeview(facets_frame, columns=('value', 'count'), show='headings', height=3, selectmode='none')
+            tree.heading('value', text=FACET_LABELS[col], anchor='w'); tree.heading('count', text="Adet", anchor='e')
+            tree.column('value', width=150, anchor='w'); tree.column('count', width=50, anchor='e')
+            tree.grid(row=i, column=0, sticky='ew', pady=(0, 6))
+            tree.bind('<ButtonRelease-1>', lambda e, _col=col: self.on_facet_click(_col, e))
+            self.facet_trees[col] = tree
+        ttk.Button(facets_frame, text="Filtreleri Temizle", command=self.clear_facets, bootstyle='secondary-outline').grid(row=len(FACET_COLUMNS), column=0, sticky='ew')
+
         right_panel = ttk.Frame(self.main_frame)
         right_panel.grid(row=0, column=1, sticky='nsew') 
         right_panel.columnconfigure(0, weight=1) 
@@ -74,7 +134,7 @@ class MainWindow(tk.Tk):
 
         button_toolbar = ttk.Frame(right_panel) 
         button_toolbar.grid(row=0, column=0, sticky='ew', pady=(0, 10)) 
-        button_toolbar.columnconfigure(1, weight=1) 
+        button_toolbar.columnconfigure(2, weight=1) 
 
         left_buttons_frame = ttk.Frame(button_toolbar)
         left_buttons_frame.grid(row=0, column=0, sticky='w')
@@ -83,8 +143,18 @@ class MainWindow(tk.Tk):
         ttk.Button(left_buttons_frame, text="🗑️ Sil", command=self.delete_item, bootstyle='danger', width=10).pack(side='left', padx=2)
         ttk.Separator(button_toolbar, orient='vertical', bootstyle="secondary").grid(row=0, column=1, sticky='ns', padx=10, pady=5) 
 
+        search_frame = ttk.Frame(button_toolbar)
+        search_frame.grid(row=0, column=2, sticky='ew', padx=(0, 10))
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="🔍").grid(row=0, column=0, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.on_search_change)
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, bootstyle="info")
+        self.search_entry.grid(row=0, column=1, sticky='ew')
+        self.search_entry.bind('<Escape>', lambda e: self.search_var.set(''))
+
         right_buttons_frame = ttk.Frame(button_toolbar)
-        right_buttons_frame.grid(row=0, column=2, sticky='e') 
+        right_buttons_frame.grid(row=0, column=3, sticky='e') 
         ttk.Button(right_buttons_frame, text="🔄 Yenile", command=self.reset_filters_and_refresh, bootstyle='info-outline', width=10).pack(side='left', padx=2)
         ttk.Button(right_buttons_frame, text="📊 Excel'e Aktar", command=self.export_data, bootstyle='primary-outline', width=15).pack(side='left', padx=2)
         
@@ -99,7 +169,8 @@ class MainWindow(tk.Tk):
         x_scrollbar.grid(row=1, column=0, sticky='ew')
         
         columns = ['Zimmet Sahibi', 'Ad', 'Kategori', 'Model', 'Marka', 'Seri No', 'Alım Tarihi', 'Durum', 'Konum']
-        self.table = ttk.Treeview(table_frame, columns=columns, show='headings', yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set, selectmode='extended', bootstyle="info") 
+        self.y_scrollbar = y_scrollbar
+        self.table = ttk.Treeview(table_frame, columns=columns, show='headings', yscrollcommand=self.on_table_scroll, xscrollcommand=x_scrollbar.set, selectmode='extended', bootstyle="info") 
         self.table.grid(row=0, column=0, sticky='nsew')
         y_scrollbar.config(command=self.table.yview)
         x_scrollbar.config(command=self.table.xview)
@@ -110,6 +181,7 @@ class MainWindow(tk.Tk):
             self.table.column(col, width=column_widths[col], minwidth=60, anchor='w') 
             
         self.table.bind('<<TreeviewSelect>>', self.on_item_select) 
+        self.table.bind('<Button-3>', self.show_table_menu)
         
         self.detail_frame = ttk.LabelFrame(right_panel, text="Detaylar", padding="15", bootstyle="secondary") 
         self.detail_frame.grid(row=2, column=0, sticky='ew', pady=(10, 0)) # row=2
@@ -123,29 +195,43 @@ class MainWindow(tk.Tk):
         self.config(menu=self.menubar)
         self.file_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="📁 Dosya", menu=self.file_menu)
-        self.file_menu.add_command(label="📊 Dışa Aktar (Excel)", command=self.export_data, accelerator="Ctrl+E")
+        self.file_menu.add_command(label="📊 Dışa Aktar (Excel/CSV)", command=self.export_data, accelerator="Ctrl+E")
+        self.file_menu.add_command(label="📥 İçe Aktar (Excel/CSV)", command=self.import_data)
+        self.file_menu.add_command(label="🔍 Benzer Kayıt Raporu", command=self.duplicate_report)
+        self.file_menu.add_command(label="📈 Yaşam Döngüsü Raporları", command=lambda: ReportDialog(self))
+        self.file_menu.add_command(label="💾 Yedekler", command=lambda: BackupDialog(self))
+        self.file_menu.add_command(label="📋 Sayım", command=lambda: StocktakeDialog(self))
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="🚪 Çıkış", command=self.quit, accelerator="Alt+F4")
+        self.file_menu.add_command(label="🚪 Çıkış", command=self.master.destroy, accelerator="Alt+F4")
         self.edit_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="✏️ Düzen", menu=self.edit_menu)
         self.edit_menu.add_command(label="➕ Yeni Ekle", command=self.show_add_dialog, accelerator="Ctrl+N")
         self.edit_menu.add_command(label="📝 Düzenle", command=self.show_edit_dialog, accelerator="Ctrl+E")
         self.edit_menu.add_separator()
+        self.bulk_menu = tk.Menu(self.edit_menu, tearoff=0)
+        self.edit_menu.add_cascade(label="📦 Seçilenlere Toplu İşlem", menu=self.bulk_menu)
+        for field, label in BULK_ACTIONS.items():
+            self.bulk_menu.add_command(label=label, command=lambda _field=field: self.bulk_update(_field))
         self.edit_menu.add_command(label="🗑️ Sil", command=self.delete_item, accelerator="Delete")
+        self.edit_menu.add_separator()
+        self.edit_menu.add_command(label="🗄️ Hurdaları Arşivle...", command=self.archive_scrapped)
         
         self.view_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="👁️ Görünüm", menu=self.view_menu)
         self.view_menu.add_command(label="🔄 Yenile", command=self.reset_filters_and_refresh, accelerator="F5")
+        self.view_menu.add_checkbutton(label="🗄️ Arşivi Dahil Et", variable=self.show_archive, command=self.refresh_table)
 
         self.help_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="❓ Yardım", menu=self.help_menu)
         self.help_menu.add_command(label="📖 Kullanım Kılavuzu", command=self.show_help)
+        self.help_menu.add_command(label="🩺 Tanılama", command=lambda: DiagnosticsWindow(self))
         self.help_menu.add_command(label="ℹ️ Hakkında", command=self.show_about)
         
         self.bind_all("<Control-n>", lambda e: self.show_add_dialog())
         self.bind_all("<Control-e>", lambda e: self.show_edit_dialog())
-        self.bind_all("<Delete>", lambda e: self.delete_item())
+        self.bind_all("<Delete>", lambda e: None if isinstance(e.widget, (tk.Entry, tk.Text)) else self.delete_item()) # Yazı alanlarında karakter siler
         self.bind_all("<F5>", lambda e: self.reset_filters_and_refresh())
+        self.bind_all("<Control-f>", lambda e: self.search_entry.focus_set())
         
     def show_help(self):
         """Kullanım kılavuzu hakkında bir bilgi kutusu gösterir."""
@@ -156,7 +242,9 @@ class MainWindow(tk.Tk):
         📝 Düzenle (Ctrl+E): Seçili öğeyi düzenler.
         🗑️ Sil (Delete): Seçili öğeyi/öğeleri siler.  
         🔄 Yenile (F5 / Buton): Filtreleri ve sıralamayı sıfırlar.
-        📊 Dışa Aktar: Görünen listeyi Excel'e aktarır.
+        🔍 Ara (Ctrl+F): Yazdıkça ad, model, marka, seri no, zimmet, konum ve notlarda arar.
+        📊 Dışa Aktar: Görünen listeyi (arama ve sıralamasıyla) Excel'e veya CSV'ye aktarır.
+        📥 İçe Aktar (Dosya menüsü): Excel/CSV listesinden toplu kayıt ekler.
         🖱️ Sıralama: Tablo başlıklarına tıklayarak sıralama yapılır.
         """
         messagebox.showinfo("Kullanım Kılavuzu", help_text)
@@ -166,6 +254,11 @@ class MainWindow(tk.Tk):
         about_text = "📦 IT Envanter Yönetim Sistemi v1.0\n© 2025"
         messagebox.showinfo("Hakkında", about_text)
     
+    def on_first_paint(self):
+        """Ana pencere ilk kez çizildikten sonra başlangıç süre raporunu kaydeder."""
+        startup.mark('main_first_paint')
+        startup.write_report()
+
     def setup_styles(self):
         """Uygulamada kullanılacak ek ttk widget stillerini tanımlar."""
         style = self.style 
@@ -183,183 +276,406 @@ class MainWindow(tk.Tk):
     def reset_filters_and_refresh(self):
         """Toolbar'daki Yenile butonu için: Sıralamayı sıfırlar ve tabloyu yeniler."""
         self.sort_column = None; self.sort_reverse = False
+        self.search_var.set(''); self.cancel_search(); self.active_search = ''; self.facet_filters = {}; self.show_archive.set(False)
         for c in self.table['columns']: 
             self.table.heading(c, text=c) 
         self.refresh_table() 
         
+    @diagnostics.timed('ui')
     def sort_table(self, col):
-        """Tabloyu sütuna göre doğal sıralar."""
-        def natural_sort_key(s_tuple):
-            s = s_tuple[0] 
-            if s is None or s == "": return (float('inf') if not reverse_order else float('-inf'),)
-            s_lower = str(s).lower()
-            parts = [int(p) if p.isdigit() else p for p in re.split(r'([0-9]+)', s_lower) if p]
-            return tuple(parts)
-
+        """Tabloyu sütuna göre doğal sıralar (saklanan sıralama anahtarı üzerinden tek indeksli sorgu)."""
         if self.sort_column == col: self.sort_reverse = not self.sort_reverse
         else: self.sort_column = col; self.sort_reverse = False
-        reverse_order = self.sort_reverse
 
-        try: items_to_sort = [(self.table.set(k, col), k) for k in self.table.get_children('')]
-        except tk.TclError:
-            try:
-                col_idx = self.table['columns'].index(col)
-                items_to_sort = [(self.table.set(k, f"#{col_idx + 1}"), k) for k in self.table.get_children('')]
-            except Exception as e: print(f"Sıralama hatası ({col}): {e}"); return
-        
-        items_to_sort.sort(key=natural_sort_key, reverse=reverse_order)
-        for idx, (val, k) in enumerate(items_to_sort): self.table.move(k, '', idx)
-
-        arrow = ' ↓' if reverse_order else ' ↑'
+        arrow = ' ↓' if self.sort_reverse else ' ↑'
         for c in self.table['columns']:
             text = c + arrow if c == col else c
             self.table.heading(c, text=text)
+        self.refresh_table()
     
+    def on_search_change(self, *args):
+        """Arama kutusu değiştikçe bekleyen aramayı iptal eder ve yenisini kısa bir gecikmeyle planlar."""
+        self.cancel_search()
+        self.search_job = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def cancel_search(self):
+        """Henüz çalışmamış (debounce bekleyen) aramayı iptal eder."""
+        if self.search_job: self.after_cancel(self.search_job); self.search_job = None
+
+    def run_search(self):
+        """Arama metnini tabloya uygular; yalnızca eşleşen ilk sayfa yüklenir."""
+        self.search_job = None
+        search = self.search_var.get().strip()
+        if search == self.active_search: return
+        self.active_search = search
+        self.refresh_table()
+
+    @diagnostics.timed('ui')
     def refresh_table(self):
-        """Veritabanından verileri (filtresiz) çeker ve tabloyu yeniler."""
+        """Tabloyu boşaltır ve sıralamaya göre ilk sayfayı yükler; kalan satırlar kaydırdıkça gelir."""
+        self.pending_selection = self.table.selection()
         self.table.delete(*self.table.get_children()) 
-        cursor = self.db_conn.cursor()
-        params = [] 
+        self.page_key = None; self.loaded_keys = []
+        self.refresh_started = time.perf_counter() # İlk sayfanın görünmesine kadar geçen süre (tanılama)
+        # Başlangıç sürümü sayfadan önce okunur (iş kuyruğu sıralıdır); arada gelen değişiklikler tekrar uygulanır
+        self.change_version = None
+        self.db_worker.submit(get_change_version, callback=lambda v: setattr(self, 'change_version', v), channel='changes')
+        self.load_next_page(first=True)
+        self.update_statistics() 
+        self.update_facets()
 
-        query = "SELECT id, assigned_to, name, category, model, brand, serial_number, purchase_date, status, location FROM inventory_items"
-        
-        col_map = {'Zimmet Sahibi': 'assigned_to', 'Ad': 'name', 'Kategori': 'category', 'Model': 'model', 'Marka': 'brand', 'Seri No': 'serial_number', 'Alım Tarihi': 'purchase_date', 'Durum': 'status', 'Konum': 'location'}
-        db_sort = col_map.get(self.sort_column) 
-        order = "DESC" if self.sort_reverse else "ASC"
-        query += f" ORDER BY {db_sort or 'name'} {order}" 
-        
-        try:
-            cursor.execute(query, params) 
-            items = cursor.fetchall()
-            for item in items: self.table.insert('', 'end', iid=item[0], values=item[1:])
-        except sqlite3.Error as e: print(f"DB Hata: {e}"); messagebox.showerror("Hata", f"Veri çekilemedi: {e}")
+    def load_next_page(self, first=False):
+        """Keyset sayfalama ile bir sonraki sayfayı arka planda ister; yeniden sıralama eski isteği iptal eder."""
+        if (self.loading_page and not first) or (self.page_key is None and not first): return
+        self.loading_page = True
+        db_sort = COLUMN_MAP.get(self.sort_column, 'name')
+        self.db_worker.submit(get_cached_page, db_sort, self.sort_reverse, self.page_key, search=self.active_search, filters=dict(self.facet_filters),
+                              archive=self.show_archive.get(), callback=self.on_page_loaded, error=self.on_page_error, channel='page')
 
-        self.update_statistics() 
-        
-        if self.sort_column:
-            current_rev = self.sort_reverse
-            self.sort_reverse = not current_rev 
-            self.sort_table(self.sort_column) 
-            self.sort_reverse = current_rev 
+    @diagnostics.timed('ui')
+    def on_page_loaded(self, result):
+        """Gelen sayfayı tablonun sonuna ekler; yenilemeden önce seçili olan satırları yeniden seçer."""
+        items, self.page_key = result
+        self.loading_page = False
+        if self.refresh_started is not None and diagnostics.is_enabled():
+            diagnostics.record('ui', "refresh_table → ilk sayfa", time.time(), (time.perf_counter() - self.refresh_started) * 1000, len(items))
+        self.refresh_started = None
+        for item in items:
+            self.table.insert('', 'end', iid=item[0], values=item[1:]); self.loaded_keys.append(self.row_sort_key(item))
+        if self.pending_selection: # Seçili satırlar yeni görünümde de yüklüyse seçimi koru
+            kept = [i for i in self.pending_selection if self.table.exists(i)]
+            if kept: self.table.selection_set(kept)
+            self.pending_selection = ()
+
+    def on_page_error(self, e):
+        """Sayfa yüklenemediğinde kaydırmayla yeniden denenmesini engeller ve hatayı gösterir."""
+        self.loading_page = False; self.page_key = None
+        print(f"DB Hata: {e}"); messagebox.showerror("Hata", f"Veri çekilemedi: {e}")
+
+    def row_sort_key(self, row):
+        """Tablo satırının geçerli sıralamadaki anahtarını döndürür."""
+        db_sort = COLUMN_MAP.get(self.sort_column, 'name')
+        return inventory_sort_key(row[TABLE_COLUMNS.index(db_sort)], row[0], self.sort_reverse)
+
+    def upsert_table_row(self, row, visible=True):
+        """Satırı tabloda sıralı konumuna yerleştirir; yüklenmemiş bir bölgeye düşüyorsa sonraki sayfalara bırakır."""
+        self.remove_table_row(row[0])
+        if not visible: return False # Geçerli aramayla eşleşmiyor
+        key = self.row_sort_key(row)
+        pos = bisect.bisect_left(self.loaded_keys, key)
+        if pos == len(self.loaded_keys) and self.page_key is not None: return False # Keyset devamı bu satırı getirecek
+        self.loaded_keys.insert(pos, key)
+        self.table.insert('', pos, iid=row[0], values=row[1:])
+        return True
+
+    def remove_table_row(self, iid):
+        """Satırı (yüklüyse) tablodan ve anahtar listesinden çıkarır."""
+        if not self.table.exists(iid): return
+        del self.loaded_keys[self.table.index(iid)]
+        self.table.delete(iid)
+
+    def scheduled_backup(self):
+        """Son anlık görüntü BACKUP_INTERVAL_HOURS'tan eskiyse arka planda çevrimiçi yedek alır; saatte bir kontrol edilir."""
+        def run():
+            try:
+                if backup_due(self.db_path): print(f"Yedek alındı: {backup_database(self.db_path).summary()}")
+            except Exception as e: print(f"Zamanlanmış yedek alınamadı: {e}")
+        threading.Thread(target=run, name='Backup', daemon=True).start()
+        self.after(BACKUP_CHECK_MS, self.scheduled_backup)
+
+    def scheduled_archive(self):
+        """ARCHIVE_AFTER_DAYS günden uzun süredir hurda olan öğeleri arka planda arşive taşır; saatte bir kontrol edilir.
+
+        Taşınan öğeler değişiklik günlüğünde silme olarak görünür; tablolar (bu ve diğer istemcilerde) oradan güncellenir.
+        """
+        def run():
+            conn = connect(self.db_path)
+            try:
+                moved = archive_items(conn, author=self.author)
+                if moved: print(f"{moved} hurda öğe arşive taşındı.")
+            except Exception as e: print(f"Arşivleme yapılamadı: {e}")
+            finally: conn.close()
+        threading.Thread(target=run, name='Archive', daemon=True).start()
+        self.after(ARCHIVE_CHECK_MS, self.scheduled_archive)
+
+    def poll_changes(self):
+        """Diğer istemcilerin değişikliklerini düzenli olarak ister (yalnızca son sürümden sonrakileri)."""
+        if self.change_version is not None:
+            self.db_worker.submit(_fetch_changes, self.change_version, self.active_search, dict(self.facet_filters), self.show_archive.get(), callback=self.apply_changes,
+                                  error=lambda e: print(f"Değişiklikler alınamadı: {e}"), channel='changes')
+        self.after(CHANGE_POLL_MS, self.poll_changes)
+
+    @diagnostics.timed('ui')
+    def apply_changes(self, result):
+        """Gelen değişiklikleri tabloya yerinde uygular; günlük sıkıştırılmış veya çok büyükse tabloyu yeniler."""
+        version, deltas = result
+        if version is None: self.refresh_table(); return
+        self.change_version = version
+        if not deltas: return
+        selection = self.table.selection()
+        for item_id, row, visible in deltas:
+            if row is None: self.remove_table_row(item_id)
+            else: self.upsert_table_row(row, visible)
+        kept = [i for i in selection if self.table.exists(i)]
+        if kept != list(selection): self.table.selection_set(kept)
+        if self.selected_item and any(d[0] == self.selected_item[0] for d in deltas): self.on_item_select(None) # Detayı tazele
+        self.update_statistics(); self.update_facets()
+
+    def poll_db_worker(self):
+        """Veritabanı iş parçacığında biten isteklerin sonuçlarını UI iş parçacığında işler."""
+        self.db_worker.process_results()
+        self.after(DB_POLL_MS, self.poll_db_worker)
+
+    def on_db_error(self, e):
+        """Kendi hata işleyicisi olmayan arka plan isteklerinin hatalarını gösterir."""
+        print(f"DB Hata: {e}"); messagebox.showerror("Hata", f"Veritabanı hatası: {e}")
+
+    def destroy(self):
+        """Pencere kapanırken veritabanı iş parçacığını da durdurur."""
+        self.db_worker.stop()
+        super().destroy()
+
+    def on_table_scroll(self, first, last):
+        """Kaydırma çubuğunu günceller; listenin sonuna yaklaşıldığında sonraki sayfayı yükler."""
+        self.y_scrollbar.set(first, last)
+        if self.page_key is not None and not self.loading_page and float(last) > 0.9: self.load_next_page()
 
     def update_statistics(self):
-        """Sol paneldeki istatistikleri günceller."""
-        try:
-            cursor = self.db_conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM inventory_items")
-            total_row = cursor.fetchone(); total_count = total_row[0] if total_row else 0 
-            self.stats_labels['total'].config(text=f"Toplam: {total_count}")
-            
-            counts = {'Aktif Kullanımda': 0, 'Serviste': 0, 'Depoda': 0, 'Arızalı': 0, 'Hurda': 0}
-            cursor.execute("SELECT status, COUNT(*) FROM inventory_items GROUP BY status")
-            for status, count in cursor.fetchall():
-                if status in counts: counts[status] = count
-                elif status == 'Aktif': counts['Aktif Kullanımda'] += count
-            
-            self.stats_labels['active'].config(text=f"Aktif: {counts.get('Aktif Kullanımda', 0)}")
-            self.stats_labels['service'].config(text=f"Serviste: {counts.get('Serviste', 0)}")
-            self.stats_labels['storage'].config(text=f"Depoda: {counts.get('Depoda', 0)}")
-            self.stats_labels['faulty'].config(text=f"Arızalı: {counts.get('Arızalı', 0)}")
-            self.stats_labels['scrap'].config(text=f"Hurda: {counts.get('Hurda', 0)}")
-        except sqlite3.Error as e: 
-            print(f"İstatistik hatası: {e}")
+        """İstatistik sayaçlarını arka planda özet tablodan okur ve sol paneli günceller."""
+        def on_counts(counts): self.status_counts = counts; self.render_statistics()
+        self.db_worker.submit(get_status_counts, self.show_archive.get(), callback=on_counts, error=lambda e: print(f"İstatistik hatası: {e}"), channel='stats')
+
+    def adjust_statistics(self, removed=(), added=()):
+        """Değişen satırların durum farklarını bellekteki sayaçlara uygular (yeniden saymadan)."""
+        for status in map(normalize_status, removed): self.status_counts[status] = self.status_counts.get(status, 0) - 1
+        for status in map(normalize_status, added): self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.render_statistics(); self.update_facets()
+
+    def render_statistics(self):
+        """Bellekteki durum sayaçlarını sol paneldeki etiketlere yazar."""
+        total_count = sum(self.status_counts.values())
+        self.stats_labels['total'].config(text=f"Toplam: {total_count}")
+        counts = self.status_counts # Eski 'Aktif' değeri geçişte 'Aktif Kullanımda'ya çevrildi
+        self.stats_labels['active'].config(text=f"Aktif: {counts.get('Aktif Kullanımda', 0)}")
+        self.stats_labels['service'].config(text=f"Serviste: {counts.get('Serviste', 0)}")
+        self.stats_labels['storage'].config(text=f"Depoda: {counts.get('Depoda', 0)}")
+        self.stats_labels['faulty'].config(text=f"Arızalı: {counts.get('Arızalı', 0)}")
+        self.stats_labels['scrap'].config(text=f"Hurda: {counts.get('Hurda', 0)}")
     
+    def update_facets(self):
+        """Filtre sayılarını (diğer seçimlere ve aramaya göre) arka planda ister."""
+        self.db_worker.submit(get_facet_counts, dict(self.facet_filters), self.active_search, self.show_archive.get(), callback=self.render_facets,
+                              error=lambda e: print(f"Filtre sayıları alınamadı: {e}"), channel='facets')
+
+    @diagnostics.timed('ui')
+    def render_facets(self, counts):
+        """Her filtre listesini en kalabalık değerlerle doldurur; seçili değer işaretlenir ve başta gösterilir."""
+        for col, tree in self.facet_trees.items():
+            tree.delete(*tree.get_children())
+            selected = self.facet_filters.get(col)
+            values = sorted(counts.get(col, {}).items(), key=lambda vc: (vc[0] != selected, -vc[1], vc[0]))[:FACET_LIMIT]
+            for value, count in values:
+                text = ('✔ ' if value == selected else '') + (value or "(Boş)")
+                tree.insert('', 'end', iid=f'v:{value}', values=(text, count))
+
+    def on_facet_click(self, col, event):
+        """Tıklanan değeri filtre olarak uygular; seçili değere yeniden tıklamak filtreyi kaldırır."""
+        iid = self.facet_trees[col].identify_row(event.y)
+        if not iid: return
+        value = iid[2:]
+        if self.facet_filters.get(col) == value: del self.facet_filters[col]
+        else: self.facet_filters[col] = value
+        self.refresh_table()
+
+    def clear_facets(self):
+        """Tüm filtreleri kaldırır."""
+        if self.facet_filters: self.facet_filters = {}; self.refresh_table()
+
+    @diagnostics.timed('ui')
     def on_item_select(self, event):
-        """Tabloda öğe seçildiğinde detay panelini günceller."""
+        """Tabloda öğe seçildiğinde detayı arka planda ister; yeni bir tıklama eski isteği iptal eder."""
         selection = self.table.selection()
         for widget in self.detail_frame.winfo_children(): widget.destroy()
-        if not selection: self.selected_item = None; return 
-        try:
-            item_id = selection[0] 
-            cursor = self.db_conn.cursor()
-            cursor.execute('''SELECT id, name, category, model, brand, serial_number, purchase_date, status, location, notes, assigned_to FROM inventory_items WHERE id = ?''', (item_id,))
-            self.selected_item = cursor.fetchone() 
-            if not self.selected_item: return 
-            
-            cols = ['id', 'name', 'category', 'model', 'brand', 'serial_number', 'purchase_date', 'status', 'location', 'notes', 'assigned_to']
-            item_dict = dict(zip(cols, self.selected_item))
-            d_map = [("Zimmet Sahibi:", 'assigned_to'), ("Ad:", 'name'), ("Kategori:", 'category'), ("Model:", 'model'), ("Marka:", 'brand'), ("Seri No:", 'serial_number'), ("Alım Tarihi:", 'purchase_date'), ("Durum:", 'status'), ("Konum:", 'location'), ("Notlar:", 'notes')]
-            
-            for i, (lbl, key) in enumerate(d_map):
-                val = item_dict.get(key)
-                ttk.Label(self.detail_frame, text=lbl, style='primary.TLabel').grid(row=i, column=0, sticky='ne', padx=5, pady=1) 
-                val_lbl = ttk.Label(self.detail_frame, text=str(val or ""), anchor='w', wraplength=350) 
-                val_lbl.grid(row=i, column=1, sticky='nw', padx=5, pady=1) 
-        except Exception as e: print(f"HATA - Seçim: {e}"); messagebox.showerror("Hata", f"Detay alınamadı: {e}"); self.selected_item = None
+        self.selected_item = None
+        if not selection: self.db_worker.cancel('detail'); return 
+        self.db_worker.submit(get_cached_item, selection[0], callback=self.show_details, error=self.on_detail_error, channel='detail')
+
+    @diagnostics.timed('ui')
+    def show_details(self, item):
+        """Gelen öğe bilgisini detay panelinde gösterir."""
+        self.selected_item = item
+        if not self.selected_item: return 
+        cols = ['id', 'name', 'category', 'model', 'brand', 'serial_number', 'purchase_date', 'status', 'location', 'notes', 'assigned_to']
+        item_dict = dict(zip(cols, self.selected_item))
+        d_map = [("Zimmet Sahibi:", 'assigned_to'), ("Ad:", 'name'), ("Kategori:", 'category'), ("Model:", 'model'), ("Marka:", 'brand'), ("Seri No:", 'serial_number'), ("Alım Tarihi:", 'purchase_date'), ("Durum:", 'status'), ("Konum:", 'location'), ("Notlar:", 'notes')]
+        
+        for i, (lbl, key) in enumerate(d_map):
+            val = item_dict.get(key)
+            ttk.Label(self.detail_frame, text=lbl, style='primary.TLabel').grid(row=i, column=0, sticky='ne', padx=5, pady=1) 
+            val_lbl = ttk.Label(self.detail_frame, text=str(val or ""), anchor='w', wraplength=350) 
+            val_lbl.grid(row=i, column=1, sticky='nw', padx=5, pady=1) 
+
+    def on_detail_error(self, e):
+        """Detay alınamadığında hatayı gösterir."""
+        print(f"HATA - Seçim: {e}"); messagebox.showerror("Hata", f"Detay alınamadı: {e}"); self.selected_item = None
     
     def show_add_dialog(self):
-        """'Yeni Ekle' penceresini açar."""
+        """'Yeni Ekle' penceresini açar; kayıt arka planda yapılır ve tablo yerinde güncellenir."""
         dialog = AddItemDialog(self) 
         self.wait_window(dialog)
         if dialog.result: 
             if not dialog.result.get('name') or not dialog.result.get('category'): messagebox.showerror("Hata", "Ad ve Kategori zorunludur!"); return
-            cursor = self.db_conn.cursor()
-            try:
-                sql = '''INSERT INTO inventory_items (name, category, model, brand, serial_number, purchase_date, status, location, notes, assigned_to) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
-                vals = (dialog.result['name'], dialog.result['category'], dialog.result.get('model', ''), dialog.result.get('brand', ''), dialog.result.get('serial_number', ''), dialog.result['purchase_date'], dialog.result.get('status', 'Aktif Kullanımda'), dialog.result.get('location', ''), dialog.result.get('notes', ''), dialog.result.get('assigned_to', ''))
-                cursor.execute(sql, vals)
-                self.db_conn.commit(); self.reset_filters_and_refresh(); messagebox.showinfo("Başarılı", "Öğe eklendi!")
-            except sqlite3.IntegrityError: messagebox.showerror("Hata", "Seri numarası zaten mevcut!")
-            except Exception as e: messagebox.showerror("Hata", f"Kayıt hatası: {e}")
+            def on_added(result):
+                row, visible = result
+                self.adjust_statistics(added=[row[TABLE_COLUMNS.index('status')]])
+                if self.upsert_table_row(row, visible): self.table.selection_set(row[0]); self.table.see(row[0])
+                messagebox.showinfo("Başarılı", "Öğe eklendi!")
+            def on_error(e):
+                if isinstance(e, sqlite3.IntegrityError): messagebox.showerror("Hata", "Seri numarası zaten mevcut!")
+                else: messagebox.showerror("Hata", f"Kayıt hatası: {e}")
+            self.db_worker.submit(lambda conn, data, search, filters, archive: _fetch_view_row(conn, add_inventory_item(conn, data, self.author), search, filters, archive),
+                                  dialog.result, self.active_search, dict(self.facet_filters), self.show_archive.get(), callback=on_added, error=on_error)
         
     def show_edit_dialog(self):
-        """'Düzenle' penceresini açar."""
+        """'Düzenle' penceresini açar; güncelleme arka planda yapılır ve satır yerinde güncellenir."""
         if not self.selected_item: messagebox.showwarning("Uyarı", "Önce bir öğe seçin!"); return
         dialog = EditItemDialog(self, self.selected_item) 
         self.wait_window(dialog)
         if dialog.result:
-            cursor = self.db_conn.cursor()
-            try:
-                sql = '''UPDATE inventory_items SET name=?, category=?, model=?, brand=?, serial_number=?, purchase_date=?, status=?, location=?, notes=?, assigned_to=? WHERE id=?'''
-                vals = (dialog.result['name'], dialog.result['category'], dialog.result['model'], dialog.result['brand'], dialog.result['serial_number'], dialog.result['purchase_date'], dialog.result['status'], dialog.result['location'], dialog.result['notes'], dialog.result['assigned_to'], self.selected_item[0])
-                cursor.execute(sql, vals)
-                self.db_conn.commit(); self.reset_filters_and_refresh(); messagebox.showinfo("Başarılı", "Öğe güncellendi!")
-            except sqlite3.IntegrityError: messagebox.showerror("Hata", "Seri numarası zaten mevcut!")
-            except Exception as e: messagebox.showerror("Hata", f"Güncelleme hatası: {e}")
+            item_id, old_status = self.selected_item[0], self.selected_item[7] or ''
+            def on_updated(result):
+                row, visible = result
+                self.adjust_statistics(removed=[old_status], added=[row[TABLE_COLUMNS.index('status')]])
+                if self.upsert_table_row(row, visible): self.table.selection_set(item_id)
+                else: self.selected_item = None; [w.destroy() for w in self.detail_frame.winfo_children()]
+                messagebox.showinfo("Başarılı", "Öğe güncellendi!")
+            def on_error(e):
+                if isinstance(e, sqlite3.IntegrityError): messagebox.showerror("Hata", "Seri numarası zaten mevcut!")
+                else: messagebox.showerror("Hata", f"Güncelleme hatası: {e}")
+            def update(conn, data, search, filters, archive):
+                update_inventory_item(conn, item_id, data, self.author) # Arşivdeki öğe önce geri alınır
+                return _fetch_view_row(conn, item_id, search, filters, archive)
+            self.db_worker.submit(update, dialog.result, self.active_search, dict(self.facet_filters), self.show_archive.get(), callback=on_updated, error=on_error)
     
     def delete_item(self):
-        """Seçili öğeleri siler."""
+        """Seçili öğeleri arka planda siler; tablo ve istatistikler yerinde güncellenir."""
         ids = self.table.selection() 
         if not ids: messagebox.showwarning("Uyarı", "Silinecek öğe(ler) seçin!"); return
         try:
-            names = [f"'{self.table.item(i)['values'][1]}'" for n, i in enumerate(ids) if n < 5] 
+            cached = {i: inventory_cache.peek(i) for i in ids} # Önbellekte yoksa tablodaki değerler kullanılır
+            names = [f"'{cached[i].name if cached[i] else self.table.set(i, 'Ad')}'" for i in ids[:5]] 
             if len(ids) > 5: names.append("...")
             msg = f"{len(ids)} öğeyi silmek istediğinizden emin misiniz?\n({', '.join(names)})"
             if messagebox.askyesno("Onay", msg):
-                cursor, deleted, errors = self.db_conn.cursor(), 0, []
-                try:
-                    for i in ids: cursor.execute('DELETE FROM inventory_items WHERE id = ?', (i,)); deleted += cursor.rowcount
-                    self.db_conn.commit()
-                except Exception as e: self.db_conn.rollback(); errors.append(f"DB Hata: {e}")
-                finally:
-                    self.selected_item = None; [w.destroy() for w in self.detail_frame.winfo_children()]
-                    self.reset_filters_and_refresh() 
-                    if not errors and deleted > 0: messagebox.showinfo("Başarılı", f"{deleted} öğe silindi!")
-                    elif errors: messagebox.showerror("Hata", f"Hatalar:\n{chr(10).join(errors)}")
-                    elif deleted == 0: messagebox.showwarning("Bilgi", "Öğeler bulunamadı.")
+                statuses = [(cached[i].status or '') if cached[i] else self.table.set(i, 'Durum') for i in ids]
+                def on_deleted(deleted):
+                    for i in ids: self.remove_table_row(i)
+                    self.adjust_statistics(removed=statuses)
+                    if deleted > 0: messagebox.showinfo("Başarılı", f"{deleted} öğe silindi!")
+                    else: messagebox.showwarning("Bilgi", "Öğeler bulunamadı.")
+                self.selected_item = None; [w.destroy() for w in self.detail_frame.winfo_children()]
+                self.db_worker.submit(delete_inventory_items, ids, self.author, callback=on_deleted,
+                                      error=lambda e: messagebox.showerror("Hata", f"Hatalar:\nDB Hata: {e}"))
         except Exception as e: messagebox.showerror("Hata", f"Silme hatası: {e}")
             
+    def show_table_menu(self, event):
+        """Sağ tıklamada toplu işlem menüsünü açar; tıklanan satır seçili değilse yalnız onu seçer."""
+        row = self.table.identify_row(event.y)
+        if row and row not in self.table.selection(): self.table.selection_set(row)
+        if self.table.selection(): self.bulk_menu.tk_popup(event.x_root, event.y_root)
+
+    def bulk_update(self, field):
+        """Seçili öğelerin durum/konum/zimmet alanını tek onayla, tek işlemde değiştirir; tablo yerinde güncellenir."""
+        ids = self.table.selection()
+        if not ids: messagebox.showwarning("Uyarı", "Önce öğe(ler) seçin!"); return
+        dialog = BulkEditDialog(self, field, len(ids))
+        self.wait_window(dialog)
+        if dialog.result is None: return
+        old_statuses = [self.table.set(i, 'Durum') for i in ids] if field == 'status' else []
+        def on_updated(result):
+            rows, visible = result
+            for row in rows: self.upsert_table_row(row, row[0] in visible)
+            kept = [i for i in ids if self.table.exists(i)]
+            if kept: self.table.selection_set(kept)
+            if field == 'status': self.adjust_statistics(removed=old_statuses, added=[r[TABLE_COLUMNS.index('status')] for r in rows])
+            else: self.update_facets()
+            messagebox.showinfo("Başarılı", f"{len(rows)} öğe güncellendi!")
+        self.db_worker.submit(_bulk_update, ids, field, dialog.result, self.author, self.active_search, dict(self.facet_filters), self.show_archive.get(),
+                              callback=on_updated, error=lambda e: messagebox.showerror("Hata", f"Toplu güncelleme hatası: {e}"))
+
     def export_data(self):
-        """Görünen tabloyu (filtresiz/sıralı) Excel'e aktarır."""
-        try:
-            import pandas as pd
-            cols = self.table['columns']; col_map = {'Zimmet Sahibi': 'assigned_to', 'Ad': 'name', 'Kategori': 'category', 'Model': 'model', 'Marka': 'brand', 'Seri No': 'serial_number', 'Alım Tarihi': 'purchase_date', 'Durum': 'status', 'Konum': 'location', 'Notlar':'notes'} 
-            db_cols = [col_map.get(c) for c in cols if col_map.get(c)] 
-            params = []
+        """Görünen tabloyu (geçerli arama ve sıralamayla) arka planda Excel'e veya CSV'ye aktarır."""
+        fname = filedialog.asksaveasfilename(parent=self, title="Dışa Aktar", defaultextension='.xlsx',
+                                             initialfile=f'envanter_raporu_{datetime.datetime.now():%Y%m%d_%H%M%S}.xlsx',
+                                             filetypes=[("Excel Dosyası", "*.xlsx"), ("CSV Dosyası", "*.csv")])
+        if not fname: return
+        db_sort = COLUMN_MAP.get(self.sort_column, 'name')
+        ExportDialog(self, fname, list(self.table['columns']), db_sort, self.sort_reverse, self.active_search, dict(self.facet_filters), self.show_archive.get())
 
-            query = f"SELECT {', '.join(db_cols)} FROM inventory_items"
-            
-            db_sort = col_map.get(self.sort_column)
-            order = "DESC" if self.sort_reverse else "ASC"
-            query += f" ORDER BY {db_sort or 'name'} {order}"
-            
-            df = pd.read_sql_query(query, self.db_conn, params=params) 
-            df.columns = [c for c in cols if col_map.get(c)] 
-            fname = f'envanter_raporu_{datetime.datetime.now():%Y%m%d_%H%M%S}.xlsx'
-            df.to_excel(fname, index=False, sheet_name='Envanter')
-            messagebox.showinfo("Başarılı", f"Veriler '{fname}' dosyasına aktarıldı!")
-        except ImportError: messagebox.showerror("Hata", "Pandas gerekli!\n'pip install pandas'")
-        except Exception as e: messagebox.showerror("Hata", f"Export hatası: {str(e)}")
+    def import_data(self):
+        """Excel/CSV dosyasından toplu içe aktarım penceresini açar."""
+        fname = filedialog.askopenfilename(parent=self, title="İçe Aktar",
+                                           filetypes=[("Excel/CSV Dosyası", "*.xlsx *.csv"), ("Tüm Dosyalar", "*.*")])
+        if fname: ImportDialog(self, fname)
+
+    def duplicate_report(self):
+        """Seri no veya (seri nosuz) ad+model olarak birbirine benzeyen kayıtları arka planda CSV raporuna yazar."""
+        fname = filedialog.asksaveasfilename(parent=self, title="Benzer Kayıt Raporu", defaultextension='.csv',
+                                             initialfile=f'benzer_kayitlar_{datetime.datetime.now():%Y%m%d_%H%M%S}.csv', filetypes=[("CSV Dosyası", "*.csv")])
+        if not fname: return
+        self.configure(cursor='watch')
+        def on_done(count):
+            self.configure(cursor='')
+            messagebox.showinfo("Benzer Kayıt Raporu", f"{count} benzer kayıt grubu bulundu." + (f"\nRapor: {fname}" if count else ""), parent=self)
+        def on_error(e): self.configure(cursor=''); messagebox.showerror("Hata", f"Rapor oluşturulamadı: {e}", parent=self)
+        self.db_worker.submit(_write_duplicate_report, fname, callback=on_done, error=on_error)
+
+    def archive_scrapped(self):
+        """Arşivlenmeyi bekleyen hurda öğeleri onayla hemen arşive taşır (zamanlanmış işi beklemeden)."""
+        def on_count(count):
+            if not count: messagebox.showinfo("Arşiv", f"{ARCHIVE_AFTER_DAYS} günden uzun süredir hurda olan öğe yok.", parent=self); return
+            if not messagebox.askyesno("Onay", f"{ARCHIVE_AFTER_DAYS} günden uzun süredir hurda olan {count} öğe arşive taşınacak.\nDevam edilsin mi?", parent=self): return
+            self.configure(cursor='watch')
+            def on_done(moved): self.configure(cursor=''); self.refresh_table(); messagebox.showinfo("Başarılı", f"{moved} öğe arşive taşındı.", parent=self)
+            def on_error(e): self.configure(cursor=''); messagebox.showerror("Hata", f"Arşivleme hatası: {e}", parent=self)
+            self.db_worker.submit(archive_items, author=self.author, callback=on_done, error=on_error)
+        self.db_worker.submit(count_archivable, callback=on_count)
+
+def _write_duplicate_report(conn, path):
+    """(DB iş parçacığı) Tüm tablodaki benzer kayıt gruplarını bulup CSV'ye yazar, grup sayısını döndürür."""
+    return write_duplicate_report(path, find_duplicate_groups(conn))
+
+def _record_serial_file(conn, session_id, path, location, author):
+    """(DB iş parçacığı) Dosyadaki seri numaralarını sayım oturumuna kaydeder, kaydedilen sayıyı döndürür."""
+    return record_scans(conn, session_id, read_serials(path), location, author)
+
+def _fetch_view_row(conn, item_id, search, filters=None, archive=False):
+    """(DB iş parçacığı) Değişen satırı ve geçerli arama/filtrelerle eşleşip eşleşmediğini döndürür.
+
+    Arşiv görünümde değilse arşive taşınmış öğe silinmiş gibi (satır None) döner.
+    """
+    return get_inventory_row(conn, item_id, archive), (not (search or filters) or inventory_matches(conn, item_id, search, filters, archive))
+
+def _bulk_update(conn, ids, field, value, author, search, filters, archive=False):
+    """(DB iş parçacığı) Toplu güncellemeyi yapar; güncel satırları ve görünümde kalan id'leri döndürür."""
+    ids = [int(i) for i in ids]
+    bulk_update_items(conn, ids, field, value, author)
+    rows = [item.row() for item in inventory_cache.get_many(conn, ids)]
+    visible = matching_item_ids(conn, ids, search, filters, archive) if (search or filters) else set(ids)
+    return rows, visible
+
+def _fetch_changes(conn, since, search, filters=None, archive=False):
+    """(DB iş parçacığı) since'ten sonra değişen öğeleri (id, satır veya silindiyse None, görünür mü) olarak döndürür.
+
+    Aynı öğenin birden çok değişikliği tek satıra indirgenir. Tam yenileme gerekiyorsa (None, None) döner.
+    """
+    changes = get_changes(conn, since)
+    if changes is None: return None, None
+    deltas = []
+    for item_id in dict.fromkeys(c[1] for c in changes): # Sırayı koruyarak tekilleştir
+        row, visible = _fetch_view_row(conn, item_id, search, filters, archive)
+        deltas.append((item_id, row, visible))
+    return (changes[-1][0] if changes else since), deltas
 
 #----------------------------------------------------------------------
 # Dialog Pencereleri
@@ -367,6 +683,7 @@ class MainWindow(tk.Tk):
 
 class InventoryDialog(tk.Toplevel):
     """Yeni/Düzenle penceresi için temel sınıf."""
+    @diagnostics.timed('ui')
     def __init__(self, parent, title="Envanter Öğesi", item_data=None): 
         super().__init__(parent)
         self.parent = parent 
@@ -374,14 +691,6 @@ class InventoryDialog(tk.Toplevel):
         self.result = None 
         self.title(title); self.geometry("500x700")
         
-        # Ana pencerenin stilini (temasını) devralır
-        s = ttk.Style()
-        try:
-            parent_theme = parent.style.theme_use() 
-            s.theme_use(parent_theme) 
-        except Exception:
-             print("Uyarı: Dialog teması ana pencereden alınamadı.")
-             
         main_frame = ttk.Frame(self, padding="20"); main_frame.pack(fill='both', expand=True)
         self.create_body(main_frame); self.create_buttons(main_frame) 
         self.transient(parent); self.grab_set(); self.parent.eval(f'tk::PlaceWindow {str(self)} center')
@@ -390,17 +699,18 @@ class InventoryDialog(tk.Toplevel):
         """Form alanlarını oluşturur."""
         ttk.Label(frame, text="Envanter Bilgileri", font=('Helvetica', 12, 'bold')).pack(pady=(0, 20))
         form_frame = ttk.Frame(frame); form_frame.pack(fill='x', expand=True); self.fields = {} 
+        vocabulary = get_cached_vocabulary(self.parent.db_conn) # Seçenekler sözlük tablolarından
         self.add_field(form_frame, "name", "Cihaz Adı:", ttk.Entry)
-        cats = ["Seçiniz..."] + sorted(["Bilgisayar", "Monitör", "Yazıcı", "Switch", "Güvenlik", "Sunucu", "UPS"])
+        cats = ["Seçiniz..."] + sorted(vocabulary['category'])
         self.add_field(form_frame, "category", "Kategori:", ttk.Combobox, values=cats)
         self.add_field(form_frame, "model", "Model:", ttk.Entry)
         self.fields["category"].bind('<<ComboboxSelected>>', self.on_category_change)
-        self.brand_cats = {"Bilgisayar": ["Dell", "HP", "Lenovo", "ASUS", "Acer", "MSI", "Apple", "Microsoft", "Gigabyte", "Casper", "Monster", "Huawei", "Toshiba", "Fujitsu", "Samsung", "Razer", "LG", "Sony", "Exa", "Izoly"], "Monitör": ["Samsung", "LG", "ASUS", "Dell", "HP", "BenQ", "ViewSonic", "AOC", "Philips", "MSI", "Acer", "Gigabyte", "Lenovo", "Huawei", "iiyama", "Eizo"], "Yazıcı": ["HP", "Canon", "Epson", "Brother", "Xerox", "Kyocera", "Lexmark", "Ricoh", "Pantum", "OKI", "Samsung", "Zebra", "Honeywell", "Datamax", "Konica Minolta"], "Switch": ["Cisco", "HP Aruba", "Juniper", "D-Link", "TP-Link", "Ubiquiti", "Zyxel", "MikroTik", "Netgear", "Dell Networking", "Extreme Networks", "Huawei", "Fortinet", "Mellanox"], "Güvenlik": ["Fortinet", "Palo Alto", "Cisco", "SonicWall", "WatchGuard", "Check Point", "Sophos", "Juniper", "Barracuda", "Zyxel", "Cyberom", "F5 Networks"], "Sunucu": ["Dell", "HP", "Lenovo", "IBM", "Fujitsu", "Supermicro", "Huawei", "Cisco (UCS)", "Oracle", "Inspur", "Hitachi", "NEC"], "UPS": ["APC", "Eaton", "PowerWalker", "CyberPower", "Vertiv", "Delta", "Tripp Lite", "Emerson", "Legrand", "Makelsan", "Inform", "Riello", "Socomec"]}
+        self.brand_cats = vocabulary['brand']
         self.add_field(form_frame, "brand", "Marka:", ttk.Combobox, values=["Seçiniz..."])
         self.add_field(form_frame, "serial_number", "Seri No:", ttk.Entry)
-        stats = ["Seçiniz..."] + ["Aktif Kullanımda", "Depoda", "Serviste", "Arızalı", "Hurda"]
+        stats = ["Seçiniz..."] + vocabulary['status']
         self.add_field(form_frame, "status", "Durum:", ttk.Combobox, values=stats)
-        locs = ["Seçiniz..."] + sorted(["IT", "Muhasebe", "Satış", "Yönetim", "Resepsiyon", "İnsan Kaynakları", "Pazarlama", "Üretim", "Depo", "Toplantı Odası", "Ortak Alan", "1. Kat", "2. Kat", "3. Kat"])
+        locs = ["Seçiniz..."] + sorted(vocabulary['location'])
         self.add_field(form_frame, "location", "Departman:", ttk.Combobox, values=locs)
         self.add_field(form_frame, "assigned_to", "Zimmet Sahibi:", ttk.Entry)
         lbl_frame = ttk.Frame(form_frame); lbl_frame.pack(fill='x', pady=(10, 0))
@@ -434,7 +744,7 @@ class InventoryDialog(tk.Toplevel):
         """Kaydet/İptal butonlarını oluşturur."""
         btn_frame = ttk.Frame(frame); btn_frame.pack(fill='x', pady=(20, 0))
         ttk.Button(btn_frame, text="İptal", command=self.cancel, width=15, bootstyle="secondary").pack(side='right', padx=5) 
-        ttk.Button(btn_frame, text="Kaydet", command=self.save, width=15, bootstyle="primary").pack(side='right')
+        self.save_button = ttk.Button(btn_frame, text="Kaydet", command=self.save, width=15, bootstyle="primary"); self.save_button.pack(side='right')
 
     def cancel(self): self.result = None; self.destroy()
     
@@ -450,20 +760,606 @@ class InventoryDialog(tk.Toplevel):
             
     def save(self):
         """Form verilerini doğrular, toplar ve pencereyi kapatır."""
-        name, cat = self.fields["name"].get().strip(), self.fields["category"].get()
-        if not name or not cat or cat == "Seçiniz...": messagebox.showerror("Hata", "Ad ve Kategori zorunludur!"); return
         try:
-            p_date = self.item_data[6] if self.item_data else datetime.date.today().strftime('%Y-%m-%d') 
-            form_data = {k: self.fields[k].get().strip() if isinstance(self.fields[k], ttk.Entry) else self.fields[k].get() 
-                         for k in self.fields if k != 'notes'}
-            form_data['notes'] = self.fields['notes'].get('1.0', 'end-1c').strip()
-            form_data['purchase_date'] = p_date 
-            for key in ['brand', 'status', 'location']:
-                if form_data[key] == "Seçiniz...": form_data[key] = ""
-            if not form_data['status']: form_data['status'] = 'Aktif Kullanımda'
-            self.result = {k: (v if v is not None else "") for k, v in form_data.items()}
-            self.destroy() 
+            form_data = {k: self.fields[k].get() for k in self.fields if k != 'notes'}
+            form_data['notes'] = self.fields['notes'].get('1.0', 'end-1c')
+            form_data['purchase_date'] = (self.item_data[6] or '') if self.item_data else None # Yeni kayıtta bugün atanır
+            item = normalize_item(form_data) # İçe aktarımla aynı doğrulama kuralları
+        except ValueError as e: messagebox.showerror("Hata", str(e)); return
         except Exception as e: messagebox.showerror("Hata", f"Form hatası: {e}"); return
+        # Benzer kayıt kontrolü arka planda (trigram indeksi) yapılır; kontrol başarısız olursa kayda engel olmaz
+        self.save_button.configure(state='disabled')
+        item_id = self.item_data[0] if self.item_data else None
+        self.parent.db_worker.submit(find_similar_items, item, item_id, callback=lambda similar: self.on_similar(item, similar),
+                                     error=lambda e: self.on_similar(item, []), channel='similar')
+
+    def on_similar(self, item, similar):
+        """Benzer kayıt varsa kullanıcıya sorar; aynı seri no varsa kaydı engeller."""
+        if not self.winfo_exists(): return
+        self.save_button.configure(state='normal')
+        exact = [row for reason, row in similar if reason == 'exact']
+        if exact: messagebox.showerror("Hata", f"Seri numarası zaten mevcut: #{exact[0][0]} {exact[0][1]}", parent=self); return
+        if similar:
+            lines = '\n'.join(f"• #{row[0]} {row[1]} {row[3] or ''} (Seri No: {row[5] or '-'}) — {REASONS[reason]}" for reason, row in similar)
+            if not messagebox.askyesno("Benzer Kayıt", f"Benzer kayıtlar bulundu:\n\n{lines}\n\nYine de kaydedilsin mi?", parent=self): return
+        self.result = item; self.destroy()
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Veritabanı ve arayüz ölçümlerini listeler; kayıt seçilince SQL ve sorgu planını gösterir."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.title("Tanılama"); self.geometry("900x600")
+        frame = ttk.Frame(self, padding="10"); frame.pack(fill='both', expand=True)
+        frame.columnconfigure(0, weight=1); frame.rowconfigure(1, weight=1)
+
+        toolbar = ttk.Frame(frame); toolbar.grid(row=0, column=0, sticky='ew', pady=(0, 8))
+        self.enabled_var = tk.BooleanVar(value=diagnostics.is_enabled())
+        ttk.Checkbutton(toolbar, text="Ölçümü aç", variable=self.enabled_var, command=lambda: diagnostics.enable(self.enabled_var.get()),
+                        bootstyle="round-toggle").pack(side='left')
+        ttk.Label(toolbar, text=f"(≥ {diagnostics.SLOW_QUERY_MS} ms süren çağrıların sorgu planı alınır)", bootstyle="secondary").pack(side='left', padx=10)
+        ttk.Button(toolbar, text="JSON Kaydet", command=self.export, bootstyle='primary-outline').pack(side='right', padx=2)
+        ttk.Button(toolbar, text="Temizle", command=lambda: (diagnostics.clear(), self.reload()), bootstyle='secondary-outline').pack(side='right', padx=2)
+        ttk.Button(toolbar, text="Yenile", command=self.reload, bootstyle='info-outline').pack(side='right', padx=2)
+
+        notebook = ttk.Notebook(frame); notebook.grid(row=1, column=0, sticky='nsew')
+        self.records_tree = self.make_tree(notebook, {'time': ("Zaman", 80), 'kind': ("Tür", 40), 'name': ("Ad", 260), 'ms': ("ms", 70), 'rows': ("Satır", 60), 'thread': ("İş Parçacığı", 120)})
+        self.summary_tree = self.make_tree(notebook, {'kind': ("Tür", 40), 'name': ("Ad", 300), 'count': ("Adet", 60), 'avg': ("Ort. ms", 80), 'max': ("Maks. ms", 80), 'total': ("Toplam ms", 90)})
+        notebook.add(self.records_tree.master, text="Kayıtlar"); notebook.add(self.summary_tree.master, text="Özet")
+        self.records_tree.bind('<<TreeviewSelect>>', self.show_record)
+        self.detail = tk.Text(frame, height=10, wrap='word', font=('Consolas', 9)); self.detail.grid(row=2, column=0, sticky='ew', pady=(8, 0))
+        self.records = []
+        self.transient(parent); self.reload()
+
+    def make_tree(self, parent, columns):
+        container = ttk.Frame(parent)
+        container.columnconfigure(0, weight=1); container.rowconfigure(0, weight=1)
+        tree = ttk.Treeview(container, columns=list(columns), show='headings')
+        for col, (text, width) in columns.items():
+            tree.heading(col, text=text, anchor='w'); tree.column(col, width=width, anchor='e' if width <= 90 and col not in ('time', 'kind') else 'w')
+        scrollbar = ttk.Scrollbar(container, command=tree.yview); tree.configure(yscrollcommand=scrollbar.set)
+        tree.grid(row=0, column=0, sticky='nsew'); scrollbar.grid(row=0, column=1, sticky='ns')
+        return tree
+
+    def reload(self):
+        """Kayıtları (en yeni üstte) ve ad bazında özeti yeniden yükler."""
+        self.records = diagnostics.records()[::-1]
+        self.records_tree.delete(*self.records_tree.get_children())
+        for i, rec in enumerate(self.records):
+            values = (time.strftime('%H:%M:%S', time.localtime(rec.started)), rec.kind, rec.name, f"{rec.duration_ms:.1f}", '' if rec.rows is None else rec.rows, rec.thread)
+            self.records_tree.insert('', 'end', iid=i, values=values)
+        self.summary_tree.delete(*self.summary_tree.get_children())
+        for kind, name, count, avg, peak, total in diagnostics.summary():
+            self.summary_tree.insert('', 'end', values=(kind, name, count, f"{avg:.1f}", f"{peak:.1f}", f"{total:.1f}"))
+
+    def show_record(self, event):
+        """Seçili kaydın SQL ifadelerini ve (varsa) sorgu planlarını gösterir."""
+        selection = self.records_tree.selection()
+        if not selection: return
+        rec = self.records[int(selection[0])]
+        lines = rec.statements or ["(SQL kaydı yok)"]
+        for sql, plan in rec.plans: lines += ['', f"PLAN: {sql}"] + [f"  {step}" for step in plan]
+        self.detail.delete('1.0', 'end'); self.detail.insert('1.0', '\n'.join(lines))
+
+    def export(self):
+        fname = filedialog.asksaveasfilename(parent=self, title="Tanılama Kaydet", defaultextension='.json',
+                                             initialfile=f'tanilama_{datetime.datetime.now():%Y%m%d_%H%M%S}.json', filetypes=[("JSON", "*.json")])
+        if fname: diagnostics.export_json(fname); messagebox.showinfo("Başarılı", f"Tanılama '{fname}' dosyasına kaydedildi.", parent=self)
+
+class BulkEditDialog(tk.Toplevel):
+    """Seçili öğelere uygulanacak tek bir alan değerini (durum, konum, zimmet) sorar; onay da bu penceredir."""
+    @diagnostics.timed('ui')
+    def __init__(self, parent, field, count):
+        super().__init__(parent)
+        self.parent = parent
+        self.field = field
+        self.result = None
+        self.title("Toplu İşlem"); self.resizable(False, False)
+
+        frame = ttk.Frame(self, padding="20"); frame.pack(fill='both', expand=True)
+        label = {'status': "Yeni durum", 'location': "Yeni konum", 'assigned_to': "Zimmet sahibi"}[field]
+        ttk.Label(frame, text=f"{count} öğe için {label.lower()}:", font=('Helvetica', 10, 'bold')).pack(anchor='w', pady=(0, 10))
+        if field == 'assigned_to': self.value = ttk.Entry(frame, width=40) # Boş bırakmak zimmeti kaldırır
+        else:
+            values = get_cached_vocabulary(parent.db_conn)[field]
+            self.value = ttk.Combobox(frame, values=values, width=38, state='readonly'); self.value.set(values[0])
+        self.value.pack(fill='x'); self.value.focus_set()
+        btn_frame = ttk.Frame(frame); btn_frame.pack(fill='x', pady=(20, 0))
+        ttk.Button(btn_frame, text="İptal", command=self.destroy, width=12, bootstyle="secondary").pack(side='right', padx=5)
+        ttk.Button(btn_frame, text="Uygula", command=self.apply, width=12, bootstyle="primary").pack(side='right')
+        self.bind('<Return>', lambda e: self.apply())
+        self.transient(parent); self.grab_set(); self.parent.eval(f'tk::PlaceWindow {str(self)} center')
+
+    def apply(self):
+        self.result = self.value.get().strip(); self.destroy()
+
+class ExportDialog(tk.Toplevel):
+    """Dışa aktarımı arka plan iş parçacığında çalıştırır, ilerlemeyi gösterir ve iptale izin verir."""
+    @diagnostics.timed('ui')
+    def __init__(self, parent, file_path, headers, sort_column, descending, search, filters=None, archive=False):
+        super().__init__(parent)
+        self.parent = parent
+        self.file_path = file_path
+        self.filters = filters
+        self.archive = archive
+        self.events = queue.Queue() # İş parçacığından UI'a giden olaylar
+        self.cancel_event = threading.Event()
+        self.title("Dışa Aktarılıyor"); self.geometry("420x150"); self.resizable(False, False)
+
+        frame = ttk.Frame(self, padding="20"); frame.pack(fill='both', expand=True)
+        self.status_label = ttk.Label(frame, text="Hazırlanıyor..."); self.status_label.pack(anchor='w')
+        self.progress = ttk.Progressbar(frame, maximum=1, bootstyle="info-striped"); self.progress.pack(fill='x', pady=10)
+        self.cancel_button = ttk.Button(frame, text="İptal", command=self.cancel, width=15, bootstyle="secondary")
+        self.cancel_button.pack(side='right')
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.transient(parent); self.parent.eval(f'tk::PlaceWindow {str(self)} center')
+
+        args = (parent.db_path, file_path, headers, sort_column, descending, search)
+        threading.Thread(target=self.run_export, args=args, daemon=True).start()
+        self.after(100, self.poll)
+
+    def run_export(self, *args):
+        """(Arka plan) Aktarımı çalıştırır; Tk'ye dokunmadan sonucu kuyruğa yazar."""
+        from ..models.exporter import export_inventory, ExportCancelled # İlk kullanımda yüklenir
+        try:
+            count = export_inventory(*args, progress=lambda done, total: self.events.put(('progress', done, total)), cancel_event=self.cancel_event, filters=self.filters, archive=self.archive)
+            self.events.put(('done', count))
+        except ExportCancelled: self.events.put(('cancelled',))
+        except ImportError: self.events.put(('error', "Excel için openpyxl gerekli!\n'pip install openpyxl'"))
+        except Exception as e: self.events.put(('error', f"Export hatası: {e}"))
+
+    def poll(self):
+        """Kuyruktaki ilerleme/sonuç olaylarını UI iş parçacığında işler."""
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] != 'progress': self.finish(event); return
+                done, total = event[1:]
+                self.progress.configure(maximum=max(total, 1), value=done)
+                self.status_label.config(text=f"{done} / {total} satır yazıldı")
+        except queue.Empty: pass
+        self.after(100, self.poll)
+
+    def finish(self, event):
+        """Pencereyi kapatır ve sonucu bildirir."""
+        self.destroy()
+        if event[0] == 'done': messagebox.showinfo("Başarılı", f"{event[1]} satır '{self.file_path}' dosyasına aktarıldı!")
+        elif event[0] == 'cancelled': messagebox.showinfo("Bilgi", "Dışa aktarım iptal edildi.")
+        else: messagebox.showerror("Hata", event[1])
+
+    def cancel(self):
+        """İş parçacığına iptal isteği gönderir; bir sonraki parçada durur."""
+        self.cancel_event.set()
+        self.cancel_button.config(state='disabled'); self.status_label.config(text="İptal ediliyor...")
+
+class ImportDialog(tk.Toplevel):
+    """Çakışma politikasını sorar, içe aktarımı arka planda çalıştırır ve sonucu raporlar."""
+    @diagnostics.timed('ui')
+    def __init__(self, parent, file_path):
+        super().__init__(parent)
+        self.parent = parent
+        self.file_path = file_path
+        self.events = queue.Queue()
+        self.title("İçe Aktar"); self.geometry("460x280"); self.resizable(False, False)
+
+        frame = ttk.Frame(self, padding="20"); frame.pack(fill='both', expand=True)
+        ttk.Label(frame, text=f"Dosya: {file_path}", wraplength=410).pack(anchor='w')
+        ttk.Label(frame, text="Seri numarası zaten varsa:", font=('Helvetica', 9, 'bold')).pack(anchor='w', pady=(15, 5))
+        from ..models.importer import CONFLICT_POLICIES # İlk kullanımda yüklenir
+        self.policy_var = tk.StringVar(value='skip')
+        for policy, label in CONFLICT_POLICIES.items():
+            ttk.Radiobutton(frame, text=label, variable=self.policy_var, value=policy).pack(anchor='w', padx=10)
+        self.status_label = ttk.Label(frame, text=""); self.status_label.pack(anchor='w', pady=(15, 0))
+        self.progress = ttk.Progressbar(frame, mode='indeterminate', bootstyle="info-striped"); self.progress.pack(fill='x', pady=5)
+        self.start_button = ttk.Button(frame, text="Başlat", command=self.start, width=15, bootstyle="primary")
+        self.start_button.pack(side='right')
+        self.transient(parent); self.grab_set(); self.parent.eval(f'tk::PlaceWindow {str(self)} center')
+
+    def start(self):
+        """İçe aktarımı kendi bağlantısını açan bir iş parçacığında başlatır."""
+        self.start_button.config(state='disabled'); self.protocol("WM_DELETE_WINDOW", lambda: None)
+        self.progress.start(); self.status_label.config(text="İçe aktarılıyor...")
+        args = (self.parent.db_path, self.file_path, self.policy_var.get(), self.parent.author)
+        threading.Thread(target=self.run_import, args=args, daemon=True).start()
+        self.after(100, self.poll)
+
+    def run_import(self, db_path, file_path, policy, author):
+        """(Arka plan) İçe aktarımı çalıştırır; Tk'ye dokunmadan sonucu kuyruğa yazar."""
+        from ..models.importer import import_inventory
+        conn = connect(db_path)
+        try:
+            result = import_inventory(conn, file_path, policy, progress=lambda done: self.events.put(('progress', done)), author=author)
+            self.events.put(('done', result))
+        except ImportError: self.events.put(('error', "Excel için openpyxl gerekli!\n'pip install openpyxl'"))
+        except Exception as e: self.events.put(('error', f"İçe aktarım hatası: {e}"))
+        finally: conn.close()
+
+    def poll(self):
+        """Kuyruktaki ilerleme/sonuç olaylarını UI iş parçacığında işler."""
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] == 'progress': self.status_label.config(text=f"{event[1]} satır işlendi..."); continue
+                self.finish(event); return
+        except queue.Empty: pass
+        self.after(100, self.poll)
+
+    def finish(self, event):
+        """Pencereyi kapatır, tabloyu yeniler ve sonucu (gerekirse hata raporuyla) bildirir."""
+        self.destroy()
+        if event[0] == 'error': messagebox.showerror("Hata", event[1]); return
+        result = event[1]
+        clear_vocabulary_cache() # İçe aktarılan yeni kategori/marka/konumlar formlarda görünsün
+        self.parent.refresh_table()
+        if not result.errors: messagebox.showinfo("Başarılı", result.summary()); return
+        if messagebox.askyesno("İçe Aktarım Tamamlandı", f"{result.summary()}\n\nHata raporu kaydedilsin mi?"):
+            fname = filedialog.asksaveasfilename(parent=self.parent, title="Hata Raporu", defaultextension='.csv',
+                                                 initialfile='ice_aktarim_hatalari.csv', filetypes=[("CSV Dosyası", "*.csv")])
+            if fname: result.write_error_report(fname)
+
+class ReportDialog(tk.Toplevel):
+    """Yaş dağılımı, yüzdelik, durum ve yenileme tahmini raporlarını hesaplar, gösterir ve dışa aktarır.
+
+    Raporlar pandas ile ayrı bir iş parçacığında hesaplanır (tablonun sayfa sorgularını bekletmez);
+    sonuçlar veri sürümüne göre önbelleklendiğinden aynı rapor değişiklik olmadıkça anında gelir.
+    """
+    @diagnostics.timed('ui')
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.table = None # Son hesaplanan rapor (DataFrame)
+        self.events = queue.Queue()
+        self.title("Yaşam Döngüsü Raporları"); self.geometry("900x560")
+        frame = ttk.Frame(self, padding="10"); frame.pack(fill='both', expand=True)
+        frame.columnconfigure(0, weight=1); frame.rowconfigure(2, weight=1)
+
+        options = ttk.Frame(frame); options.grid(row=0, column=0, sticky='ew')
+        self.report_var = tk.StringVar(value=next(iter(REPORTS)))
+        self.group_var = tk.StringVar(value=FACET_LABELS['category'])
+        categories = get_cached_vocabulary(parent.db_conn)['category']
+        self.category_var = tk.StringVar(value=categories[0] if categories else '')
+        self.age_var = tk.IntVar(value=4)
+        for label, widget in (("Rapor:", ttk.Combobox(options, textvariable=self.report_var, values=list(REPORTS), state='readonly', width=18)),
+                              ("Grup:", ttk.Combobox(options, textvariable=self.group_var, values=list(FACET_LABELS.values()), state='readonly', width=14)),
+                              ("Kategori:", ttk.Combobox(options, textvariable=self.category_var, values=categories, state='readonly', width=12)),
+                              ("Yaş sınırı:", ttk.Spinbox(options, textvariable=self.age_var, from_=1, to=15, width=4))):
+            ttk.Label(options, text=label).pack(side='left', padx=(0, 4)); widget.pack(side='left', padx=(0, 12))
+        self.report_var.trace_add('write', lambda *_: self.update_options())
+        self.forecast_widgets = options.winfo_children()[-4:]
+
+        dates = ttk.Frame(frame); dates.grid(row=1, column=0, sticky='ew', pady=8)
+        ttk.Label(dates, text="Alım tarihi (YYYY-AA-GG):").pack(side='left', padx=(0, 4))
+        self.date_from = ttk.Entry(dates, width=12); self.date_from.pack(side='left')
+        ttk.Label(dates, text="–").pack(side='left', padx=4)
+        self.date_to = ttk.Entry(dates, width=12); self.date_to.pack(side='left')
+        ttk.Button(dates, text="Dışa Aktar", command=self.export, bootstyle='primary-outline').pack(side='right', padx=2)
+        self.run_button = ttk.Button(dates, text="Oluştur", command=self.run, bootstyle='primary'); self.run_button.pack(side='right', padx=2)
+        self.status_label = ttk.Label(dates, text="", bootstyle="secondary"); self.status_label.pack(side='right', padx=10)
+
+        container = ttk.Frame(frame); container.grid(row=2, column=0, sticky='nsew')
+        container.columnconfigure(0, weight=1); container.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(container, show='headings')
+        scrollbar = ttk.Scrollbar(container, command=self.tree.yview); self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky='nsew'); scrollbar.grid(row=0, column=1, sticky='ns')
+        self.transient(parent); self.update_options(); self.run()
+
+    def update_options(self):
+        """Kategori ve yaş sınırı yalnızca yenileme tahmininde kullanılır."""
+        state = 'normal' if REPORTS[self.report_var.get()] == 'refresh_forecast' else 'disabled'
+        for widget in self.forecast_widgets: widget.configure(state='readonly' if state == 'normal' and isinstance(widget, ttk.Combobox) else state)
+
+    def run(self):
+        """Seçili raporu arka planda hesaplatır."""
+        dates = []
+        for entry in (self.date_from, self.date_to):
+            value = entry.get().strip()
+            try: dates.append(datetime.datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d') if value else None)
+            except ValueError: messagebox.showerror("Hata", f"Geçersiz tarih: {value}", parent=self); return
+        by = next(col for col, label in FACET_LABELS.items() if label == self.group_var.get())
+        name = REPORTS[self.report_var.get()]
+        kwargs = {'purchased_from': dates[0], 'purchased_to': dates[1]}
+        if name == 'status_pivot': kwargs['index'] = by if by != 'status' else 'location'
+        else: kwargs['by'] = by
+        if name == 'refresh_forecast': kwargs.update(category=self.category_var.get(), older_than=self.age_var.get())
+        self.run_button.configure(state='disabled'); self.status_label.config(text="Hesaplanıyor...")
+        threading.Thread(target=self.compute, args=(name, kwargs), daemon=True).start()
+        self.after(100, self.poll)
+
+    def compute(self, name, kwargs):
+        """(Arka plan) Raporu kendi bağlantısıyla hesaplar; sonucu kuyruğa yazar."""
+        try:
+            from ..models import reports # pandas yalnızca ilk raporda yüklenir
+            conn = connect(self.parent.db_path)
+            try: self.events.put(('done', getattr(reports, name)(conn, **kwargs)))
+            finally: conn.close()
+        except Exception as e: self.events.put(('error', e))
+
+    def poll(self):
+        """Hesaplama sonucunu UI iş parçacığında gösterir."""
+        try: event, value = self.events.get_nowait()
+        except queue.Empty: self.after(100, self.poll); return
+        if not self.winfo_exists(): return
+        self.run_button.configure(state='normal')
+        if event == 'error': self.status_label.config(text=""); messagebox.showerror("Hata", f"Rapor hatası: {value}", parent=self); return
+        self.show(value)
+
+    def show(self, table):
+        """DataFrame'i (indeks ilk sütun olmak üzere) tabloya yazar."""
+        self.table = table
+        columns = [table.index.name or ''] + [str(c) for c in table.columns]
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(columns=[f'c{i}' for i in range(len(columns))])
+        for i, text in enumerate(columns):
+            self.tree.heading(f'c{i}', text=text, anchor='w' if i == 0 else 'e'); self.tree.column(f'c{i}', width=160 if i == 0 else 80, anchor='w' if i == 0 else 'e')
+        for row in table.itertuples(): self.tree.insert('', 'end', values=[str(v) for v in row])
+        self.status_label.config(text=f"{len(table)} satır")
+
+    def export(self):
+        if self.table is None: return
+        fname = filedialog.asksaveasfilename(parent=self, title="Raporu Dışa Aktar", defaultextension='.xlsx',
+                                             initialfile=f'{REPORTS[self.report_var.get()]}_{datetime.datetime.now():%Y%m%d_%H%M%S}.xlsx',
+                                             filetypes=[("Excel Dosyası", "*.xlsx"), ("CSV Dosyası", "*.csv")])
+        if not fname: return
+        from ..models.reports import export_report
+        try: export_report(self.table, fname, self.report_var.get()); messagebox.showinfo("Başarılı", f"Rapor '{fname}' dosyasına kaydedildi.", parent=self)
+        except Exception as e: messagebox.showerror("Hata", f"Export hatası: {e}", parent=self)
+
+class BackupDialog(tk.Toplevel):
+    """Anlık görüntüleri listeler; yeni yedek alır, seçileni doğrular veya geri yükler (işler arka planda çalışır)."""
+    @diagnostics.timed('ui')
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.events = queue.Queue()
+        self.title("Yedekler"); self.geometry("620x420")
+        frame = ttk.Frame(self, padding="10"); frame.pack(fill='both', expand=True)
+        frame.columnconfigure(0, weight=1); frame.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(frame, columns=('taken', 'size'), show='headings', selectmode='browse')
+        self.tree.heading('taken', text="Tarih", anchor='w'); self.tree.heading('size', text="Boyut", anchor='e')
+        self.tree.column('taken', width=200); self.tree.column('size', width=100, anchor='e')
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.progress = ttk.Progressbar(frame, maximum=1, bootstyle="info-striped"); self.progress.grid(row=1, column=0, sticky='ew', pady=(10, 0))
+        self.status_label = ttk.Label(frame, text=""); self.status_label.grid(row=2, column=0, sticky='w', pady=5)
+        buttons = ttk.Frame(frame); buttons.grid(row=3, column=0, sticky='ew')
+        self.buttons = [ttk.Button(buttons, text="Şimdi Yedekle", command=self.backup, bootstyle='primary'),
+                        ttk.Button(buttons, text="Doğrula", command=self.verify, bootstyle='info-outline'),
+                        ttk.Button(buttons, text="Geri Yükle", command=self.restore, bootstyle='danger-outline')]
+        for button in self.buttons: button.pack(side='left', padx=(0, 5))
+        ttk.Button(buttons, text="Kapat", command=self.destroy, bootstyle='secondary').pack(side='right')
+        self.transient(parent); self.reload()
+
+    def reload(self):
+        """Anlık görüntü listesini (yeniden eskiye) yeniler."""
+        self.snapshots = {str(path): (path, taken, size) for path, taken, size in list_backups(self.parent.db_path)}
+        self.tree.delete(*self.tree.get_children())
+        for key, (path, taken, size) in self.snapshots.items():
+            self.tree.insert('', 'end', iid=key, values=(f"{taken:%Y-%m-%d %H:%M:%S}", f"{size / 1024 / 1024:.1f} MB"))
+
+    def selected_snapshot(self):
+        selection = self.tree.selection()
+        if not selection: messagebox.showwarning("Uyarı", "Önce bir yedek seçin!", parent=self); return None
+        return self.snapshots[selection[0]][0]
+
+    def start(self, text, func, *args):
+        """func(*args) çağrısını arka planda çalıştırır; sonucu finish() UI iş parçacığında işler."""
+        for button in self.buttons: button.configure(state='disabled')
+        self.status_label.config(text=text); self.progress.configure(value=0)
+        def run():
+            try: self.events.put(('done', func(*args)))
+            except Exception as e: self.events.put(('error', e))
+        threading.Thread(target=run, daemon=True).start()
+        self.after(100, self.poll)
+
+    def poll(self):
+        """İlerleme ve sonuç olaylarını UI iş parçacığında işler."""
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] == 'progress': self.progress.configure(maximum=max(event[2], 1), value=event[1]); continue
+                if self.winfo_exists(): self.finish(*event)
+                return
+        except queue.Empty: pass
+        self.after(100, self.poll)
+
+    def finish(self, event, value):
+        """İş bitince düğmeleri açar; hata mesajını ya da işin döndürdüğü UI adımını uygular."""
+        for button in self.buttons: button.configure(state='normal')
+        self.status_label.config(text="")
+        if event == 'error': messagebox.showerror("Hata", str(value), parent=self); return
+        if callable(value): value()
+
+    def backup(self):
+        def run():
+            result = backup_database(self.parent.db_path, progress=lambda done, total: self.events.put(('progress', done, total)))
+            return lambda: (self.reload(), self.status_label.config(text=result.summary()))
+        self.start("Yedekleniyor...", run)
+
+    def verify(self):
+        snapshot = self.selected_snapshot()
+        if not snapshot: return
+        def run():
+            problems = verify_snapshot(snapshot)
+            if problems: return lambda: messagebox.showerror("Doğrulama", "Yedek bozuk:\n" + '\n'.join(problems[:10]), parent=self)
+            return lambda: messagebox.showinfo("Doğrulama", "integrity_check: ok", parent=self)
+        self.start("Doğrulanıyor (integrity_check)...", run)
+
+    def restore(self):
+        snapshot = self.selected_snapshot()
+        if not snapshot: return
+        if not messagebox.askyesno("Geri Yükle", "Veritabanı seçilen yedeğe döndürülecek; sonraki tüm değişiklikler kaybolacak.\n"
+                                   "Diğer istemciler de yedekteki veriyi görecek. Devam edilsin mi?", parent=self): return
+        def run():
+            restore_backup(snapshot, self.parent.db_path)
+            return lambda: (self.parent.refresh_table(), messagebox.showinfo("Başarılı", "Yedek doğrulandı ve geri yüklendi.", parent=self))
+        self.start("Doğrulanıyor ve geri yükleniyor...", run)
+
+class StocktakeDialog(tk.Toplevel):
+    """Sayım: okutulan (barkod okuyucu seri noyu yazıp Enter'a basar), yapıştırılan veya dosyadan okunan
+    seri numaralarını kalıcı bir oturuma kaydeder ve oturumun kayıtlarla farkını gösterir.
+
+    Okutmalar DB iş parçacığına sırayla gönderilir; giriş alanı hemen boşaldığından okuyucu beklemeden
+    sonraki seri noyu yazabilir, her sonuç geldikçe son okutmalar listesine eklenir.
+    """
+    @diagnostics.timed('ui')
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.sessions = {} # Açılır listedeki metin -> (id, ad, konum, başlangıç, başlatan, kapanış, okutma sayısı)
+        self.result = None # Son hesaplanan fark (StocktakeResult)
+        self.title("Sayım"); self.geometry("900x600")
+        frame = ttk.Frame(self, padding="10"); frame.pack(fill='both', expand=True)
+        frame.columnconfigure(0, weight=1); frame.rowconfigure(3, weight=1)
+        locations = get_cached_vocabulary(parent.db_conn)['location']
+
+        sessions = ttk.Frame(frame); sessions.grid(row=0, column=0, sticky='ew')
+        self.session_var = tk.StringVar()
+        ttk.Label(sessions, text="Oturum:").pack(side='left', padx=(0, 4))
+        self.session_box = ttk.Combobox(sessions, textvariable=self.session_var, state='readonly', width=40); self.session_box.pack(side='left')
+        self.session_box.bind('<<ComboboxSelected>>', lambda e: self.select_session())
+        ttk.Button(sessions, text="Oturumu Kapat", command=self.close_session, bootstyle='danger-outline').pack(side='right', padx=2)
+        ttk.Button(sessions, text="Yeni Oturum", command=self.new_session, bootstyle='primary-outline').pack(side='right', padx=2)
+        self.scope_var = tk.StringVar(value="Tümü")
+        ttk.Combobox(sessions, textvariable=self.scope_var, values=["Tümü"] + locations, state='readonly', width=14).pack(side='right', padx=2)
+        self.name_entry = ttk.Entry(sessions, width=18); self.name_entry.pack(side='right', padx=2)
+        self.name_entry.insert(0, f"Sayım {datetime.date.today():%Y-%m-%d}")
+
+        scan = ttk.Frame(frame); scan.grid(row=1, column=0, sticky='ew', pady=8)
+        ttk.Label(scan, text="Seri No:").pack(side='left', padx=(0, 4))
+        self.serial_entry = ttk.Entry(scan, width=28, font=('Helvetica', 12)); self.serial_entry.pack(side='left')
+        self.serial_entry.bind('<Return>', lambda e: self.scan())
+        ttk.Label(scan, text="Bulunduğu konum:").pack(side='left', padx=(12, 4))
+        self.location_var = tk.StringVar()
+        ttk.Combobox(scan, textvariable=self.location_var, values=[''] + locations, state='readonly', width=14).pack(side='left')
+        ttk.Button(scan, text="Dosyadan...", command=self.load_file, bootstyle='info-outline').pack(side='right', padx=2)
+        ttk.Button(scan, text="Yapıştır", command=self.paste, bootstyle='info-outline').pack(side='right', padx=2)
+        self.feedback = ttk.Label(frame, text="", font=('Helvetica', 11, 'bold')); self.feedback.grid(row=2, column=0, sticky='w')
+
+        notebook = ttk.Notebook(frame); notebook.grid(row=3, column=0, sticky='nsew', pady=(8, 0))
+        self.scans_tree = self.make_tree(notebook, {'serial': ("Seri No", 140), 'name': ("Ad", 220), 'location': ("Kayıtlı Konum", 120), 'status': ("Durum", 120), 'note': ("Sonuç", 200)})
+        self.diff_tree = self.make_tree(notebook, {'serial': ("Seri No", 140), 'name': ("Ad", 220), 'location': ("Kayıtlı Konum", 120), 'scanned': ("Okutulan Konum", 120), 'assigned': ("Zimmet Sahibi", 140)})
+        notebook.add(self.scans_tree.master, text="Son Okutmalar"); notebook.add(self.diff_tree.master, text="Fark")
+        self.notebook = notebook
+
+        buttons = ttk.Frame(frame); buttons.grid(row=4, column=0, sticky='ew', pady=(8, 0))
+        ttk.Button(buttons, text="Farkı Hesapla", command=self.show_diff, bootstyle='primary').pack(side='left', padx=(0, 5))
+        ttk.Button(buttons, text="Raporu Kaydet", command=self.save_report, bootstyle='primary-outline').pack(side='left', padx=(0, 5))
+        self.status_label = ttk.Label(buttons, text="", bootstyle="secondary"); self.status_label.pack(side='left', padx=10)
+        ttk.Button(buttons, text="Kapat", command=self.destroy, bootstyle='secondary').pack(side='right')
+        self.transient(parent); self.reload()
+        self.serial_entry.focus_set()
+
+    def make_tree(self, parent, columns):
+        container = ttk.Frame(parent)
+        container.columnconfigure(0, weight=1); container.rowconfigure(0, weight=1)
+        tree = ttk.Treeview(container, columns=list(columns), show='tree headings')
+        tree.column('#0', width=150, stretch=False)
+        for col, (text, width) in columns.items(): tree.heading(col, text=text, anchor='w'); tree.column(col, width=width)
+        scrollbar = ttk.Scrollbar(container, command=tree.yview); tree.configure(yscrollcommand=scrollbar.set)
+        tree.grid(row=0, column=0, sticky='nsew'); scrollbar.grid(row=0, column=1, sticky='ns')
+        return tree
+
+    def reload(self, select=None):
+        """Oturum listesini yeniler; select (oturum id) veya ilk açık oturum seçilir."""
+        def on_sessions(rows):
+            if not self.winfo_exists(): return
+            self.sessions = {f"#{row[0]} {row[1]}" + (f" ({row[2]})" if row[2] else "") + (" [kapalı]" if row[5] else ""): row for row in rows}
+            self.session_box.configure(values=list(self.sessions))
+            wanted = [key for key, row in self.sessions.items() if row[0] == select or (select is None and not row[5])]
+            self.session_var.set(wanted[0] if wanted else ''); self.select_session()
+        self.parent.db_worker.submit(list_sessions, callback=on_sessions)
+
+    def current_session(self, writable=False):
+        """Seçili oturum satırı; writable ise kapalı oturumda uyarıp None döndürür."""
+        session = self.sessions.get(self.session_var.get())
+        if session is None: messagebox.showwarning("Uyarı", "Önce bir sayım oturumu seçin veya yeni oturum açın!", parent=self); return None
+        if writable and session[5]: messagebox.showwarning("Uyarı", "Bu oturum kapatılmış; okutma eklenemez.", parent=self); return None
+        return session
+
+    def select_session(self):
+        session = self.sessions.get(self.session_var.get())
+        self.scans_tree.delete(*self.scans_tree.get_children()); self.diff_tree.delete(*self.diff_tree.get_children()); self.result = None
+        self.location_var.set(session[2] if session else '') # Konumla sınırlı sayımda okutmalar o konumda sayılır
+        self.status_label.config(text=f"{session[6]} seri no okutulmuş, başlangıç {session[3]}" + (f", kapanış {session[5]}" if session[5] else "") if session else "")
+        self.feedback.config(text="")
+
+    def new_session(self):
+        name = self.name_entry.get().strip()
+        if not name: messagebox.showwarning("Uyarı", "Oturum adı gerekli!", parent=self); return
+        scope = self.scope_var.get()
+        self.parent.db_worker.submit(create_session, name, None if scope == "Tümü" else scope, self.parent.author,
+                                     callback=lambda session_id: self.reload(session_id), error=lambda e: messagebox.showerror("Hata", f"Oturum açılamadı: {e}", parent=self))
+
+    def close_session(self):
+        session = self.current_session(writable=True)
+        if not session: return
+        if not messagebox.askyesno("Onay", f"'{session[1]}' oturumu kapatılacak; sonrasında okutma eklenemez.\nDevam edilsin mi?", parent=self): return
+        self.parent.db_worker.submit(close_session, session[0], callback=lambda _: self.reload(session[0]))
+
+    def scan(self):
+        """Giriş alanındaki seri noyu kaydeder; alan hemen boşalır, sonuç geldiğinde listeye eklenir."""
+        serial = self.serial_entry.get().strip(); self.serial_entry.delete(0, 'end')
+        if not serial: return
+        session = self.current_session(writable=True)
+        if not session: return
+        location = self.location_var.get()
+        def on_scan(outcome):
+            if not self.winfo_exists(): return
+            item, count = outcome
+            if item is None: note, style = "Bilinmeyen seri no", 'danger'
+            elif item[4]: note, style = "Arşivde (hurdaya ayrılmış)", 'warning'
+            elif location and item[2] != location: note, style = f"Yanlış konum (kayıtlı: {item[2] or '-'})", 'warning'
+            else: note, style = "Bulundu", 'success'
+            if count > 1: note += f" — {count}. okutma"
+            self.scans_tree.insert('', 0, text=datetime.datetime.now().strftime('%H:%M:%S'), values=(serial, *(item[1:4] if item else ('', '', '')), note))
+            self.feedback.config(text=f"{serial}: {note}", bootstyle=style)
+        def on_error(e): self.feedback.config(text=f"{serial}: {e}", bootstyle='danger')
+        self.parent.db_worker.submit(record_scan, session[0], serial, location, self.parent.author, callback=on_scan, error=on_error)
+
+    def record_many(self, func, *args):
+        """Toplu okutmayı (yapıştırma/dosya) DB iş parçacığında kaydeder ve farkı yeniden hesaplar."""
+        session = self.current_session(writable=True)
+        if not session: return
+        self.configure(cursor='watch')
+        def on_done(count): self.configure(cursor=''); self.feedback.config(text=f"{count} seri no kaydedildi.", bootstyle='success'); self.show_diff()
+        def on_error(e): self.configure(cursor=''); messagebox.showerror("Hata", f"Seri numaraları kaydedilemedi: {e}", parent=self)
+        self.parent.db_worker.submit(func, session[0], *args, self.location_var.get(), self.parent.author, callback=on_done, error=on_error)
+
+    def paste(self):
+        """Panodaki (satır, sekme veya virgülle ayrılmış) seri numaralarını kaydeder."""
+        try: text = self.clipboard_get()
+        except tk.TclError: messagebox.showwarning("Uyarı", "Pano boş.", parent=self); return
+        self.record_many(record_scans, text.replace('\t', '\n').replace(',', '\n').replace(';', '\n').splitlines())
+
+    def load_file(self):
+        fname = filedialog.askopenfilename(parent=self, title="Seri Numarası Listesi",
+                                           filetypes=[("Liste", "*.txt *.csv *.xlsx"), ("Tüm Dosyalar", "*.*")])
+        if fname: self.record_many(_record_serial_file, fname)
+
+    def show_diff(self):
+        """Oturumun farkını hesaplar; her küme bir üst satır, ilk DIFF_DISPLAY_LIMIT öğesi altında listelenir."""
+        session = self.current_session()
+        if not session: return
+        self.status_label.config(text="Fark hesaplanıyor...")
+        def on_diff(result):
+            if not self.winfo_exists(): return
+            self.result = result
+            self.diff_tree.delete(*self.diff_tree.get_children())
+            for key, label in RESULT_LABELS.items():
+                rows = result.rows[key]
+                parent = self.diff_tree.insert('', 'end', text=f"{label} ({len(rows)})", open=key != 'found')
+                for row in rows[:DIFF_DISPLAY_LIMIT]: self.diff_tree.insert(parent, 'end', values=(row[0], row[2], row[4], row[5], row[6]))
+                if len(rows) > DIFF_DISPLAY_LIMIT: self.diff_tree.insert(parent, 'end', values=(f"... {len(rows) - DIFF_DISPLAY_LIMIT} öğe daha (raporda)",))
+            self.status_label.config(text=result.summary()); self.notebook.select(1)
+        def on_error(e): self.status_label.config(text=""); messagebox.showerror("Hata", f"Fark hesaplanamadı: {e}", parent=self)
+        self.parent.db_worker.submit(stocktake_diff, session[0], callback=on_diff, error=on_error)
+
+    def save_report(self):
+        if self.result is None: messagebox.showwarning("Uyarı", "Önce farkı hesaplayın!", parent=self); return
+        fname = filedialog.asksaveasfilename(parent=self, title="Sayım Raporu", defaultextension='.csv',
+                                             initialfile=f'sayim_{self.result.session_id}_{datetime.datetime.now():%Y%m%d_%H%M%S}.csv', filetypes=[("CSV Dosyası", "*.csv")])
+        if not fname: return
+        try: written = self.result.write_report(fname); messagebox.showinfo("Başarılı", f"{written} satır '{fname}' dosyasına kaydedildi.", parent=self)
+        except Exception as e: messagebox.showerror("Hata", f"Rapor kaydedilemedi: {e}", parent=self)
 
 class AddItemDialog(InventoryDialog):
     """'Yeni Ekle' penceresi."""
@@ -479,23 +1375,10 @@ class EditItemDialog(InventoryDialog):
 if __name__ == '__main__':
     # Bu blok, dosyanın doğrudan çalıştırılması durumunda test için kullanılır.
     
-    conn = sqlite3.connect('inventory_test.db') 
-    cursor = conn.cursor()
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS inventory_items (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, category TEXT NOT NULL,
-        model TEXT, brand TEXT, serial_number TEXT UNIQUE, purchase_date TEXT,
-        status TEXT, location TEXT, notes TEXT, assigned_to TEXT, last_updated_by TEXT )''')
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL UNIQUE,
-        password TEXT NOT NULL, role TEXT NOT NULL DEFAULT 'user' )''')
-    try:
-         cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)", ('admin', 'admin', 'admin'))
-    except sqlite3.IntegrityError: pass 
-    conn.commit()
+    conn = init_db('inventory_test.db') # Test veritabanı (şema geçişleriyle)
     
     test_user_info = (1, 'test', 'test', 'admin') 
-    app = MainWindow(conn, test_user_info) 
-    app.mainloop()
+    root = ttk.Window(themename="litera"); root.withdraw() # Temayı yükleyen gizli kök pencere
+    app = MainWindow(root, conn, test_user_info) 
+    root.mainloop()
     if conn: conn.close(); print("DB Bağlantısı kapatıldı.")
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""src/server.py için yerel (localhost) uçtan uca testler.
+
+Sunucu geçici bir veritabanıyla boş bir portta ayrı bir iş parçacığındaki olay döngüsünde çalışır;
+istekler http.client ile tek bir keep-alive bağlantısından gönderilir.
+Çalıştırma: python -m unittest discover tests  (veya pytest)
+"""
+import asyncio
+import base64
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.server import InventoryServer
+
+AUTH = 'Basic ' + base64.b64encode(b'admin:admin').decode() # init_db'nin eklediği varsayılan kullanıcı
+
+class ServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.work_dir = tempfile.TemporaryDirectory(prefix='envanter_server_')
+        cls.server = InventoryServer(os.path.join(cls.work_dir.name, 'test.db'), readers=2)
+        cls.loop = asyncio.new_event_loop()
+        cls.http = cls.loop.run_until_complete(cls.server.serve('127.0.0.1', 0))
+        cls.port = cls.http.sockets[0].getsockname()[1]
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        async def stop():
+            cls.http.close()
+            await cls.http.wait_closed()
+        asyncio.run_coroutine_threadsafe(stop(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+        cls.server.close()
+        cls.work_dir.cleanup()
+
+    def setUp(self):
+        self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def request(self, method, path, body=None, headers=None, raw=None):
+        """İsteği gönderir; (durum, JSON gövde veya None, yanıt başlıkları) döndürür."""
+        data = raw if raw is not None else (None if body is None else json.dumps(body))
+        self.conn.request(method, path, data, {'Authorization': AUTH, 'Content-Type': 'application/json', **(headers or {})})
+        response = self.conn.getresponse()
+        payload = response.read()
+        return response.status, json.loads(payload) if payload else None, response
+
+    def create(self, **fields):
+        status, item, _ = self.request('POST', '/items', {'name': 'Dizüstü', 'category': 'Bilgisayar', **fields})
+        self.assertEqual(status, 201, item)
+        return item
+
+    def test_requires_authentication(self):
+        self.conn.request('GET', '/items')
+        response = self.conn.getresponse(); response.read()
+        self.assertEqual(response.status, 401)
+        self.assertIn('Basic', response.getheader('WWW-Authenticate'))
+
+    def test_create_and_conflict(self):
+        item = self.create(serial_number='SRV-001', purchase_date='2021-03-04')
+        self.assertEqual(item['serial_number'], 'SRV-001')
+        self.assertEqual(item['status'], 'Aktif Kullanımda')
+        status, body, _ = self.request('POST', '/items', {'name': 'Başka', 'category': 'Bilgisayar', 'serial_number': 'SRV-001'})
+        self.assertEqual(status, 409)
+        self.assertIn('error', body)
+
+    def test_bad_bodies(self):
+        self.assertEqual(self.request('POST', '/items', raw='{bozuk')[0], 400)
+        self.assertEqual(self.request('POST', '/items', raw='[1, 2]')[0], 400)
+        self.assertEqual(self.request('POST', '/items', {'name': 'Kategorisiz'})[0], 400)
+        self.assertEqual(self.request('GET', '/items?limit=abc')[0], 400)
+        self.assertEqual(self.request('GET', '/items?after=bozuk')[0], 400)
+
+    def test_etag_not_modified(self):
+        self.create(serial_number='SRV-ETAG')
+        status, _, response = self.request('GET', '/stats')
+        self.assertEqual(status, 200)
+        etag = response.getheader('ETag')
+        status, body, _ = self.request('GET', '/stats', headers={'If-None-Match': etag})
+        self.assertEqual((status, body), (304, None))
+        self.create(serial_number='SRV-ETAG-2') # Yazma veri sürümünü değiştirir
+        self.assertEqual(self.request('GET', '/stats', headers={'If-None-Match': etag})[0], 200)
+
+    def test_paging_with_after(self):
+        for i in range(5):
+            self.create(name=f'Sayfa {i:02d}', serial_number=f'SRV-PAGE-{i}', location='Muhasebe', assigned_to='Sayfa Testi')
+        seen, after = [], None
+        while True:
+            path = '/items?sort=name&limit=2&assigned_to=Sayfa%20Testi' + (f'&after={after}' if after else '')
+            status, page, _ = self.request('GET', path)
+            self.assertEqual(status, 200)
+            self.assertLessEqual(len(page['items']), 2)
+            seen += [item['name'] for item in page['items']]
+            after = page['next']
+            if not after:
+                break
+        self.assertEqual(seen, [f'Sayfa {i:02d}' for i in range(5)])
+
+    def test_put_and_patch(self):
+        item = self.create(serial_number='SRV-UPD', purchase_date='2020-01-02', location='Depo')
+        path = f"/items/{item['id']}"
+        status, body, _ = self.request('PUT', path, {'name': 'Yeni Ad', 'category': 'Bilgisayar'})
+        self.assertEqual(status, 400, body) # Seri no verilmeyen PUT reddedilir
+        status, body, _ = self.request('PUT', path, {'name': 'Yeni Ad', 'category': 'Bilgisayar', 'serial_number': 'SRV-UPD'})
+        self.assertEqual(status, 200, body)
+        self.assertEqual((body['name'], body['serial_number'], body['purchase_date']), ('Yeni Ad', 'SRV-UPD', '2020-01-02'))
+        self.assertEqual(body['location'], '') # PUT verilmeyen alanları boşaltır
+        status, body, _ = self.request('PATCH', path, {'status': 'Arızalı'})
+        self.assertEqual(status, 200, body)
+        self.assertEqual((body['name'], body['status'], body['purchase_date']), ('Yeni Ad', 'Arızalı', '2020-01-02'))
+        other = self.create(serial_number='SRV-UPD-2')
+        self.assertEqual(self.request('PATCH', f"/items/{other['id']}", {'serial_number': 'SRV-UPD'})[0], 409)
+        self.assertEqual(self.request('PATCH', '/items/999999', {'name': 'Yok'})[0], 404)
+
+    def test_delete(self):
+        item = self.create(serial_number='SRV-DEL')
+        path = f"/items/{item['id']}"
+        self.assertEqual(self.request('DELETE', path)[:2], (204, None))
+        self.assertEqual(self.request('GET', path)[0], 404)
+        self.assertEqual(self.request('DELETE', path)[0], 404)
+
+if __name__ == '__main__':
+    unittest.main()